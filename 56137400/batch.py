@@ -0,0 +1,117 @@
+"""Bake SuperBool booleans on many scenes with a pool of mayapy workers
+
+``mayapy batch.py jobs.json --workers 4 --report report.json``
+
+jobs.json is a list of scenes, each one with the booleans to make::
+
+    [{"scene": "/assets/crate.ma",
+      "output": "/assets/crate_bool.ma",
+      "operations": [{"base": "crate", "mode": "subtract", "backend": "maya",
+                      "cutters": ["bolt1", {"primitive": 1, "translate": [0, 1, 0], "scale": [0.2, 2, 0.2]}]}]}]
+
+Every worker initialize maya.standalone once and process the scenes it receives,
+the report give the time spent on each file.
+The backend of an operation can be "maya" (polyBoolOp) or "numpy" (npbool.py).
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+MODES = {'add': 1, 'subtract': 2}  # same values as src.BOOLEANMODE_ADD / src.BOOLEANMODE_SUBTRACT
+
+_src = None  # src module of the worker
+
+
+def load_source(name, path):
+    """ import a module from its path, the tools are named after their question id so they can't be imported """
+    try:
+        import importlib.util
+    except ImportError:
+        import imp
+        return imp.load_source(name, path)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def init_worker():
+    """ start maya once per worker process """
+    global _src
+    import maya.standalone
+    maya.standalone.initialize(name='python')
+    _src = load_source('superbool_src', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src.py'))
+
+
+def process_scene(job):
+    """
+    Args:
+        job (dict): scene, output and operations, see the module docstring
+
+    Returns:
+        dict: scene, output, results, seconds and error for the report
+    """
+    import maya.cmds as mc
+    start = time.time()
+    report = {'scene': job['scene'], 'output': job.get('output', job['scene']), 'results': [], 'error': None}
+    try:
+        mc.file(job['scene'], open=True, force=True)
+        for op in job.get('operations', []):
+            mode = MODES[op.get('mode', 'subtract')]
+            report['results'].append(_src.superBool(op['base'], op['cutters'], mode, op.get('backend', 'maya')))
+        mc.file(rename=report['output'])
+        ext = os.path.splitext(report['output'])[1]
+        mc.file(save=True, force=True, type='mayaBinary' if ext == '.mb' else 'mayaAscii')
+    except Exception as e:
+        report['error'] = '{}: {}'.format(type(e).__name__, e)
+    report['seconds'] = time.time() - start
+    return report
+
+
+def run(jobs, workers=None):
+    """
+    Args:
+        jobs (list): scenes to process
+        workers (int, optional): number of mayapy processes, by default the number of cpus
+
+    Returns:
+        list: report of each scene in the order of jobs
+    """
+    # the workers have to be mayapy too
+    multiprocessing.set_executable(sys.executable)
+    pool = multiprocessing.Pool(workers or multiprocessing.cpu_count(), initializer=init_worker)
+    try:
+        return pool.map(process_scene, jobs, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('jobs', help='json file with the scenes to process')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--report', help='write the report as json')
+    args = parser.parse_args(argv)
+
+    with open(args.jobs) as f:
+        jobs = json.load(f)
+    start = time.time()
+    reports = run(jobs, args.workers)
+    total = time.time() - start
+
+    for r in reports:
+        status = r['error'] or 'ok'
+        print('{:>8.2f}s  {}  {}'.format(r['seconds'], r['scene'], status))
+    print('{} scenes in {:.2f}s'.format(len(reports), total))
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({'total': total, 'scenes': reports}, f, indent=2)
+    return 1 if any(r['error'] for r in reports) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""Mesh booleans of closed triangle meshes with numpy only, used as the offline backend of src.operator
+
+Meshes are given as ``(vertices, faces)`` : float (n, 3) and int (m, 3) arrays.
+
+The triangles of each mesh that cross the other one are split by the planes of the triangles they cross,
+so no piece is crossed by the surface of the other mesh anymore,
+then every piece is classified inside or outside with the generalized winding number of its centroid.
+Pieces lying on a triangle of the other mesh (coplanar faces) are classified by their normals instead :
+same direction or opposite, the winding number is 0.5 on the surface and can't tell.
+The candidate pairs of triangles come from a uniform grid over the triangle bounding boxes.
+
+``vertices, faces = boolean(cube, cylinder, DIFFERENCE)``
+
+Note:
+    The result is welded but can contain T-junctions along the intersection,
+    the pieces are fan triangulated so the topology is close to polyBoolOp on hard surface but not identical
+"""
+import numpy as np
+
+UNION = 1  # same values as the op flag of polyBoolOp
+DIFFERENCE = 2
+INTERSECTION = 3
+
+EPSILON = 1e-9
+
+
+def triangle_boxes(vertices, faces):
+    """
+    Args:
+        vertices (numpy.ndarray): (n, 3) positions
+        faces (numpy.ndarray): (m, 3) triangles
+
+    Returns:
+        tuple: (lo, hi) (m, 3) corners of the bounding box of each triangle
+    """
+    tris = vertices[faces]
+    return tris.min(axis=1), tris.max(axis=1)
+
+
+def _cell_keys(lo, hi, cell):
+    """
+    Expand every box into the grid cells it covers
+
+    Returns:
+        tuple: (box index, cell key) of each covered cell
+    """
+    lo = np.floor(lo / cell).astype(np.int64)
+    hi = np.floor(hi / cell).astype(np.int64)
+    dims = hi - lo + 1
+    counts = dims.prod(axis=1)
+    owner = np.repeat(np.arange(len(lo)), counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    d = dims[owner]
+    dx = local % d[:, 0]
+    dy = (local // d[:, 0]) % d[:, 1]
+    dz = local // (d[:, 0] * d[:, 1])
+    ijk = lo[owner] + np.stack([dx, dy, dz], axis=1)
+    # hash of the cell coordinates, collisions only add candidates that are filtered afterward
+    keys = (ijk[:, 0] * 73856093) ^ (ijk[:, 1] * 19349663) ^ (ijk[:, 2] * 83492791)
+    return owner, keys
+
+
+def candidate_pairs(vertices_a, faces_a, vertices_b, faces_b):
+    """
+    Pairs of triangles that can intersect : same grid cell, overlapping boxes
+    and each triangle crossing the plane of the other one
+
+    Returns:
+        numpy.ndarray: (k, 2) triangle index in a, triangle index in b
+    """
+    lo_a, hi_a = triangle_boxes(vertices_a, faces_a)
+    lo_b, hi_b = triangle_boxes(vertices_b, faces_b)
+    extent = np.concatenate([hi_a - lo_a, hi_b - lo_b]).max(axis=1)
+    cell = max(float(np.median(extent)) * 2.0, EPSILON)
+
+    owner_a, keys_a = _cell_keys(lo_a, hi_a, cell)
+    owner_b, keys_b = _cell_keys(lo_b, hi_b, cell)
+    order = np.argsort(keys_b, kind='stable')
+    keys_b = keys_b[order]
+    owner_b = owner_b[order]
+    start = np.searchsorted(keys_b, keys_a, side='left')
+    end = np.searchsorted(keys_b, keys_a, side='right')
+    counts = end - start
+    if not counts.sum():
+        return np.zeros((0, 2), dtype=np.int64)
+    ia = np.repeat(owner_a, counts)
+    pos = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(start, counts)
+    ib = owner_b[pos]
+    pairs = np.unique(np.stack([ia, ib], axis=1), axis=0)
+
+    ia, ib = pairs[:, 0], pairs[:, 1]
+    overlap = np.all((lo_a[ia] <= hi_b[ib] + EPSILON) & (lo_b[ib] <= hi_a[ia] + EPSILON), axis=1)
+    pairs = pairs[overlap]
+    ia, ib = pairs[:, 0], pairs[:, 1]
+    tris_a = vertices_a[faces_a[ia]]
+    tris_b = vertices_b[faces_b[ib]]
+    pairs = pairs[_straddle(tris_a, tris_b) & _straddle(tris_b, tris_a)]
+    return pairs
+
+
+def _planes(tris):
+    """
+    Returns:
+        tuple: (normals, offsets) of the planes of the triangles
+    """
+    normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    length = np.linalg.norm(normals, axis=1)
+    normals = normals / np.maximum(length, EPSILON)[:, None]
+    return normals, (normals * tris[:, 0]).sum(axis=1)
+
+
+def _straddle(tris, others):
+    """
+    Returns:
+        numpy.ndarray: bool, the triangles have points on both sides of the plane of the others
+    """
+    normals, offsets = _planes(others)
+    dist = np.einsum('ijk,ik->ij', tris, normals) - offsets[:, None]
+    return (dist.min(axis=1) < EPSILON) & (dist.max(axis=1) > -EPSILON)
+
+
+def _split_polygon(polygon, normal, offset):
+    """
+    Split a convex polygon by a plane
+
+    Returns:
+        list: the parts of the polygon on each side of the plane, empty parts are dropped
+    """
+    dist = [float(np.dot(p, normal) - offset) for p in polygon]
+    if all(d >= -EPSILON for d in dist) or all(d <= EPSILON for d in dist):
+        return [polygon]
+    front = []
+    back = []
+    count = len(polygon)
+    for i in range(count):
+        p, q = polygon[i], polygon[(i + 1) % count]
+        dp, dq = dist[i], dist[(i + 1) % count]
+        if dp >= -EPSILON:
+            front.append(p)
+        if dp <= EPSILON:
+            back.append(p)
+        if (dp > EPSILON and dq < -EPSILON) or (dp < -EPSILON and dq > EPSILON):
+            t = dp / (dp - dq)
+            x = p + (q - p) * t
+            front.append(x)
+            back.append(x)
+    return [part for part in (front, back) if len(part) >= 3]
+
+
+def _edge_planes(tri, normal):
+    """
+    Returns:
+        list: (normal, offset) of the planes through each edge of the triangle, perpendicular to it
+        and facing its inside
+    """
+    planes = []
+    for i in range(3):
+        p, q = tri[i], tri[(i + 1) % 3]
+        inward = np.cross(normal, q - p)
+        inward = inward / max(float(np.linalg.norm(inward)), EPSILON)
+        planes.append((inward, float(np.dot(inward, p))))
+    return planes
+
+
+def split_triangles(vertices, faces, cutting, pairs):
+    """
+    Split the triangles of a mesh by the planes of the triangles of the other mesh they cross,
+    a triangle coplanar with a triangle of the other mesh is also split along the edges of this one,
+    so every piece is either on it or beside it
+
+    Args:
+        vertices (numpy.ndarray): (n, 3) positions of the mesh
+        faces (numpy.ndarray): (m, 3) triangles of the mesh
+        cutting (numpy.ndarray): (k, 3, 3) triangles of the other mesh
+        pairs (numpy.ndarray): (j, 2) triangle of the mesh, triangle of cutting
+
+    Returns:
+        tuple: (p, 3, 3) triangles, untouched ones first, and (p,) int8 coplanar side of each triangle :
+        1 on a triangle of cutting facing the same way, -1 facing the other way, 0 not on cutting
+    """
+    touched = np.unique(pairs[:, 0]) if len(pairs) else np.zeros(0, dtype=np.int64)
+    keep = np.ones(len(faces), dtype=bool)
+    keep[touched] = False
+    result = [vertices[faces[keep]]]
+    sides = [np.zeros(int(keep.sum()), dtype=np.int8)]
+
+    if len(touched):
+        normals, offsets = _planes(cutting)
+        own_normals = _planes(vertices[faces[touched]])[0]
+        order = np.argsort(pairs[:, 0], kind='stable')
+        pairs = pairs[order]
+        bounds = np.searchsorted(pairs[:, 0], touched, side='left')
+        bounds = np.append(bounds, len(pairs))
+        pieces = []
+        piece_sides = []
+        for n, f in enumerate(touched):
+            tri = vertices[faces[f]]
+            polygons = [list(tri)]
+            coplanar = []
+            for c in pairs[bounds[n]:bounds[n + 1], 1]:
+                planes = [(normals[c], offsets[c])]
+                if np.all(np.abs(np.dot(tri, normals[c]) - offsets[c]) < EPSILON):
+                    edges = _edge_planes(cutting[c], normals[c])
+                    coplanar.append((c, edges))
+                    planes = edges
+                for normal, offset in planes:
+                    split = []
+                    for polygon in polygons:
+                        split.extend(_split_polygon(polygon, normal, offset))
+                    polygons = split
+            for polygon in polygons:
+                side = 0
+                center = np.mean(polygon, axis=0)
+                for c, edges in coplanar:
+                    if all(np.dot(center, normal) - offset > -EPSILON for normal, offset in edges):
+                        side = 1 if np.dot(own_normals[n], normals[c]) > 0 else -1
+                        break
+                # convex pieces, fan triangulation keeps the winding of the source triangle
+                for i in range(1, len(polygon) - 1):
+                    pieces.append([polygon[0], polygon[i], polygon[i + 1]])
+                    piece_sides.append(side)
+        if pieces:
+            result.append(np.asarray(pieces, dtype=np.float64))
+            sides.append(np.asarray(piece_sides, dtype=np.int8))
+    return np.concatenate(result), np.concatenate(sides)
+
+
+def winding_numbers(points, tris, chunk=None):
+    """
+    Generalized winding number of points for a closed triangle mesh, 1 inside and 0 outside
+
+    Args:
+        points (numpy.ndarray): (n, 3) query points
+        tris (numpy.ndarray): (m, 3, 3) triangles of the mesh
+        chunk (int, optional): points evaluated at once, by default about 2M point/triangle pairs
+
+    Returns:
+        numpy.ndarray: (n,) winding numbers
+    """
+    if chunk is None:
+        chunk = max(1, 2000000 // max(len(tris), 1))
+    result = np.empty(len(points))
+    for start in range(0, len(points), chunk):
+        p = points[start:start + chunk]
+        a = tris[None, :, 0] - p[:, None]
+        b = tris[None, :, 1] - p[:, None]
+        c = tris[None, :, 2] - p[:, None]
+        la = np.linalg.norm(a, axis=2)
+        lb = np.linalg.norm(b, axis=2)
+        lc = np.linalg.norm(c, axis=2)
+        det = np.einsum('ijk,ijk->ij', a, np.cross(b, c))
+        div = (la * lb * lc + np.einsum('ijk,ijk->ij', a, b) * lc
+               + np.einsum('ijk,ijk->ij', b, c) * la + np.einsum('ijk,ijk->ij', c, a) * lb)
+        result[start:start + chunk] = np.arctan2(det, div).sum(axis=1) / (2.0 * np.pi)
+    return result
+
+
+def _inside(points, tris):
+    """
+    Returns:
+        numpy.ndarray: bool, the points are inside the closed mesh, only the points in its bounding box are evaluated
+    """
+    lo = tris.reshape(-1, 3).min(axis=0)
+    hi = tris.reshape(-1, 3).max(axis=0)
+    inside = np.zeros(len(points), dtype=bool)
+    check = np.all((points >= lo) & (points <= hi), axis=1)
+    inside[check] = winding_numbers(points[check], tris) > 0.5
+    return inside
+
+
+def _area(tris):
+    return np.linalg.norm(np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0]), axis=1) * 0.5
+
+
+def weld(tris, tolerance=1e-6):
+    """
+    Merge the vertices closer than tolerance and remove the degenerate triangles
+
+    Args:
+        tris (numpy.ndarray): (m, 3, 3) triangles
+        tolerance (float): distance under which vertices are merged
+
+    Returns:
+        tuple: (vertices, faces)
+    """
+    tris = tris[_area(tris) > EPSILON]
+    points = tris.reshape(-1, 3)
+    keys = np.round(points / tolerance).astype(np.int64)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    vertices = points[first]
+    faces = inverse.reshape(-1, 3)
+    valid = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0])
+    return vertices, faces[valid]
+
+
+def boolean(mesh_a, mesh_b, op=DIFFERENCE, tolerance=1e-6):
+    """
+    Args:
+        mesh_a (tuple): (vertices, faces) base mesh
+        mesh_b (tuple): (vertices, faces) cutter
+        op (int): UNION, DIFFERENCE or INTERSECTION
+        tolerance (float): welding distance of the result
+
+    Returns:
+        tuple: (vertices, faces) of the result
+    """
+    vertices_a, faces_a = np.asarray(mesh_a[0], dtype=np.float64), np.asarray(mesh_a[1], dtype=np.int64)
+    vertices_b, faces_b = np.asarray(mesh_b[0], dtype=np.float64), np.asarray(mesh_b[1], dtype=np.int64)
+    tris_a = vertices_a[faces_a]
+    tris_b = vertices_b[faces_b]
+
+    pairs = candidate_pairs(vertices_a, faces_a, vertices_b, faces_b)
+    pieces_a, sides_a = split_triangles(vertices_a, faces_a, tris_b, pairs)
+    pieces_b, sides_b = split_triangles(vertices_b, faces_b, tris_a, pairs[:, ::-1])
+
+    inside_a = _inside(pieces_a.mean(axis=1), tris_b)
+    inside_b = _inside(pieces_b.mean(axis=1), tris_a)
+    # the pieces shared by both surfaces are taken once, from a, the ones of b are dropped
+    off_a = sides_a == 0
+    off_b = sides_b == 0
+
+    if op == UNION:
+        parts = [pieces_a[(off_a & ~inside_a) | (sides_a == 1)], pieces_b[off_b & ~inside_b]]
+    elif op == DIFFERENCE:
+        # the inside of the cutter become the walls of the hole, facing the other way
+        parts = [pieces_a[(off_a & ~inside_a) | (sides_a == -1)], pieces_b[off_b & inside_b][:, ::-1]]
+    elif op == INTERSECTION:
+        parts = [pieces_a[(off_a & inside_a) | (sides_a == 1)], pieces_b[off_b & inside_b]]
+    else:
+        raise ValueError('unknown boolean operation {}'.format(op))
+    return weld(np.concatenate(parts), tolerance)
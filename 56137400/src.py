@@ -1,5 +1,8 @@
 import maya.cmds as mc
-import pymel.all as pma
+import maya.api.OpenMaya as om2
+import maya.utils
+import os
+import threading
 from functools import partial
 
 BOOLEANMODE_ADD = 1
@@ -8,59 +11,598 @@ PRIMITIVE_CUBE = 0
 PRIMITIVE_CYLINDER = 1
 PRIMITIVE_SPHERE = 2
 PRIMITIVE_CUSTOM = 3
-
-
-def cleanUp ():
-    mc.delete(constructionHistory=True)
-    mc.delete("*_ctrl*")
+DEFERRED_INTERVAL = 0.3  # seconds without manipulation before the boolean is evaluated again
+REGISTRY = 'superBool_registry'  # object set with every controller and cutter made by the tool
+
+
+def register(ctrl, cutter, base):
+    """
+    Add a controller and its cutter to the registry, the controller keeps message connections
+    to the cutter and to the mesh made by the boolean so they can be cleaned per base mesh
+
+    Args:
+        ctrl (str): controller
+        cutter (str): mesh used by the boolean
+        base (str): mesh made by the boolean
+    """
+    if not mc.objExists(REGISTRY):
+        mc.sets(empty=True, name=REGISTRY)
+    mc.sets([ctrl, cutter], add=REGISTRY)
+    for attr, node in [('superBoolCutter', cutter), ('superBoolBase', base)]:
+        if not mc.attributeQuery(attr, node=ctrl, exists=True):
+            mc.addAttr(ctrl, longName=attr, attributeType='message')
+        mc.connectAttr(node + '.message', ctrl + '.' + attr, force=True)
+
+def booleanInputs(meshes):
+    """
+    Meshes feeding the polyBoolOp/polyCBoolOp history of some meshes, with chained booleans
+    (base -> basemesh -> basemesh1) it gives every intermediate result and every cutter
+
+    Args:
+        meshes (list): meshes made by booleans
+
+    Returns:
+        set: long names of the transforms upstream of the booleans
+    """
+    history = mc.listHistory(meshes) or []
+    if not mc.ls(history, type=['polyBoolOp', 'polyCBoolOp']):
+        return set()
+    shapes = mc.ls(history, type='mesh', long=True) or []
+    return set(mc.listRelatives(shapes, parent=True, fullPath=True) or [])
+
+def registered(bases=None):
+    """
+    Args:
+        bases (list, optional): only the nodes of these base meshes and of the booleans they are made from
+
+    Returns:
+        tuple: (controllers, cutters) of the registry
+    """
+    if not mc.objExists(REGISTRY):
+        return [], []
+    members = mc.sets(REGISTRY, query=True) or []
+    ctrls = [m for m in members if mc.attributeQuery('superBoolCutter', node=m, exists=True)]
+    if bases is not None:
+        bases = set(mc.ls(bases, long=True)) | booleanInputs(bases)
+        ctrls = [c for c in ctrls if set(mc.listConnections(c + '.superBoolBase', fullPath=True) or []) & bases]
+    cutters = []
+    for c in ctrls:
+        cutters += mc.listConnections(c + '.superBoolCutter') or []
+    return ctrls, cutters
+
+def cleanUp (*args):
+    # with base meshes selected only their controllers are removed, otherwise every controller of the tool
+    # the controllers of the earlier booleans of a chain are found through the history of the selected mesh
+    bases = mc.ls(sl=True) or None
+    ctrls, cutters = registered(bases)
+    for ctrl in ctrls:
+        DeferredBoolean.remove(ctrl)
+    nodes = ctrls
+    if bases:
+        # the history is baked so the cutters are not used anymore
+        mc.delete(bases, constructionHistory=True)
+        nodes = ctrls + cutters
+    nodes = [n for n in nodes if mc.objExists(n)]
+    if nodes:
+        mc.delete(nodes)
 
 def hider(option, *args):
     if option == 0:
         mc.hide()
     elif option == 1:
-        mc.select ("*_ctrl*")
-        mc.hide()
+        ctrls = registered()[0]
+        if ctrls:
+            mc.hide(ctrls)
     elif option == 2:
-        mc.select ("*_ctrl*")
-        mc.showHidden()
+        ctrls = registered()[0]
+        if ctrls:
+            mc.showHidden(ctrls)
         mc.select (clear=True)
 
 def fixMaterial():
     # pma.hyperShade( assign="lambert1" )
     # works better with the command sets, jut put the SG you need
     sel = mc.ls(sl = True)
+    shaLambertSG = 'grey20SG'
     if not mc.objExists('grey20'):
         shaLambert = mc.shadingNode('lambert', asShader = True, name = 'grey20')
         shaLambertSG = mc.sets(name = 'grey20SG', empty = True, renderable = True, noSurfaceShader = True)
         mc.connectAttr('grey20.outColor', 'grey20SG.surfaceShader')
     mc.sets(sel, edit = True, fe = shaLambertSG)
 
+class ShadingCapture(object):
+    """
+    Per face shading groups of a mesh taken before a boolean, ``keep`` copies the geometry
+    so the faces of the result can be matched back to the face they come from
+
+    Args:
+        mesh (str): mesh transform or shape
+    """
+
+    def __init__(self, mesh):
+        sel = om2.MSelectionList()
+        sel.add(mesh)
+        self._dag = sel.getDagPath(0)
+        self._dag.extendToShape()
+        shaders, ids = om2.MFnMesh(self._dag).getConnectedShaders(self._dag.instanceNumber())
+        self.groups = [om2.MFnDependencyNode(sg).name() for sg in shaders]
+        self.ids = list(ids)
+        self._intersector = None
+
+    def keep(self):
+        """ the input is consumed by the boolean, keep its geometry to match the faces afterward """
+        fn_mesh = om2.MFnMesh(self._dag)
+        self._data = om2.MFnMeshData().create()
+        om2.MFnMesh().copy(fn_mesh.object(), self._data)
+        self._matrix = self._dag.inclusiveMatrix()
+        self._intersector = om2.MMeshIntersector()
+        self._intersector.create(self._data, self._matrix)
+
+    def used(self):
+        """
+        Returns:
+            set: shading groups of the faces, None for the faces without material
+        """
+        return set(self.groups[i] if i >= 0 else None for i in set(self.ids))
+
+    def main(self):
+        """
+        Returns:
+            str: shading group used by most faces
+        """
+        counts = {}
+        for i in self.ids:
+            if i >= 0:
+                counts[i] = counts.get(i, 0) + 1
+        if counts:
+            return self.groups[max(counts, key=counts.get)]
+
+    def closest(self, point):
+        """
+        Args:
+            point (MPoint): world position
+
+        Returns:
+            tuple: (distance, shading group of the closest face)
+        """
+        hit = self._intersector.getClosestPoint(point)
+        # the point on mesh is given in object space
+        distance = point.distanceTo(om2.MPoint(hit.point) * self._matrix)
+        idx = self.ids[hit.face] if hit.face < len(self.ids) else -1
+        return distance, self.groups[idx] if idx >= 0 else None
+
+
+def uniformShading(captures):
+    """
+    Args:
+        captures (list): ShadingCapture of the base mesh first then the cutters
+
+    Returns:
+        str: shading group of every face of the result when the base mesh has a single material
+        and the cutters have the same one or none, otherwise None
+    """
+    used = captures[0].used()
+    if len(used) != 1 or None in used:
+        return None
+    group = used.pop()
+    for c in captures[1:]:
+        # faces of a cutter without material take the material of the base mesh
+        if c.used() - set([group, None, 'initialShadingGroup']):
+            return None
+    return group
+
+def captureShading(meshes):
+    """
+    Shading of the inputs of a boolean, the geometry is only copied when the faces have to be matched
+
+    Args:
+        meshes (list): base mesh first then the cutters
+
+    Returns:
+        list: ShadingCapture of each mesh, give it to restoreShading
+    """
+    captures = [ShadingCapture(m) for m in meshes]
+    if uniformShading(captures) is None:
+        for c in captures:
+            c.keep()
+    return captures
+
+def restoreShading(result, captures):
+    """
+    Give back to every face of the boolean result the shading group of the face it comes from
+    the faces made by a cutter without material take the main shading group of the base mesh,
+    it does one sets assignment per shading group, a single one when every input has the same material
+
+    Args:
+        result (str): mesh made by the boolean
+        captures (list): ShadingCapture of the base mesh first then the cutters, see captureShading
+    """
+    group = uniformShading(captures)
+    if group is not None:
+        mc.sets(result, edit=True, forceElement=group)
+        return
+    base_group = captures[0].main() or 'initialShadingGroup'
+    sel = om2.MSelectionList()
+    sel.add(result)
+    dag = sel.getDagPath(0)
+    dag.extendToShape()
+    faces = {}
+    it = om2.MItMeshPolygon(dag)
+    while not it.isDone():
+        center = it.center(om2.MSpace.kWorld)
+        hits = [c.closest(center) for c in captures]
+        nearest = min(range(len(hits)), key=lambda i: hits[i][0])
+        group = hits[nearest][1]
+        if group is None or (nearest and group == 'initialShadingGroup'):
+            # face made by a cutter without material
+            group = base_group
+        faces.setdefault(group, []).append(it.index())
+        it.next()
+    for group, face_ids in faces.items():
+        mc.sets(faceRanges(result, face_ids), edit=True, forceElement=group)
+
+def faceRanges(mesh, face_ids):
+    """
+    Args:
+        mesh (str): mesh name
+        face_ids (list): sorted face indices
+
+    Returns:
+        list: components like mesh.f[0:10]
+    """
+    ranges = []
+    start = prev = face_ids[0]
+    for f in face_ids[1:] + [None]:
+        if f is not None and f == prev + 1:
+            prev = f
+            continue
+        ranges.append('{}.f[{}:{}]'.format(mesh, start, prev))
+        if f is not None:
+            start = prev = f
+    return ranges
+
 def triangulate():
     mc.polyTriangulate()
 
+class NodeTracker(object):
+    """
+    Record the transforms created while the context is open, so the tool only cleans what it made
+    ``with NodeTracker() as tracker:``
+    ``    ...``
+    ``deleteEmptyTransforms(tracker.nodes())``
+    """
+
+    def __init__(self):
+        self._handles = []
+        self._callback = None
+
+    def __enter__(self):
+        self._callback = om2.MDGMessage.addNodeAddedCallback(self._added, 'transform')
+        return self
+
+    def __exit__(self, *args):
+        om2.MMessage.removeCallback(self._callback)
+        self._callback = None
+
+    def _added(self, mobj, *args):
+        self._handles.append(om2.MObjectHandle(mobj))
+
+    def nodes(self):
+        """
+        Returns:
+            list: full path of the created transforms still alive
+        """
+        return [om2.MFnDagNode(h.object()).fullPathName() for h in self._handles if h.isAlive() and h.isValid()]
+
+
+def deleteEmptyTransforms(nodes):
+    """
+    Delete the transforms without children, constraints and other transform based nodes are kept
+
+    Args:
+        nodes (list): transforms to check
+    """
+    deleteList = []
+    for tran in nodes:
+        if mc.objExists(tran) and mc.nodeType(tran) == 'transform':
+            if mc.listRelatives(tran, c=True) is None:
+                deleteList.append(tran)
+    if deleteList:
+        mc.delete(deleteList)
+
+
+class BoxIndex(object):
+    """
+    Uniform grid over world bounding boxes, used to skip the booleans that can't change anything
+    A query box much bigger than the cells (a base mesh against small cutters) only walks the filled cells,
+    so its cost doesn't grow with the volume of the box
+    ``index = BoxIndex(mc.ls(sl=True))``
+    ``index.query(worldBoundingBox('pCube1'))``
+
+    Args:
+        meshes (list): meshes to index
+    """
+
+    def __init__(self, meshes=()):
+        self.boxes = dict((m, worldBoundingBox(m)) for m in meshes)
+        sizes = [max(b[3] - b[0], b[4] - b[1], b[5] - b[2]) for b in self.boxes.values()]
+        # one big mesh among small ones covers at most 16 cells per axis
+        self.cell = max(sum(sizes) / len(sizes), max(sizes) / 16.0, 1e-3) if sizes else 1.0
+        self.grid = {}
+        for mesh, box in self.boxes.items():
+            for key in self._cells(box):
+                self.grid.setdefault(key, []).append(mesh)
+
+    def _range(self, box):
+        lo = [int(box[i] // self.cell) for i in range(3)]
+        hi = [int(box[i + 3] // self.cell) for i in range(3)]
+        return lo, hi
+
+    def _cells(self, box):
+        lo, hi = self._range(box)
+        for i in range(lo[0], hi[0] + 1):
+            for j in range(lo[1], hi[1] + 1):
+                for k in range(lo[2], hi[2] + 1):
+                    yield (i, j, k)
+
+    def query(self, box):
+        """
+        Args:
+            box (list): xmin, ymin, zmin, xmax, ymax, zmax
+
+        Returns:
+            list: indexed meshes whose bounding box overlaps the box
+        """
+        lo, hi = self._range(box)
+        covered = (hi[0] - lo[0] + 1) * (hi[1] - lo[1] + 1) * (hi[2] - lo[2] + 1)
+        if covered > len(self.grid):
+            # a base much bigger than the cutters : only walk the cells that hold something
+            keys = [key for key in self.grid if all(lo[i] <= key[i] <= hi[i] for i in range(3))]
+        else:
+            keys = self._cells(box)
+        found = set()
+        for key in keys:
+            for mesh in self.grid.get(key, []):
+                if mesh not in found and boxesOverlap(self.boxes[mesh], box):
+                    found.add(mesh)
+        return sorted(found)
+
+
+def worldBoundingBox(mesh):
+    return mc.exactWorldBoundingBox(mesh)
+
+def boxesOverlap(boxA, boxB):
+    return all(boxA[i] <= boxB[i + 3] and boxB[i] <= boxA[i + 3] for i in range(3))
+
+def toolBases(ctrls=None):
+    """
+    Args:
+        ctrls (list, optional): controllers of the registry, read from it by default
+
+    Returns:
+        list: visible meshes made by the booleans of the tool, the earlier results of a chain are hidden
+    """
+    if ctrls is None:
+        ctrls = registered()[0]
+    bases = set()
+    for c in ctrls:
+        bases.update(mc.listConnections(c + '.superBoolBase') or [])
+    return mc.ls(sorted(bases), visible=True) or []
+
+def candidateBases(cutter, meshes=None):
+    """
+    Base meshes touched by a custom cutter, by default only the meshes made by the tool are indexed
+    (see toolBases) so the cost doesn't grow with the scene and unrelated meshes are never cut
+
+    Args:
+        cutter (str): custom mesh
+        meshes (list, optional): meshes to look into
+
+    Returns:
+        list: meshes whose bounding box overlaps the cutter, controllers and cutters of the tool excluded
+    """
+    ctrls, cutters = registered()
+    if meshes is None:
+        meshes = toolBases(ctrls)
+    tool = set(ctrls + cutters + [cutter])
+    meshes = [m for m in meshes if m not in tool]
+    return BoxIndex(meshes).query(worldBoundingBox(cutter))
+
 def creator(primitives, *args):
     selection = mc.ls(sl=True)
-    for x in selection:
-        if primitives == PRIMITIVE_CUBE:
-            a = makeCube() #Create cube
-        if primitives == PRIMITIVE_CYLINDER:
-            a = makeCyl() #Create cyl 
-        if primitives == PRIMITIVE_SPHERE:
-            a = makeSphere() #Create sphere 
-        if primitives == PRIMITIVE_CUSTOM:
-            a = selection[1]  
-            x = selection[0]
-            mc.select(a)
+    with NodeTracker() as tracker:
+        if primitives == PRIMITIVE_CUSTOM and get_batch_mode():
+            batchCreator(selection[0], selection[1:])
+            selection = []
+        elif primitives == PRIMITIVE_CUSTOM and len(selection) == 1:
+            # only the cutter is selected : the index find the base meshes it touches
+            cutter = selection[0]
+            bases = candidateBases(cutter)
+            if not bases:
+                mc.warning('{} doesn\'t touch any mesh made by SuperBool, select the base mesh first'.format(cutter))
+            # one copy of the cutter per base, made before the first boolean consume it
+            cutters = [cutter] + [mc.duplicate(cutter)[0] for x in bases[1:]]
+            for x, a in zip(bases, cutters):
+                b = createController(a)
+                meshConstrainer(b, a)
+                result = operator(x, a)
+                register(b, a, result)
+                deferBoolean(b, a)
+                mc.select(b)
+            selection = []
+        for x in selection:
+            if primitives in PRIMITIVE_MAKERS:
+                a, b = makeFromTemplate(primitives) #Create cube, cyl or sphere with its controller
+            if primitives == PRIMITIVE_CUSTOM:
+                a = selection[1]  
+                x = selection[0]
+                mc.select(a)
+                if get_boolean_mode() == BOOLEANMODE_SUBTRACT and not boxesOverlap(worldBoundingBox(x), worldBoundingBox(a)):
+                    # subtracting a mesh that doesn't touch would only add an empty history node
+                    mc.warning('{} doesn\'t touch {}, skipped'.format(a, x))
+                    break
+                b = createController(a)
+            meshConstrainer (b,a)
+            result = operator(x,a) 
+            register(b, a, result)
+            deferBoolean(b, a)
+            mc.select(b)
+    # only the transforms made by this call are checked, not the whole scene
+    deleteEmptyTransforms(tracker.nodes())
+
+def batchCreator(base, cutters):
+    """
+    Every cutter gets its controller, then all of them are evaluated in one boolean
+
+    Args:
+        base (str): base mesh
+        cutters (list): custom meshes used for the operation
+    """
+    if get_boolean_mode() == BOOLEANMODE_SUBTRACT:
+        # subtracting a mesh that doesn't touch would only add an empty history node
+        touching = BoxIndex(cutters).query(worldBoundingBox(base))
+        skipped = [c for c in cutters if c not in touching]
+        if skipped:
+            mc.warning('{} doesn\'t touch {}, skipped'.format(', '.join(skipped), base))
+        cutters = [c for c in cutters if c in touching]
+        if not cutters:
+            return
+    ctrls = []
+    for a in cutters:
         b = createController(a)
-        meshConstrainer (b,a)
-        operator(x,a) 
-        mc.select(b)
-
-def operator(meshA, meshB):
-   booleanmode = get_boolean_mode()
+        meshConstrainer(b, a)
+        ctrls.append(b)
+    result = batchOperator(base, cutters)
+    for b, a in zip(ctrls, cutters):
+        register(b, a, result)
+        deferBoolean(b, a)
+    mc.select(ctrls)
+
+def batchOperator(meshA, cutters, booleanmode=None):
+    """
+    One multi operand polyCBoolOp instead of a chain of polyBoolOp, the materials are restored once
+
+    Args:
+        meshA (str): base mesh
+        cutters (list): meshes added or subtracted
+        booleanmode (int, optional): BOOLEANMODE_ADD or BOOLEANMODE_SUBTRACT, by default from the ui
+
+    Returns:
+        str: mesh made by the boolean
+    """
+    if booleanmode is None:
+        booleanmode = get_boolean_mode()
+    captures = captureShading([meshA] + list(cutters))
+    result = mc.polyCBoolOp(meshA, *cutters, op=booleanmode, n="basemesh")
+    restoreShading(result[0], captures)
+    return result[0]
+
+class DeferredBoolean(object):
+    """
+    Freeze the boolean while its controller is dragged and evaluate it once the controller is idle
+
+    While frozen, the boolean keeps its last result and the controller wireframe is the proxy of the cutter.
+    Every change of the controller restart the timer, the boolean is unfrozen when nothing moved during ``interval``.
+    ``frozen`` is toggled through its MPlug, so the freeze and the resume never enter the undo queue.
+
+    Args:
+        ctrl (str): controller driving the cutter
+        boolean (str): polyBoolOp or polyCBoolOp node
+        interval (float): idle time in seconds
+    """
+    instances = {}  # ctrl : DeferredBoolean, so the callbacks can be removed
+
+    def __init__(self, ctrl, boolean, interval=DEFERRED_INTERVAL):
+        self.boolean = boolean
+        self.interval = interval
+        self._timer = None
+        sel = om2.MSelectionList()
+        sel.add(ctrl)
+        sel.add(boolean)
+        node = sel.getDependNode(1)
+        self._handle = om2.MObjectHandle(node)
+        self._frozen = om2.MFnDependencyNode(node).findPlug('frozen', False)
+        self._callback = om2.MNodeMessage.addAttributeChangedCallback(sel.getDependNode(0), self._changed)
+        DeferredBoolean.remove(ctrl)
+        DeferredBoolean.instances[ctrl] = self
+
+    @classmethod
+    def remove(cls, ctrl=None):
+        """
+        Remove the callbacks of a controller, or of every controller
+
+        Args:
+            ctrl (str, optional): controller
+        """
+        ctrls = [ctrl] if ctrl else list(cls.instances)
+        for c in ctrls:
+            live = cls.instances.pop(c, None)
+            if live:
+                om2.MMessage.removeCallback(live._callback)
+                if live._timer:
+                    live._timer.cancel()
+                live._resume()
+
+    def _changed(self, msg, plug, *args):
+        if not msg & om2.MNodeMessage.kAttributeSet:
+            return
+        if self._timer is None:
+            self._freeze(True)
+        else:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.interval, maya.utils.executeDeferred, [self._resume])
+        self._timer.start()
+
+    def _freeze(self, state):
+        # MPlug.setBool is not undoable : dragging the controller then undoing only undoes the drag
+        if self._handle.isValid():
+            self._frozen.setBool(state)
+
+    def _resume(self):
+        self._timer = None
+        self._freeze(False)
+
+
+def booleanNode(cutter):
+    """
+    Args:
+        cutter (str): mesh used in a boolean
+
+    Returns:
+        str: polyBoolOp/polyCBoolOp node using the cutter
+    """
+    shapes = mc.listRelatives(cutter, shapes=True, fullPath=True) or []
+    nodes = mc.listConnections(shapes, source=False, destination=True, type='polyBoolOp') or []
+    nodes += mc.listConnections(shapes, source=False, destination=True, type='polyCBoolOp') or []
+    if nodes:
+        return nodes[0]
+
+def deferBoolean(ctrl, cutter):
+    # only when the option is checked in the ui
+    interval = get_deferred_interval()
+    if interval is None:
+        return
+    boolean = booleanNode(cutter)
+    if boolean:
+        DeferredBoolean(ctrl, boolean, interval)
+
+def operator(meshA, meshB, booleanmode=None, backend='maya'):
+   if booleanmode is None:
+       booleanmode = get_boolean_mode()
+   captures = captureShading([meshA, meshB])
+   if backend == 'numpy':
+       # offline : computed outside maya and without history
+       result = _npbool().boolean(meshArrays(meshA), meshArrays(meshB), booleanmode)
+       result = arraysToMesh(result[0], result[1], "basemesh")
+       mc.hide(meshA, meshB)
+       restoreShading(result, captures)
+       return result
    # is there a way to replace this pymel ?
-   pma.polyBoolOp( meshA, meshB, op=booleanmode, n="basemesh" )
-   fixMaterial()  #REMINDER: Need to be replaced with the actual assigned material and not with a lambert1 so for who is working with other materials can easyly keep using that
+   # pymel takes seconds to import, only pay for it on the first boolean
+   import pymel.all as pma
+   result = pma.polyBoolOp( meshA, meshB, op=booleanmode, n="basemesh" )
+   restoreShading(str(result[0]), captures)
+   return str(result[0])
 
 
 def get_boolean_mode(addRadioB=None, subRadioB=None):
@@ -71,6 +613,18 @@ def get_boolean_mode(addRadioB=None, subRadioB=None):
         return BOOLEANMODE_SUBTRACT
     return None
 
+def get_batch_mode():
+    # batch only apply to the custom mesh mode : base mesh first then all the cutters
+    if mc.checkBox('batchCheck', exists = True):
+        return mc.checkBox('batchCheck', query = True, value = True)
+    return False
+
+def get_deferred_interval():
+    # None when the boolean should be live
+    if mc.checkBox('deferCheck', exists = True) and mc.checkBox('deferCheck', query = True, value = True):
+        return mc.floatField('deferInterval', query = True, value = True)
+    return None
+
 def makeCube():
     cubeTransform = mc.polyCube(n="cubetobool", w=1, h=1, d=1, sx=1, sy=1, sz=1)[0]
     return cubeTransform       
@@ -84,40 +638,243 @@ def makeSphere():
     return sphereTransform    
 
 
+PRIMITIVE_MAKERS = {PRIMITIVE_CUBE: makeCube, PRIMITIVE_CYLINDER: makeCyl, PRIMITIVE_SPHERE: makeSphere}
+TEMPLATE_GROUP = 'superBool_templates'
+_templates = {}  # primitive : (mesh, wireframe) built once per session
+
+
+def primitiveTemplate(primitives):
+    """
+    Build the primitive and its wireframe controller once and keep them hidden for the session
+
+    Args:
+        primitives (int): PRIMITIVE_CUBE, PRIMITIVE_CYLINDER or PRIMITIVE_SPHERE
+
+    Returns:
+        tuple: (mesh, wireframe) templates
+    """
+    template = _templates.get(primitives)
+    if template and all(mc.objExists(t) for t in template):
+        return template
+    if not mc.objExists(TEMPLATE_GROUP):
+        mc.group(empty=True, name=TEMPLATE_GROUP)
+        mc.setAttr(TEMPLATE_GROUP + '.visibility', False)
+    mesh = PRIMITIVE_MAKERS[primitives]()
+    wire = createController(mesh)
+    mesh = mc.rename(mc.parent(mesh, TEMPLATE_GROUP)[0], 'template_mesh')
+    wire = mc.rename(mc.parent(wire, TEMPLATE_GROUP)[0], 'template_wire')
+    mc.delete(mesh, constructionHistory=True)
+    template = (TEMPLATE_GROUP + '|' + mesh, TEMPLATE_GROUP + '|' + wire)
+    _templates[primitives] = template
+    return template
+
+
+def makeFromTemplate(primitives):
+    """
+    Duplicate the cached primitive and its controller instead of building the geometry and the wireframe again
+
+    Args:
+        primitives (int): PRIMITIVE_CUBE, PRIMITIVE_CYLINDER or PRIMITIVE_SPHERE
+
+    Returns:
+        tuple: (mesh, controller) ready for meshConstrainer
+    """
+    mesh, wire = primitiveTemplate(primitives)
+    a, b = mc.duplicate(mesh, wire)
+    a = mc.rename(mc.parent(a, world=True)[0], 'cubetobool')
+    b = mc.rename(mc.parent(b, world=True)[0], 'bool_ctrl')
+    return a, b
+
+
 def meshConstrainer(constrainer, constrained):   
     mc.scaleConstraint( constrainer, constrained, maintainOffset=True)
     mc.parentConstraint( constrainer, constrained, maintainOffset=True)
 
 
+def meshEdges(object):
+    """
+    Read the world positions and the edges of a mesh in one pass with MFnMesh
+
+    Args:
+        object (str): mesh transform or shape
+
+    Returns:
+        tuple: (points, edges) list of (x, y, z) and list of (vertex id, vertex id)
+    """
+    sel = om2.MSelectionList()
+    sel.add(object)
+    dag = sel.getDagPath(0)
+    dag.extendToShape()
+    fn_mesh = om2.MFnMesh(dag)
+    points = [(p.x, p.y, p.z) for p in fn_mesh.getPoints(om2.MSpace.kWorld)]
+    counts, vertices = fn_mesh.getVertices()
+    edges = set()
+    i = 0
+    for count in counts:
+        face = vertices[i:i + count]
+        for a, b in zip(face, face[1:] + face[:1]):
+            edges.add((a, b) if a < b else (b, a))
+        i += count
+    return points, sorted(edges)
+
+
+def edgeChains(edges):
+    """
+    Walk the edges into polylines so every edge is drawn once with few curves
+
+    Args:
+        edges (list): (vertex id, vertex id)
+
+    Returns:
+        list: list of vertex ids for each polyline
+    """
+    neighbours = {}
+    for a, b in edges:
+        neighbours.setdefault(a, []).append(b)
+        neighbours.setdefault(b, []).append(a)
+    used = set()
+    # start from odd vertices first so open chains are not split
+    starts = sorted(neighbours, key=lambda v: len(neighbours[v]) % 2 == 0)
+    chains = []
+    for start in starts:
+        while True:
+            chain = [start]
+            current = start
+            while True:
+                for nxt in neighbours[current]:
+                    edge = (current, nxt) if current < nxt else (nxt, current)
+                    if edge not in used:
+                        used.add(edge)
+                        chain.append(nxt)
+                        current = nxt
+                        break
+                else:
+                    break
+            if len(chain) == 1:
+                break
+            chains.append(chain)
+    return chains
+
+
 def createController(object):
     #object = pma.ls(sl=True) 
     pivotObj = mc.xform(object,query=True,t=True,worldSpace=True)
-    edges = mc.filterExpand(mc.polyListComponentConversion(te=1),sm=32,ex=1) # convert edges to curve ancd create one object
-    for edge in edges:
-        vtx = mc.ls(mc.polyListComponentConversion(edge,fe=1,tv=1),fl=1)
-        p1 = mc.pointPosition(vtx[0])
-        p2 = mc.pointPosition(vtx[1])
-        curves = mc.curve(n="line_ctrl_curve", d=1,p=(p1,p2))
+    points, edges = meshEdges(object)
+    # one degree 1 curve per chain of edges instead of one curve per edge
+    curves = [mc.curve(n="line_ctrl_curve", d=1, p=[points[v] for v in chain]) for chain in edgeChains(edges)]
 
     ctrl = mc.curve (n="bool_ctrl", d=1,ws=True, p=pivotObj)
-    mc.xform (centerPivots=True)
-    for curveEdge in mc.ls ("line_ctrl*"):
-        mc.parent(curveEdge,ctrl, s=1, r=1)
-        mc.rename(curveEdge, "shapeunused")
+    mc.xform (ctrl, centerPivots=True)
+    shapes = mc.listRelatives(curves, s=True, f=True)
+    shapes = mc.parent(shapes, ctrl, s=1, r=1)
+    mc.delete(curves)
+    for shape in shapes:
+        mc.rename(shape, "shapeunused")
+    return ctrl
 
 
-    transforms =  mc.ls(type='transform')
-    deleteList = []
-    for tran in transforms:
-        if mc.nodeType(tran) == 'transform':
-            children = mc.listRelatives(tran, c=True)
-            if children is None:
-                #print '%s, has no childred' %(tran)
-                deleteList.append(tran)
-
-    if not deleteList:           
-       mc.delete(deleteList)
-    return ctrl
+def _npbool():
+    # npbool is next to this file, the folder can't be imported as a package
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'npbool.py')
+    try:
+        import importlib.util
+    except ImportError:
+        import imp
+        return imp.load_source('superbool_npbool', path)
+    spec = importlib.util.spec_from_file_location('superbool_npbool', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def meshArrays(mesh):
+    """
+    Args:
+        mesh (str): mesh transform or shape
+
+    Returns:
+        tuple: (vertices, faces) numpy arrays of the world positions and the triangles
+    """
+    import numpy as np
+    sel = om2.MSelectionList()
+    sel.add(mesh)
+    dag = sel.getDagPath(0)
+    dag.extendToShape()
+    fn_mesh = om2.MFnMesh(dag)
+    vertices = np.array([(p.x, p.y, p.z) for p in fn_mesh.getPoints(om2.MSpace.kWorld)], dtype=np.float64)
+    counts, ids = fn_mesh.getTriangles()
+    return vertices, np.array(ids, dtype=np.int64).reshape(-1, 3)
+
+def arraysToMesh(vertices, faces, name):
+    """
+    Args:
+        vertices (numpy.ndarray): (n, 3) world positions
+        faces (numpy.ndarray): (m, 3) triangles
+        name (str): name of the new mesh
+
+    Returns:
+        str: new mesh transform
+    """
+    points = [om2.MPoint(*v) for v in vertices.tolist()]
+    mobj = om2.MFnMesh().create(points, [3] * len(faces), faces.ravel().tolist())
+    mesh = mc.rename(om2.MFnDagNode(mobj).fullPathName(), name)
+    mc.sets(mesh, edit=True, forceElement='initialShadingGroup')
+    return mesh
+
+
+#################HEADLESS
+# no selection and no ui : used by batch.py on the farm
+def makeCutter(spec):
+    """
+    Args:
+        spec (Any): mesh name or primitive spec like
+            ``{'primitive': PRIMITIVE_CUBE, 'translate': [0, 1, 0], 'rotate': [0, 45, 0], 'scale': [1, 1, 1]}``
+
+    Returns:
+        str: cutter mesh
+    """
+    if not isinstance(spec, dict):
+        return spec
+    mesh = PRIMITIVE_MAKERS[spec['primitive']]()
+    for attr in ['translate', 'rotate', 'scale']:
+        if attr in spec:
+            mc.setAttr('{}.{}'.format(mesh, attr), *spec[attr])
+    return mesh
+
+def superBool(base, cutters, booleanmode=BOOLEANMODE_SUBTRACT, backend='maya'):
+    """
+    UI free boolean of a base mesh with a list of cutters, no controller and no constraint are made
+
+    Args:
+        base (str): base mesh
+        cutters (list): mesh names or primitive specs (see makeCutter)
+        booleanmode (int): BOOLEANMODE_ADD or BOOLEANMODE_SUBTRACT
+        backend (str): 'maya' for polyBoolOp/polyCBoolOp, 'numpy' for npbool (one cutter at a time)
+
+    Returns:
+        str: mesh made by the boolean, the base mesh if no cutter touched it,
+        the primitives that don't touch the base mesh are deleted
+    """
+    made = [makeCutter(c) for c in cutters]
+    if booleanmode == BOOLEANMODE_SUBTRACT:
+        touching = BoxIndex(made).query(worldBoundingBox(base))
+        unused = [c for c in made if c not in touching]
+        if unused:
+            mc.warning('{} doesn\'t touch {}, skipped'.format(', '.join(unused), base))
+            # the primitives made from a spec are ours, the meshes given by name are left to the caller
+            stamped = [c for c, spec in zip(made, cutters) if isinstance(spec, dict) and c not in touching]
+            if stamped:
+                mc.delete(stamped)
+        made = [c for c in made if c in touching]
+    cutters = made
+    if not cutters:
+        return base
+    if backend == 'numpy':
+        for c in cutters:
+            base = operator(base, c, booleanmode, backend)
+        return base
+    if len(cutters) == 1:
+        return operator(base, cutters[0], booleanmode)
+    return batchOperator(base, cutters, booleanmode)
 
 
 def deleteUI(name, *args):
@@ -134,7 +891,10 @@ def super_bool_tut():
     lb_txt = "This tool is a super tool to make booleans wrote by Leonardo Iezzi. To make it works correctly, you need to have your base mesh already even if just a cube. "
     lb_txt += "With your base mesh selected just press one of the three buttons on the windows to subtract or add those primitives. "
     lb_txt += "If you want to use a custom mesh for the operation: select your base mesh then the custom one "
-    lb_txt += "(it's important to pick your base mesh first) and then press the 'Use custom mesh' button. After you have done, select your base mesh and press 'Clean Up.'"
+    lb_txt += "(it's important to pick your base mesh first) and then press the 'Use custom mesh' button. After you have done, select your base mesh and press 'Clean Up.' "
+    lb_txt += "If only the custom mesh is selected, it is used on every mesh made by the tool it touches. "
+    lb_txt += "With 'Batch Cutters' checked, all the custom meshes selected after the base mesh are used in a single boolean. "
+    lb_txt += "With 'Deferred' checked, the boolean is only computed when the controller stopped moving for the given seconds."
     mc.text("intro", label = lb_txt ,wordWrap= True, height = 100, backgroundColor = [0.2, 0.2, 0.2], align='left', parent = mainSubLayout)
 
     mc.separator(parent = "testColumn", height=20)
@@ -165,6 +925,10 @@ def super_bool_ui():
     mc.separator(parent = mainLayout, height=20)
 
     mc.button("customMeshB", label = "Use Custom Mesh", width = 120, height = 40, backgroundColor = [0.2, 0.2, 0.2], parent = mainLayout, command = partial(creator, PRIMITIVE_CUSTOM))
+    mc.checkBox("batchCheck", label = "Batch Cutters", value = False, parent = mainLayout)
+    gridl_defer = mc.gridLayout("nameGridLayout04", numberOfRowsColumns = (1,2), cellWidthHeight = (80,20), parent = mainLayout)
+    mc.checkBox("deferCheck", label = "Deferred", value = False, parent = gridl_defer)
+    mc.floatField("deferInterval", value = DEFERRED_INTERVAL, minValue = 0.05, precision = 2, parent = gridl_defer)
 
     mc.separator(parent = mainLayout, height=20)
     ################################################################################################UI#################################################
@@ -204,22 +968,30 @@ def my_custom_script_com(*args):
     super_bool_tut()
 
 # Create a custom floating window with 
-if mc.window('ToolsWindow', q=True, exists=True):
-    mc.deleteUI('ToolsWindow')
-if mc.workspaceControl('ToolsWorkspaceControl', q=True, exists=True):
-    mc.deleteUI('ToolsWorkspaceControl')
-mc.window('ToolsWindow')
-mainL = mc.columnLayout()
-tabLayout = mc.tabLayout('ToolsTabs', p=mainL)
-
-#########################################################
-##################    IMPORTING PANEL    ################
-#########################################################
-tabMenu = mc.columnLayout("Menu", adj=True, p=tabLayout)
-separator_long = mc.separator(
-                         height=10,
-                         style='in', p=tabMenu)
-
-mc.button(label="MyCustomScript", command = my_custom_script_com, p=tabMenu)
-mc.showWindow()
-
+# (nothing is built on import : mayapy and farm tasks import this module without ui)
+def launch(*args):
+    """
+    Build the ToolsWindow, call it from the shelf button or the menu
+
+    Returns:
+        str: name of the window
+    """
+    if mc.window('ToolsWindow', q=True, exists=True):
+        mc.deleteUI('ToolsWindow')
+    if mc.workspaceControl('ToolsWorkspaceControl', q=True, exists=True):
+        mc.deleteUI('ToolsWorkspaceControl')
+    window = mc.window('ToolsWindow')
+    mainL = mc.columnLayout()
+    tabLayout = mc.tabLayout('ToolsTabs', p=mainL)
+
+    #########################################################
+    ##################    IMPORTING PANEL    ################
+    #########################################################
+    tabMenu = mc.columnLayout("Menu", adj=True, p=tabLayout)
+    separator_long = mc.separator(
+                             height=10,
+                             style='in', p=tabMenu)
+
+    mc.button(label="MyCustomScript", command = my_custom_script_com, p=tabMenu)
+    mc.showWindow()
+    return window
@@ -1,37 +1,347 @@
 import maya.cmds as cmds
-import maya.OpenMaya as om
-import maya.mel as mel
 import sys
 import math
 from functools import partial
 
 
+RIG_IKFK = 0  # same order as the radio buttons of rigCreator
+RIG_IK = 1
+RIG_FK = 2
+SIDE_COLORS = {'L_': 7, 'R_': 14, '_': 18}  # same colors as rigCreator.colorChange
+
+
+def limbSpec(root, side='L_', part='Arm', rigType=RIG_IKFK, stretch=False, color=None):
+    """
+    Args:
+        root (str): first joint of the limb
+        side (str): 'L_', 'R_' or '_' like the Side menu
+        part (str): 'Arm', 'Leg' or 'Spine' like the Part menu, any name works
+        rigType (int): RIG_IKFK, RIG_IK or RIG_FK
+        stretch (bool): stretchy ik chain
+        color (int, optional): color index of the new chains, by default the color of the side
+
+    Returns:
+        dict: limb for RigBuilder.build
+    """
+    if color is None:
+        color = SIDE_COLORS.get(side, 7)
+    return {'root': root, 'side': side, 'part': part, 'rigType': rigType, 'stretch': bool(stretch),
+            'color': color}
+
+
+class RigBuilder(object):
+    """Build the IK/FK chains of many limbs with a few batched calls
+
+    Every node of every limb is created and named in one doIt, the joint values in a second one and
+    all the connections in a third one, only the ik handles need a command each (there is no api to make them).
+    For each limb it makes the IK and/or FK duplicate of the chain, a settings node with the ikFk attribute,
+    blendColors to drive the original joints and the stretch nodes of the ik chain.
+
+    ``builder = RigBuilder()``
+    ``builder.build([limbSpec('L_arm_01'), limbSpec('R_leg_01', 'R_', 'Leg', RIG_IK, stretch=True)])``
+    ``builder.undoIt()``
+
+    Note:
+        The build is not in maya's undo queue : the modifiers can't be undone with ctrl+z, so the ik handles
+        are made with undo disabled too and only ``undoIt`` removes what the build made.
+        The stretch scale translateX, the chains are expected to aim down X like the joint tool default.
+        Nodes are named after the side and the part in the namespace of the root : char01:L_Arm_ik_01_jnt
+    """
+
+    joint_attrs = ['translateX', 'translateY', 'translateZ', 'rotateX', 'rotateY', 'rotateZ',
+                   'jointOrientX', 'jointOrientY', 'jointOrientZ', 'radius']
+
+    def __init__(self):
+        self._modifiers = []  #: list: modifiers of the last build, for undoIt
+        self._handles = []  #: list: ik handles of the last build
+
+    @staticmethod
+    def _om():
+        # imported on first build, see launch
+        import maya.api.OpenMaya as om2
+        return om2
+
+    def _chain(self, root):
+        """
+        Args:
+            root (str): first joint
+
+        Returns:
+            list: MObject of the joints, following the first child joint
+        """
+        om2 = self._om()
+        sel = om2.MSelectionList()
+        sel.add(root)
+        obj = sel.getDependNode(0)
+        chain = [obj]
+        while True:
+            fn = om2.MFnDagNode(obj)
+            joints = [fn.child(i) for i in range(fn.childCount()) if fn.child(i).hasFn(om2.MFn.kJoint)]
+            if not joints:
+                return chain
+            obj = joints[0]
+            chain.append(obj)
+
+    def _plan(self, spec, dag_mod, dg_mod):
+        """
+        Queue the nodes of a limb in the modifiers
+
+        Returns:
+            dict: MObjects and values of the limb
+        """
+        om2 = self._om()
+        source = self._chain(spec['root'])
+        ns = spec['root'].rpartition(':')[0]
+        prefix = (ns + ':' if ns else '') + (spec['side'] if spec['side'] != '_' else '') + spec['part']
+        values = []
+        for obj in source:
+            fn = om2.MFnDependencyNode(obj)
+            values.append(dict((attr, fn.findPlug(attr, False).asDouble()) for attr in self.joint_attrs))
+            values[-1]['rotateOrder'] = fn.findPlug('rotateOrder', False).asInt()
+
+        root_parent = om2.MFnDagNode(source[0]).parent(0)
+        if root_parent.hasFn(om2.MFn.kWorld):
+            root_parent = om2.MObject.kNullObj
+
+        def node(mod, node_type, name, *parent):
+            obj = mod.createNode(node_type, *parent)
+            mod.renameNode(obj, name)
+            return obj
+
+        limb = {'spec': spec, 'prefix': prefix, 'source': source, 'values': values, 'chains': {},
+                'blends': [], 'stretch': None}
+        kinds = {RIG_IKFK: ['ik', 'fk'], RIG_IK: ['ik'], RIG_FK: ['fk']}[spec['rigType']]
+        for kind in kinds:
+            parent = root_parent
+            chain = []
+            for i in range(len(source)):
+                parent = node(dag_mod, 'joint', '{}_{}_{:02d}_jnt'.format(prefix, kind, i + 1), parent)
+                chain.append(parent)
+            limb['chains'][kind] = chain
+
+        stretch = spec['stretch'] and 'ik' in kinds and len(source) > 1
+        if len(kinds) == 2:
+            limb['settings'] = node(dg_mod, 'network', prefix + '_settings')
+            limb['reverse'] = node(dg_mod, 'reverse', prefix + '_ikFk_rev')
+            for i in range(len(source)):
+                rot = node(dg_mod, 'blendColors', '{}_{:02d}_rot_bc'.format(prefix, i + 1))
+                pos = node(dg_mod, 'blendColors', '{}_{:02d}_pos_bc'.format(prefix, i + 1)) if stretch else None
+                limb['blends'].append((rot, pos))
+        if stretch:
+            limb['stretch'] = {
+                'distance': node(dg_mod, 'distanceBetween', prefix + '_stretch_dist'),
+                'ratio': node(dg_mod, 'multiplyDivide', prefix + '_stretch_md'),
+                'condition': node(dg_mod, 'condition', prefix + '_stretch_cond'),
+                'scales': [node(dg_mod, 'multDoubleLinear', '{}_ik_{:02d}_stretch_mdl'.format(prefix, i + 1))
+                           for i in range(1, len(source))]}
+        return limb
+
+    def _setValues(self, limb, mod):
+        """ copy the joint values, set the colors and the constants of the stretch """
+        om2 = self._om()
+        color = limb['spec']['color']
+        for chain in limb['chains'].values():
+            for obj, values in zip(chain, limb['values']):
+                fn = om2.MFnDependencyNode(obj)
+                for attr in self.joint_attrs:
+                    mod.newPlugValueDouble(fn.findPlug(attr, False), values[attr])
+                mod.newPlugValueInt(fn.findPlug('rotateOrder', False), values['rotateOrder'])
+                mod.newPlugValueBool(fn.findPlug('overrideEnabled', False), True)
+                mod.newPlugValueInt(fn.findPlug('overrideColor', False), color)
+
+        if 'settings' in limb:
+            attr = om2.MFnNumericAttribute()
+            ikfk = attr.create('ikFk', 'ikFk', om2.MFnNumericData.kDouble, 0.0)
+            attr.setMin(0.0)
+            attr.setMax(1.0)
+            attr.keyable = True
+            mod.addAttribute(limb['settings'], ikfk)
+
+        stretch = limb['stretch']
+        if stretch:
+            # length of the chain at rest, the ik start to the ik handle
+            length = sum(math.sqrt(v['translateX'] ** 2 + v['translateY'] ** 2 + v['translateZ'] ** 2)
+                         for v in limb['values'][1:])
+            ratio = om2.MFnDependencyNode(stretch['ratio'])
+            mod.newPlugValueInt(ratio.findPlug('operation', False), 2)
+            mod.newPlugValueDouble(ratio.findPlug('input2X', False), length)
+            condition = om2.MFnDependencyNode(stretch['condition'])
+            mod.newPlugValueInt(condition.findPlug('operation', False), 2)
+            mod.newPlugValueDouble(condition.findPlug('secondTerm', False), length)
+            mod.newPlugValueDouble(condition.findPlug('colorIfFalseR', False), 1.0)
+            for obj, values in zip(stretch['scales'], limb['values'][1:]):
+                scale = om2.MFnDependencyNode(obj)
+                mod.newPlugValueDouble(scale.findPlug('input1', False), values['translateX'])
+
+    def _connect(self, limb, mod):
+        """ drive the original chain with the new chains, the ik/fk switch and the stretch """
+        om2 = self._om()
+
+        def plug(obj, attr):
+            return om2.MFnDependencyNode(obj).findPlug(attr, False)
+
+        chains = limb['chains']
+        source = limb['source']
+        stretch = limb['stretch']
+        if 'settings' in limb:
+            ikfk = plug(limb['settings'], 'ikFk')
+            mod.connect(ikfk, plug(limb['reverse'], 'inputX'))
+            mod.connect(ikfk, plug(chains['ik'][0], 'visibility'))
+            mod.connect(plug(limb['reverse'], 'outputX'), plug(chains['fk'][0], 'visibility'))
+            for i, (rot, pos) in enumerate(limb['blends']):
+                # blender 1 is the ik chain
+                for blend, attr in [(rot, 'rotate'), (pos, 'translate')]:
+                    if blend is None:
+                        continue
+                    mod.connect(ikfk, plug(blend, 'blender'))
+                    mod.connect(plug(chains['ik'][i], attr), plug(blend, 'color1'))
+                    mod.connect(plug(chains['fk'][i], attr), plug(blend, 'color2'))
+                    mod.connect(plug(blend, 'output'), plug(source[i], attr))
+        else:
+            chain = list(chains.values())[0]
+            for new, old in zip(chain, source):
+                mod.connect(plug(new, 'rotate'), plug(old, 'rotate'))
+                if stretch:
+                    mod.connect(plug(new, 'translate'), plug(old, 'translate'))
+
+        if stretch:
+            ik = chains['ik']
+            distance = plug(stretch['distance'], 'distance')
+            world = plug(ik[0], 'worldMatrix').elementByLogicalIndex(0)
+            mod.connect(world, plug(stretch['distance'], 'inMatrix1'))
+            world = plug(limb['handle'], 'worldMatrix').elementByLogicalIndex(0)
+            mod.connect(world, plug(stretch['distance'], 'inMatrix2'))
+            mod.connect(distance, plug(stretch['ratio'], 'input1X'))
+            mod.connect(distance, plug(stretch['condition'], 'firstTerm'))
+            mod.connect(plug(stretch['ratio'], 'outputX'), plug(stretch['condition'], 'colorIfTrueR'))
+            for obj, joint in zip(stretch['scales'], ik[1:]):
+                mod.connect(plug(stretch['condition'], 'outColorR'), plug(obj, 'input2'))
+                mod.connect(plug(obj, 'output'), plug(joint, 'translateX'))
+
+    def build(self, specs):
+        """
+        Args:
+            specs (list): limbs made by limbSpec
+
+        Returns:
+            list: for each limb a dictionnary of the new node names : ik, fk, blends, settings, handle, stretch
+        """
+        om2 = self._om()
+        dag_mod = om2.MDagModifier()
+        dg_mod = om2.MDGModifier()
+        limbs = [self._plan(spec, dag_mod, dg_mod) for spec in specs]
+        dag_mod.doIt()
+        dg_mod.doIt()
+
+        values_mod = om2.MDGModifier()
+        for limb in limbs:
+            self._setValues(limb, values_mod)
+        values_mod.doIt()
+
+        self._handles = []
+        # an undoable ikHandle on top of the modifiers would let ctrl+z leave the rig half built
+        undo = cmds.undoInfo(q=True, stateWithoutFlush=True)
+        cmds.undoInfo(stateWithoutFlush=False)
+        try:
+            for limb in limbs:
+                limb['handle'] = None
+                if 'ik' in limb['chains']:
+                    chain = limb['chains']['ik']
+                    start, end = [om2.MFnDependencyNode(obj).name() for obj in (chain[0], chain[-1])]
+                    handle = cmds.ikHandle(sj=start, ee=end, sol='ikRPsolver', n=limb['prefix'] + '_ikh')[0]
+                    self._handles.append(handle)
+                    sel = om2.MSelectionList()
+                    sel.add(handle)
+                    limb['handle'] = sel.getDependNode(0)
+        finally:
+            cmds.undoInfo(stateWithoutFlush=undo)
+
+        connect_mod = om2.MDGModifier()
+        for limb in limbs:
+            self._connect(limb, connect_mod)
+            if limb['handle'] is not None:
+                fn = om2.MFnDependencyNode(limb['handle'])
+                connect_mod.newPlugValueBool(fn.findPlug('overrideEnabled', False), True)
+                connect_mod.newPlugValueInt(fn.findPlug('overrideColor', False), limb['spec']['color'])
+        connect_mod.doIt()
+        self._modifiers = [dag_mod, dg_mod, values_mod, connect_mod]
+        return [self._names(limb) for limb in limbs]
+
+    def _names(self, limb):
+        om2 = self._om()
+
+        def name(obj):
+            return om2.MFnDependencyNode(obj).name() if obj is not None else None
+
+        stretch = limb['stretch']
+        return {'root': limb['spec']['root'],
+                'ik': [name(o) for o in limb['chains'].get('ik', [])],
+                'fk': [name(o) for o in limb['chains'].get('fk', [])],
+                'blends': [name(o) for pair in limb['blends'] for o in pair if o is not None],
+                'settings': name(limb.get('settings')),
+                'handle': name(limb['handle']),
+                'stretch': [name(o) for o in [stretch['distance'], stretch['ratio'], stretch['condition']]
+                            + stretch['scales']] if stretch else []}
+
+    def undoIt(self):
+        """ remove everything made by the last build """
+        if not self._modifiers:
+            return
+        dag_mod, dg_mod, values_mod, connect_mod = self._modifiers
+        connect_mod.undoIt()
+        handles = [h for h in self._handles if cmds.objExists(h)]
+        if handles:
+            undo = cmds.undoInfo(q=True, stateWithoutFlush=True)
+            cmds.undoInfo(stateWithoutFlush=False)
+            try:
+                cmds.delete(handles)
+            finally:
+                cmds.undoInfo(stateWithoutFlush=undo)
+        values_mod.undoIt()
+        dg_mod.undoIt()
+        dag_mod.undoIt()
+        self._modifiers = []
+        self._handles = []
+
+
+def build(specs):
+    """
+    Rig many limbs in one go, ie every limb of every character of a crowd
+
+    Args:
+        specs (list): limbs made by limbSpec
+
+    Returns:
+        list: new node names of each limb, see RigBuilder.build
+
+    Note:
+        It can't be undone with ctrl+z, use RigBuilder.undoIt to remove a build
+    """
+    return RigBuilder().build(specs)
+
+
 def create(rigType, sideColor, isStretch, *args):
 
     # DW : refreshed every time by property that is executing before being passed
-    if rigType == 0:
-        print('IK/FK mode')
-    elif rigType == 1:
-        print('IK mode')
-    elif rigType == 2:
-        print('FK mode')
-
-    # DW : in this state of the script, it will return always 7 because there is no refresh query
+    # DW : in this state of the script, sideColor will return always 7 because there is no refresh query
     #      so you can see to pass outside your class some arguments
-    #      below an example for an alternative of property
-    print('color picked is {}'.format(sideColor))
-
+    #      here the color is queried again from the slider
     # DW : in this example the function for getting the status is passed
     #      it is different from property because we still use to execute the command
-    if isStretch():
-        print('rig is stretchy')
-    else:
-        print('no stretch')
+    #      rigType is passed the same way, a property given to partial is read once when the window is built
+    root = cmds.textField('rootJnt', q=True, tx=True)
+    if not cmds.objExists(root) or cmds.nodeType(root) != 'joint':
+        cmds.warning('Please select the first joint of your chain')
+        return
+    side = cmds.optionMenu('Part_Side', q=True, v=True)
+    part = cmds.optionMenu('part_Body', q=True, v=True)
+    color = cmds.colorIndexSliderGrp('rigColor', q=True, v=True)
 
     # Dw : note that if you create an instance of your window inside a variable :
     # ui = rigCreator()
     # ui.ikfkPick is something you can print at any moment to debug
     # any variable with 'self' would be replaced by 'ui' in this case
+    return build([limbSpec(root, side, part, rigType(), isStretch(), color)])
 
 
 class rigCreator:
@@ -134,7 +444,7 @@ class rigCreator:
         # DW : never use comma for executing some function, if you use this script as a module afterward,
         #      you will have problems dealing with python namespacing
         #      maya is always passing a default argument True, so put *args in any command that is used by your ui controls
-        cmds.button('b_create', label='Create', h=30, c=partial(create, self.rigType, self.sideColor, self.getStretch))
+        cmds.button('b_create', label='Create', h=30, c=partial(create, self.getRigType, self.sideColor, self.getStretch))
 
         #show the window
         cmds.showWindow(self.window)
@@ -182,6 +492,13 @@ class rigCreator:
         cia = [i.split('|')[-1] for i in cmds.radioCollection(self.rc_ikfk, q=True, cia=True)]
         return cia.index(rb)
 
+    def getRigType(self, *args):
+        """
+        Returns:
+            int: option selected in ui when the button is pressed, see rigType
+        """
+        return self.rigType
+
 
     def getStretch(self, *args):
         """function to get if the user need stretchy things
@@ -197,4 +514,12 @@ class rigCreator:
         self.isStretch = cmds.checkBox(self.ckb_stretch, q=True, value=True)
         return self.isStretch
 
-rigCreator()
\ No newline at end of file
+
+def launch(*args):
+    """
+    Open the rig tool, the window is not built on import anymore
+
+    Returns:
+        rigCreator: the ui, keep it to debug ui.ikfkPick and the others
+    """
+    return rigCreator()
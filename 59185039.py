@@ -1,9 +1,583 @@
 import maya.cmds as cmds
-import dw_maya_utils as dwu
-import dw_presets_io as dwpreset
-import dw_decorators as dwdeco
-import dw_json as dwjson
 import re
+import os
+import json
+import array
+import mmap
+import struct
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+SHAPE_PATTERN = '[Ss]hape(\\d+)?$'  #: str: maya default shape names, used by MayaNode.rename
+
+
+class AttrCache(object):
+    """Cache the attribute names of maya nodes
+
+    Long and short names are stored together in a frozenset so checking if an attribute exists
+    is O(1) and ``cmds.listAttr`` is only called the first time a node (or a plug) is queried.
+    Every entry keeps the MObjectHandle and the attribute count of its node and is checked through the api
+    before use : a node deleted and made again with the same name, or an attribute added with cmds.addAttr,
+    is listed again.
+
+    Note:
+        ``MayaNode.addAttr`` / ``MayaNode.deleteAttr`` invalidate the node directly,
+        ``install_callbacks`` also clears the cache on new/open scene
+
+    Attributes:
+        hits (int): number of queries answered by the cache
+        misses (int): number of queries that had to call cmds.listAttr
+    """
+
+    def __init__(self):
+        self._names = {}  #: dict: {node: (MObjectHandle, attribute count, {attr or None: frozenset of names})}
+        self._callbacks = []  #: list: OpenMaya callback ids
+        self._watched = set()  #: set: nodes with an attribute added/removed callback
+        self.hits = 0
+        self.misses = 0
+
+    def names(self, node, attr=None):
+        """
+        Args:
+            node (str): name of the maya node
+            attr (str, optional): plug of the node, ie: weightList[0]
+
+        Returns:
+            frozenset: long and short names of the attributes
+        """
+        entry = self._names.get(node)
+        if entry is not None and not self._valid(node, entry):
+            del self._names[node]
+            entry = None
+        if entry is not None and attr in entry[2]:
+            self.hits += 1
+            return entry[2][attr]
+
+        self.misses += 1
+        plug = '{}.{}'.format(node, attr) if attr else node
+        names = (cmds.listAttr(plug) or []) + (cmds.listAttr(plug, shortNames=True) or [])
+        # children of multi compounds are listed as weightList.weights, keep their own name too
+        result = frozenset(names + [n.rsplit('.', 1)[-1] for n in names if '.' in n])
+        if entry is None:
+            entry = self._entry(node)
+            if entry is None:
+                return result
+            self._names[node] = entry
+        entry[2][attr] = result
+        if self._callbacks and node not in self._watched:
+            self._watch(node)
+        return result
+
+    def has(self, node, attr):
+        """
+        Check an attribute or a plug path against the names of the node, the indices are not checked
+        so weightList[0].weights and weightList[12].weights use the same cached names
+
+        Args:
+            node (str): name of the maya node
+            attr (str): attribute or plug, ie: translateX or weightList[0].weights
+
+        Returns:
+            bool: the attribute exists on the node
+        """
+        # maya attribute names are unique per node, children of compounds included
+        leaf = re.sub(r'\[[^\]]*\]', '', attr).rsplit('.', 1)[-1]
+        return leaf in self.names(node)
+
+    @staticmethod
+    def _entry(node):
+        """
+        Returns:
+            tuple: (MObjectHandle, attribute count, {}) of the node, None if the node doesn't exist
+        """
+        import maya.api.OpenMaya as om2
+        sel = om2.MSelectionList()
+        try:
+            sel.add(node)
+        except RuntimeError:
+            return None
+        obj = sel.getDependNode(0)
+        return om2.MObjectHandle(obj), om2.MFnDependencyNode(obj).attributeCount(), {}
+
+    @staticmethod
+    def _valid(node, entry):
+        """
+        Returns:
+            bool: the node of the entry is still alive, named node and has the same number of attributes
+        """
+        import maya.api.OpenMaya as om2
+        handle, count = entry[0], entry[1]
+        if not handle.isValid():
+            return False
+        fn = om2.MFnDependencyNode(handle.object())
+        return fn.name() == node.rsplit('|', 1)[-1] and fn.attributeCount() == count
+
+    def invalidate(self, node=None):
+        """
+        Remove a node from the cache, if no node is given the whole cache is cleared
+
+        Args:
+            node (str, optional): name of the maya node
+        """
+        if node is None:
+            self._names.clear()
+        else:
+            self._names.pop(node, None)
+
+    def reset_stats(self):
+        """ set hits and misses counters back to 0 """
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: hits, misses and number of cached nodes
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'nodes': len(self._names)}
+
+    def install_callbacks(self):
+        """
+        Clear the cache on new scene/open scene and invalidate a node when maya add or remove one of its attributes
+        """
+        if self._callbacks:
+            return
+        import maya.api.OpenMaya as om2
+        for msg in [om2.MSceneMessage.kAfterNew, om2.MSceneMessage.kAfterOpen]:
+            self._callbacks.append(om2.MSceneMessage.addCallback(msg, self._on_scene_changed))
+        for node in list(self._names):
+            self._watch(node)
+
+    def remove_callbacks(self):
+        """ remove all the callbacks installed by install_callbacks """
+        if self._callbacks:
+            import maya.api.OpenMaya as om2
+            om2.MMessage.removeCallbacks(self._callbacks)
+        self._callbacks = []
+        self._watched.clear()
+
+    def _watch(self, node):
+        """
+        Add an attribute added/removed callback on the node
+
+        Args:
+            node (str): name of the maya node
+        """
+        import maya.api.OpenMaya as om2
+        sel = om2.MSelectionList()
+        try:
+            sel.add(node)
+        except RuntimeError:
+            return
+        mobj = sel.getDependNode(0)
+        cb = om2.MNodeMessage.addAttributeAddedOrRemovedCallback(mobj, self._on_attr_changed, node)
+        self._callbacks.append(cb)
+        self._watched.add(node)
+
+    def _on_attr_changed(self, msg, plug, node):
+        self.invalidate(node)
+
+    def _on_scene_changed(self, *args):
+        self.invalidate()
+
+
+class DagCache(object):
+    """Cache the transform/shape resolution of maya nodes
+
+    The pair is keyed on the node UUID and its name : a file referenced twice gives the same UUID to the nodes
+    of both namespaces. It is resolved once with ``cmds.nodeType`` and ``cmds.listRelatives``,
+    every hit is checked with the api (no command) against the names, the parent of the shape and the children
+    of the transform, so a reparented, renamed or deleted shape is resolved again.
+
+    Note:
+        ``MayaNode.rename`` invalidate what it touch, nodes made by ``NodeBatch`` are stored directly,
+        ``install_callbacks`` can be used to let maya clear the cache on any DAG change or rename
+
+    Attributes:
+        hits (int): number of resolutions answered by the cache
+        misses (int): number of resolutions that had to query maya
+    """
+
+    def __init__(self):
+        self._dag = {}  #: dict: {(uuid, name): ((transform, shape, nodeType), handles, signature)}
+        self._keys = {}  #: dict: {uuid: set of keys in _dag}
+        self._callbacks = []  #: list: OpenMaya callback ids
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def uuid(node):
+        """
+        Args:
+            node (str): name of the maya node
+
+        Returns:
+            str: uuid of the node, None if the node doesn't exist
+        """
+        uuid = cmds.ls(node, uuid=True)
+        if uuid:
+            return uuid[0]
+
+    @staticmethod
+    def _handles(nodes):
+        """
+        Args:
+            nodes (list): node names or MObjects, None is kept
+
+        Returns:
+            list: MObjectHandle of each node
+        """
+        import maya.api.OpenMaya as om2
+        handles = []
+        for node in nodes:
+            if node is None:
+                handles.append(None)
+                continue
+            if isinstance(node, basestring):
+                sel = om2.MSelectionList()
+                sel.add(node)
+                node = sel.getDependNode(0)
+            handles.append(om2.MObjectHandle(node))
+        return handles
+
+    @staticmethod
+    def _signature(handles):
+        """
+        Args:
+            handles (list): MObjectHandle of the transform and the shape
+
+        Returns:
+            tuple: name, parent name and children count of each node, None if a node has been deleted
+        """
+        import maya.api.OpenMaya as om2
+        signature = []
+        for handle in handles:
+            if handle is None:
+                signature.append(None)
+                continue
+            if not handle.isValid():
+                return None
+            obj = handle.object()
+            name = om2.MFnDependencyNode(obj).name()
+            if obj.hasFn(om2.MFn.kDagNode):
+                fn = om2.MFnDagNode(obj)
+                parent = om2.MFnDependencyNode(fn.parent(0)).name()
+                signature.append((name, parent, fn.childCount()))
+            else:
+                signature.append((name, None, 0))
+        return tuple(signature)
+
+    def resolve(self, node, uuid=None):
+        """
+        Args:
+            node (str): name of the maya node
+            uuid (str, optional): uuid of the node if already known
+
+        Returns:
+            tuple: (transform, shape, nodeType) like MayaNode.tr, MayaNode.sh and MayaNode.nodeType
+        """
+        if uuid is None:
+            uuid = self.uuid(node)
+        entry = self._dag.get((uuid, node))
+        if entry is not None:
+            result, handles, signature = entry
+            if signature is not None and self._signature(handles) == signature:
+                self.hits += 1
+                return result
+
+        self.misses += 1
+        node_type = cmds.nodeType(node)
+        if node_type == 'transform':
+            tr = node
+            _sh = cmds.listRelatives(node, type='shape', ni=True)
+            sh = _sh[0] if _sh else None
+        else:
+            sh = node
+            tr = sh
+            _tr = cmds.listRelatives(node, p=True)
+            if _tr:
+                if cmds.listRelatives(_tr, type='shape', ni=True):
+                    tr = _tr[0]
+        if sh and sh != node:
+            node_type = cmds.nodeType(sh)
+
+        result = (tr, sh, node_type)
+        if uuid is not None:
+            self._add(uuid, node, result, self._handles([tr, sh if sh != tr else None]))
+        return result
+
+    def _add(self, uuid, node, result, handles):
+        key = (uuid, node)
+        self._dag[key] = (result, handles, self._signature(handles))
+        self._keys.setdefault(uuid, set()).add(key)
+
+    def invalidate(self, uuid=None):
+        """
+        Remove a node from the cache, if no uuid is given the whole cache is cleared
+
+        Args:
+            uuid (str, optional): uuid of the maya node, every namespace sharing it is removed
+        """
+        if uuid is None:
+            self._dag.clear()
+            self._keys.clear()
+        else:
+            for key in self._keys.pop(uuid, ()):
+                self._dag.pop(key, None)
+
+    def store(self, uuid, result, objects=None):
+        """
+        Register the resolution of a node made by the tools so it is never queried
+
+        Args:
+            uuid (str): uuid of the maya node
+            result (tuple): (transform, shape, nodeType)
+            objects (list, optional): MObject of the transform and the shape if already known
+        """
+        tr, sh = result[:2]
+        if objects is None:
+            objects = [tr, sh if sh != tr else None]
+        self._add(uuid, tr, result, self._handles(objects))
+
+    def reset_stats(self):
+        """ set hits and misses counters back to 0 """
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: hits, misses and number of cached nodes
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'nodes': len(self._dag)}
+
+    def install_callbacks(self):
+        """
+        Clear the cache when maya change the DAG (parenting, shapes added/removed), rename a node or open a scene
+        """
+        if self._callbacks:
+            return
+        import maya.api.OpenMaya as om2
+        self._callbacks.append(om2.MDagMessage.addAllDagChangesCallback(self._on_changed))
+        self._callbacks.append(om2.MNodeMessage.addNameChangedCallback(om2.MObject.kNullObj, self._on_changed))
+        for msg in [om2.MSceneMessage.kAfterNew, om2.MSceneMessage.kAfterOpen]:
+            self._callbacks.append(om2.MSceneMessage.addCallback(msg, self._on_changed))
+
+    def remove_callbacks(self):
+        """ remove all the callbacks installed by install_callbacks """
+        if self._callbacks:
+            import maya.api.OpenMaya as om2
+            om2.MMessage.removeCallbacks(self._callbacks)
+        self._callbacks = []
+
+    def _on_changed(self, *args):
+        self.invalidate()
+
+
+def _index_runs(indices):
+    """
+    Split sorted multi indices into contiguous ranges
+    ``_index_runs([0, 1, 2, 5, 6])`` give ``[(0, 2, 0), (5, 6, 3)]``
+
+    Args:
+        indices (numpy.ndarray): sorted logical indices
+
+    Returns:
+        list: (first index, last index, position in indices) for each range
+    """
+    import numpy as np
+    if not len(indices):
+        return []
+    breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [len(indices)])) - 1
+    return [(int(indices[s]), int(indices[e]), int(s)) for s, e in zip(starts, ends)]
+
+
+attr_cache = AttrCache()  #: AttrCache: shared by every MayaNode and MAttr
+dag_cache = DagCache()  #: DagCache: shared by every MayaNode
+
+
+class PlugBackend(object):
+    """Read attributes through an OpenMaya (API 2.0) MPlug instead of cmds strings
+
+    Numeric, unit (distance/angle/time), enum, string, matrix and numeric array values are converted
+    directly from the plug with the same shape of result as cmds.getAttr.
+    Anything else returns ``PlugBackend.unsupported`` so the caller can fall back to cmds.
+
+    Note:
+        There is no write : MPlug.set* is not recorded in the undo queue, so MAttr.set stays on cmds.setAttr
+
+    Attributes:
+        api (module): maya.api.OpenMaya, imported on first use, can be replaced by a stand-in module
+        unsupported (object): returned when a plug can't be handled by the api
+    """
+    api = None
+    unsupported = object()
+
+    @classmethod
+    def om(cls):
+        """
+        Returns:
+            module: maya.api.OpenMaya
+        """
+        if cls.api is None:
+            import maya.api.OpenMaya as om2
+            cls.api = om2
+        return cls.api
+
+    @classmethod
+    def plug(cls, name):
+        """
+        Args:
+            name (str): 'node.attr', slices are not supported
+
+        Returns:
+            MPlug: None if the plug can't be found
+        """
+        om2 = cls.om()
+        sel = om2.MSelectionList()
+        try:
+            sel.add(name)
+            return sel.getPlug(0)
+        except (RuntimeError, TypeError):
+            return None
+
+    @classmethod
+    def get(cls, plug):
+        """
+        Args:
+            plug (MPlug): plug to read
+
+        Returns:
+            Any: same value as cmds.getAttr or PlugBackend.unsupported
+        """
+        if plug.isArray:
+            return cls.unsupported
+        if plug.isCompound:
+            values = [cls._getValue(plug.child(i)) for i in range(plug.numChildren())]
+            if any(v is cls.unsupported for v in values):
+                return cls.unsupported
+            return [tuple(values)]
+        return cls._getValue(plug)
+
+    @classmethod
+    def getArray(cls, plug, dtype='float64'):
+        """
+        Read a whole multi attribute or a typed array attribute, see MAttr.get_array
+
+        Args:
+            plug (MPlug): plug to read
+            dtype (str): numpy dtype of the values
+
+        Returns:
+            tuple: (indices, values) numpy arrays or PlugBackend.unsupported
+        """
+        import numpy as np
+        if not plug.isArray:
+            if cls._kind(plug) not in ('doubleArray', 'intArray', 'pointArray', 'vectorArray'):
+                return cls.unsupported
+            values = np.array(cls._getValue(plug), dtype=dtype)
+            return np.arange(len(values), dtype=np.int64), values
+
+        count = plug.numElements()
+        indices = np.empty(count, dtype=np.int64)
+        values = None
+        for i in range(count):
+            element = plug.elementByPhysicalIndex(i)
+            value = cls.get(element)
+            if value is cls.unsupported or isinstance(value, basestring):
+                return cls.unsupported
+            if values is None:
+                # compound elements (ie: pnts) are read as [(x, y, z)]
+                width = len(value[0]) if isinstance(value, list) else None
+                values = np.empty((count, width) if width else count, dtype=dtype)
+            values[i] = value[0] if isinstance(value, list) else value
+            indices[i] = element.logicalIndex()
+        if values is None:
+            values = np.empty(0, dtype=dtype)
+        return indices, values
+
+    @classmethod
+    def _kind(cls, plug):
+        """
+        Args:
+            plug (MPlug): plug to inspect
+
+        Returns:
+            str: kind of data stored in the plug, None if unsupported
+        """
+        om2 = cls.om()
+        attr = plug.attribute()
+        if attr.hasFn(om2.MFn.kNumericAttribute):
+            ntype = om2.MFnNumericAttribute(attr).numericType()
+            if ntype == om2.MFnNumericData.kBoolean:
+                return 'bool'
+            if ntype in (om2.MFnNumericData.kFloat, om2.MFnNumericData.kDouble):
+                return 'double'
+            if ntype in (om2.MFnNumericData.kByte, om2.MFnNumericData.kChar, om2.MFnNumericData.kShort,
+                         om2.MFnNumericData.kInt, om2.MFnNumericData.kLong):
+                return 'int'
+        elif attr.hasFn(om2.MFn.kUnitAttribute):
+            utype = om2.MFnUnitAttribute(attr).unitType()
+            if utype == om2.MFnUnitAttribute.kDistance:
+                return 'distance'
+            if utype == om2.MFnUnitAttribute.kAngle:
+                return 'angle'
+            if utype == om2.MFnUnitAttribute.kTime:
+                return 'time'
+        elif attr.hasFn(om2.MFn.kEnumAttribute):
+            return 'int'
+        elif attr.hasFn(om2.MFn.kMatrixAttribute):
+            return 'matrix'
+        elif attr.hasFn(om2.MFn.kTypedAttribute):
+            dtype = om2.MFnTypedAttribute(attr).attrType()
+            if dtype == om2.MFnData.kString:
+                return 'string'
+            if dtype == om2.MFnData.kMatrix:
+                return 'matrix'
+            if dtype == om2.MFnData.kDoubleArray:
+                return 'doubleArray'
+            if dtype == om2.MFnData.kIntArray:
+                return 'intArray'
+            if dtype == om2.MFnData.kPointArray:
+                return 'pointArray'
+            if dtype == om2.MFnData.kVectorArray:
+                return 'vectorArray'
+        return None
+
+    @classmethod
+    def _getValue(cls, plug):
+        om2 = cls.om()
+        kind = cls._kind(plug)
+        if kind == 'bool':
+            return plug.asBool()
+        if kind == 'int':
+            return plug.asInt()
+        if kind == 'double':
+            return plug.asDouble()
+        if kind == 'distance':
+            return plug.asMDistance().asUnits(om2.MDistance.uiUnit())
+        if kind == 'angle':
+            return plug.asMAngle().asUnits(om2.MAngle.uiUnit())
+        if kind == 'time':
+            return plug.asMTime().asUnits(om2.MTime.uiUnit())
+        if kind == 'string':
+            return plug.asString()
+        if kind == 'matrix':
+            return list(om2.MFnMatrixData(plug.asMObject()).matrix())
+        if kind == 'doubleArray':
+            return list(om2.MFnDoubleArrayData(plug.asMObject()).array())
+        if kind == 'intArray':
+            return list(om2.MFnIntArrayData(plug.asMObject()).array())
+        if kind == 'pointArray':
+            return [(p.x, p.y, p.z, p.w) for p in om2.MFnPointArrayData(plug.asMObject()).array()]
+        if kind == 'vectorArray':
+            return [(v.x, v.y, v.z) for v in om2.MFnVectorArrayData(plug.asMObject()).array()]
+        return cls.unsupported
+
 
 class MAttr(object):
     """Represent a maya attribute
@@ -13,13 +587,18 @@ class MAttr(object):
         attr (str): a string that represent the attribute
     Attributes:
         attr_bypass (str): regex to bypass the compound attributes, because i need to connect and getattr
+        use_api (bool): read through a cached MPlug (see PlugBackend) instead of cmds when possible
+        array_types (tuple): typed attributes that store a whole array in a single plug
     """
     attr_bypass = re.compile('\[(\d+)?:(\d+)?\]')
+    use_api = False
+    array_types = ('doubleArray', 'floatArray', 'Int32Array', 'pointArray', 'vectorArray')
 
     def __init__(self, node, attr='result'):
         self.__dict__['node'] = node  #: str: current priority node evaluated
         self.__dict__['attribute'] = attr  #: str: current priority node evaluated
         self.__dict__['idx'] = 0  #: str: current priority node evaluated
+        self.__dict__['plug'] = None  #: tuple: (attribute, MPlug) cached by the api backend
 
     def __getitem__(self, item):
         """
@@ -58,7 +637,7 @@ class MAttr(object):
 
         """
         myattr = '{}.{}'.format(self.attr, attr)
-        if myattr in self.listAttr(myattr):
+        if attr_cache.has(self._node, myattr):
             return MAttr(self._node, '{}.{}'.format(self.attr, attr))
         else:
             return self.__getattribute__(attr)
@@ -131,26 +710,123 @@ class MAttr(object):
         Returns:
             Any: cmds.getAttr()
         """
-        if self.attr in self.listAttr(self.attr) or self.attr_bypass.search(self.attr):
+        if attr_cache.has(self._node, self.attr) or self.attr_bypass.search(self.attr):
+            if self.use_api:
+                plug = self._plug()
+                if plug is not None:
+                    value = PlugBackend.get(plug)
+                    if value is not PlugBackend.unsupported:
+                        return value
             return cmds.getAttr('{}.{}'.format(self._node, self.attr))
 
-    @dwdeco.acceptString('destination')
+    def get_array(self, dtype='float64'):
+        """
+        Read a whole multi attribute or a typed array attribute as numpy arrays
+        the values are read from the MPlug (see PlugBackend.getArray), when the api can't read them
+        sparse multi are read by contiguous ranges of indices : one getAttr per range instead of one per index
+        ``mn = MayaNode('cluster1')``
+        ``idx, w = mn.weightList[1].weights.get_array('float32')``
+
+        Args:
+            dtype (str): numpy dtype of the values, ie: float32 or float64
+
+        Returns:
+            tuple: (indices, values) numpy arrays, values is (n,) or (n, 3)/(n, 4) for vector/point arrays
+                and multi of compounds (ie: pnts)
+        """
+        import numpy as np
+        mplug = self._plug()
+        if mplug is not None:
+            result = PlugBackend.getArray(mplug, dtype)
+            if result is not PlugBackend.unsupported:
+                return result
+
+        plug = '{}.{}'.format(self._node, self.attr)
+        attr_type = cmds.getAttr(plug, type=True)
+        if attr_type in self.array_types:
+            values = np.asarray(cmds.getAttr(plug) or [], dtype=dtype)
+            return np.arange(len(values), dtype=np.int64), values
+
+        indices = np.asarray(cmds.getAttr(plug, multiIndices=True) or [], dtype=np.int64)
+        values = np.empty(0, dtype=dtype)
+        for start, end, offset in _index_runs(indices):
+            run = cmds.getAttr('{}[{}:{}]'.format(plug, start, end))
+            if not isinstance(run, (list, tuple)):
+                run = [run]
+            run = np.asarray(run, dtype=dtype)
+            if not offset:
+                # the first run gives the shape of an element, (n, 3) for a multi of float3
+                values = np.empty((len(indices),) + run.shape[1:], dtype=dtype)
+            values[offset:offset + end - start + 1] = run
+        return indices, values
+
+    def set_array(self, values, indices=None):
+        """
+        Write a whole multi attribute or a typed array attribute from numpy arrays
+        sparse multi are written by contiguous ranges of indices : one setAttr per range instead of one per index
+        ``mn.weightList[1].weights.set_array(w, idx)``
+
+        Args:
+            values (numpy.ndarray): values to set, (n,) or (n, 3)/(n, 4) for vector/point arrays
+            indices (numpy.ndarray, optional): logical indices of the values, by default 0 to n-1
+        """
+        import numpy as np
+        plug = '{}.{}'.format(self._node, self.attr)
+        values = np.asarray(values)
+
+        attr_type = cmds.getAttr(plug, type=True)
+        if attr_type in ('pointArray', 'vectorArray'):
+            cmds.setAttr(plug, len(values), *[tuple(v) for v in values.tolist()], type=attr_type)
+            return
+        if attr_type in self.array_types:
+            cmds.setAttr(plug, values.tolist(), type=attr_type)
+            return
+
+        if indices is None:
+            indices = np.arange(len(values), dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(indices) != len(values):
+            cmds.error('{} values for {} indices'.format(len(values), len(indices)))
+        order = np.argsort(indices, kind='stable')
+        indices = indices[order]
+        values = values[order].tolist()
+        for start, end, offset in _index_runs(indices):
+            cmds.setAttr('{}[{}:{}]'.format(plug, start, end), *values[offset:offset + end - start + 1])
+
+    def _plug(self):
+        """
+        MPlug of the current attribute, it is cached until the attribute change (ie: with __getitem__)
+        Returns:
+            MPlug: None if the plug can't be used by the api (slices...)
+        """
+        cached = self.__dict__['plug']
+        if cached and cached[0] == self.attr:
+            return cached[1]
+        plug = None
+        if not self.attr_bypass.search(self.attr):
+            plug = PlugBackend.plug('{}.{}'.format(self._node, self.attr))
+        self.__dict__['plug'] = (self.attr, plug)
+        return plug
+
     def connect(self, destination, force=True):
         """
         This is the cmds.connectAttr
         Args:
-            destination (bool): another attribute should be plugged
+            destination (bool): another attribute should be plugged, a string or a list of them
             force (bool):  by default True
 
         Returns:
 
         """
+        # same as @dw_decorators.acceptString('destination') without importing dw_decorators with the module
+        if isinstance(destination, basestring):
+            destination = [destination]
         _isConnec = [True if '.' in i and cmds.ls(i) else False for i in destination]
         if not all(_isConnec):
             invalid_input = ', '.join([i for x, i in zip(_isConnec, destination) if not x])
             cmds.error('please provide good attributes :``` {} ```are invalid'.format(invalid_input))
 
-        if self.attr in self.listAttr(self.attr) or self.attr_bypass.search(self.attr):
+        if attr_cache.has(self._node, self.attr) or self.attr_bypass.search(self.attr):
             for d in destination:
                 cmds.connectAttr('{}.{}'.format(self._node, self.attr), d, force=force)
 
@@ -160,12 +836,9 @@ class MAttr(object):
         Args:
             attr (str): check if the attribute exist
         Returns:
-            list: all the attributes available or the attribute
+            frozenset: all the attributes available or the attribute
         """
-        if attr:
-            return cmds.listAttr('{}.{}'.format(self._node, attr)) + cmds.listAttr('{}.{}'.format(self._node, attr),
-                                                                                   shortNames = True)
-        return cmds.listAttr(self._node) + cmds.listAttr(self._node, shortNames = True)
+        return attr_cache.names(self._node, attr)
 
     @property
     def _node(self):
@@ -196,6 +869,827 @@ class MAttr(object):
             return list(set(o))
         return o
 
+class PresetStream(object):
+    """Streaming preset format : one json record per line and large numeric arrays in a sidecar binary file
+
+    ``myfile.jsonl`` contains for each node a header record ``{"node": key, "nodeType": type}`` followed by
+    one record per attribute ``{"node": key, "sub": node, "attr": name, "value": value}``.
+    Arrays bigger than ``array_threshold`` are written in ``myfile.bin`` as float64
+    and the record store ``"bin": [offset, count, shape, kind]`` instead of the value,
+    kind is ``FLOAT``, ``INT`` or ``BOOL`` so the values come back with their type.
+
+    Nodes are written one sub node (transform/shape) at a time and read back one sub node at a time
+    so the whole preset is never in memory.
+
+    Attributes:
+        array_threshold (int): minimum number of numbers in an array to go to the binary file
+        FLOAT, INT, BOOL (int): kind of the values of an array, INT is also True in the files saved with is_int
+    """
+    array_threshold = 1024
+    FLOAT, INT, BOOL = 0, 1, 2
+
+    @staticmethod
+    def sidecar(path):
+        """
+        Args:
+            path (str): /path/gneh/myfile.jsonl
+
+        Returns:
+            str: /path/gneh/myfile.bin
+        """
+        return os.path.splitext(path)[0] + '.bin'
+
+    @classmethod
+    def _flatArray(cls, value):
+        """
+        Args:
+            value (Any): attribute value
+
+        Returns:
+            tuple: (array.array, shape, kind) if the value is a big numeric array, None otherwise
+        """
+        if not isinstance(value, (list, tuple)) or len(value) < 1:
+            return None
+        first = value[0]
+        try:
+            if isinstance(first, (list, tuple)):
+                width = len(first)
+                if width * len(value) < cls.array_threshold:
+                    return None
+                if any(len(v) != width for v in value):
+                    return None
+                items = [x for v in value for x in v]
+                shape = [len(value), width]
+            else:
+                if len(value) < cls.array_threshold:
+                    return None
+                items = value
+                shape = [len(value)]
+            if all(isinstance(x, bool) for x in items):
+                kind = cls.BOOL
+            elif all(isinstance(x, int) for x in items):
+                kind = cls.INT
+            else:
+                kind = cls.FLOAT
+            return array.array('d', items), shape, kind
+        except TypeError:
+            return None
+
+    @classmethod
+    def _unflatten(cls, values, shape, kind):
+        """
+        Args:
+            values (array.array): float64 values read back
+            shape (list): [count] or [count / width, width]
+            kind (int): FLOAT, INT or BOOL
+
+        Returns:
+            list: same value as it was saved
+        """
+        values = values.tolist()
+        if kind == cls.BOOL:
+            values = [bool(v) for v in values]
+        elif kind == cls.INT:
+            values = [int(v) for v in values]
+        if len(shape) == 2:
+            w = shape[1]
+            values = [tuple(values[i:i + w]) for i in range(0, len(values), w)]
+        return values
+
+    @classmethod
+    def write(cls, path, nodes):
+        """
+        Save the nodes incrementally
+
+        Args:
+            path (str): /path/gneh/myfile.jsonl
+            nodes (list): MayaNode to save
+
+        Returns:
+            str: path
+        """
+        bin_path = cls.sidecar(path)
+        bin_file = None
+        offset = 0
+        try:
+            with open(path, 'w') as f:
+                for mn in nodes:
+                    key = mn.tr.split(':')[-1]
+                    f.write(json.dumps({'node': key, 'nodeType': mn.nodeType}) + '\n')
+                    for part in mn._presetParts():
+                        for sub, attrs in part.items():
+                            for attr, value in attrs.items():
+                                record = {'node': key, 'sub': sub, 'attr': attr}
+                                flat = cls._flatArray(value)
+                                if flat:
+                                    if bin_file is None:
+                                        bin_file = open(bin_path, 'wb')
+                                    flat[0].tofile(bin_file)
+                                    record['bin'] = [offset, len(flat[0]), flat[1], flat[2]]
+                                    offset += len(flat[0]) * flat[0].itemsize
+                                else:
+                                    record['value'] = value
+                                f.write(json.dumps(record) + '\n')
+                        # release the sub node preset before the next one
+                        del part
+        finally:
+            if bin_file is not None:
+                bin_file.close()
+        return path
+
+    @classmethod
+    def read(cls, path, nodes=None):
+        """
+        Read the file incrementally, attributes are grouped by sub node in the order they were saved
+
+        Args:
+            path (str): /path/gneh/myfile.jsonl
+            nodes (list, optional): keys of the nodes to read, the arrays of the other nodes are not read
+                and the reading stops after the last record of these nodes
+
+        Returns:
+            generator: (key, nodeType, sub, {attr: value}) for each sub node
+        """
+        bin_path = cls.sidecar(path)
+        bin_file = None
+        key = ntype = sub = None
+        attrs = {}
+        wanted = set(nodes) if nodes is not None else None
+        left = set(nodes) if nodes is not None else None  #: nodes not reached yet
+        try:
+            with open(path) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if wanted is not None and record['node'] not in wanted:
+                        # records of a node are contiguous, so the nodes reached so far are complete
+                        if attrs:
+                            yield key, ntype, sub, attrs
+                        attrs = {}
+                        key = sub = None
+                        if not left:
+                            return
+                        continue
+                    if wanted is not None:
+                        left.discard(record['node'])
+                    if record.get('sub') != sub or record['node'] != key:
+                        if attrs:
+                            yield key, ntype, sub, attrs
+                        attrs = {}
+                        sub = record.get('sub')
+                    if 'nodeType' in record and 'attr' not in record:
+                        key = record['node']
+                        ntype = record['nodeType']
+                        continue
+                    key = record['node']
+                    if 'bin' in record:
+                        if bin_file is None:
+                            bin_file = open(bin_path, 'rb')
+                        offset, count, shape, kind = record['bin']
+                        bin_file.seek(offset)
+                        values = array.array('d')
+                        values.fromfile(bin_file, count)
+                        attrs[record['attr']] = cls._unflatten(values, shape, kind)
+                    else:
+                        attrs[record['attr']] = record['value']
+                if attrs:
+                    yield key, ntype, sub, attrs
+        finally:
+            if bin_file is not None:
+                bin_file.close()
+
+
+class LazyAttrs(Mapping):
+    """Attributes of a sub node where the arrays are read from a PresetBinary file only when accessed
+
+    It is a read only mapping and not a dict, so nothing stands in for an array that is not read yet :
+    ``dict(attrs)``, ``attrs.copy()`` or ``**attrs`` read every array, ``json.dumps`` needs ``attrs.copy()``
+
+    Args:
+        attrs (dict): scalar attributes
+        arrays (dict): {attr: [offset, count, shape, kind]} arrays stored in the binary blob
+        reader (PresetBinary): opened file the arrays are read from
+    """
+
+    def __init__(self, attrs, arrays, reader):
+        self._attrs = dict(attrs)
+        self._arrays = dict(arrays)
+        self._reader = reader
+
+    def __getitem__(self, attr):
+        if attr in self._arrays:
+            self._attrs[attr] = self._reader.array(*self._arrays.pop(attr))
+        return self._attrs[attr]
+
+    def __contains__(self, attr):
+        return attr in self._attrs or attr in self._arrays
+
+    def __iter__(self):
+        # a copy of the keys, reading an array moves it from _arrays to _attrs
+        return iter(list(self._attrs) + list(self._arrays))
+
+    def __len__(self):
+        return len(self._attrs) + len(self._arrays)
+
+    def __repr__(self):
+        return '<LazyAttrs {} values, {} arrays not read>'.format(len(self._attrs), len(self._arrays))
+
+    def copy(self):
+        """
+        Returns:
+            dict: every attribute, the arrays are read
+        """
+        return dict((k, self[k]) for k in self)
+
+
+class PresetBinary(object):
+    """Binary preset format that can be memory-mapped
+
+    The file starts with a 16 bytes prefix : ``DWPB``, version (uint32), offset of the header (uint64).
+    Numeric arrays are written after the prefix as float64 aligned on ``alignment`` bytes,
+    the header is a json dictionnary at the end of the file with the scalars and the table of the arrays :
+    ``{key: {"nodeType": type, "subs": {sub: {"attrs": {...}, "arrays": {attr: [offset, count, shape, kind]}}}}}``
+
+    When loading, the file is memory-mapped and an array is only read when its attribute is accessed.
+
+    Args:
+        path (str): /path/gneh/myfile.dwpb opened for reading
+
+    Attributes:
+        magic (str): first bytes of the file
+        alignment (int): alignment in bytes of each array in the blob
+        path (str): path of the opened file
+    """
+    magic = b'DWPB'
+    version = 1
+    alignment = 64
+    _prefix = struct.Struct('<4sIQ')
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_offset = self._prefix.unpack(self._mmap[:self._prefix.size])
+        if magic != self.magic:
+            self.close()
+            raise ValueError('{} is not a PresetBinary file'.format(path))
+        self.header = json.loads(self._mmap[header_offset:].decode('utf-8'))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """ close the memory map and the file """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+
+    def array(self, offset, count, shape, kind):
+        """
+        Args:
+            offset (int): offset in bytes from the start of the file
+            count (int): number of float64
+            shape (list): [count] or [count / width, width]
+            kind (int): PresetStream.FLOAT, INT or BOOL
+
+        Returns:
+            list: same value as it was saved
+
+        Raises:
+            ValueError: the file is closed, the arrays of its LazyAttrs that were not read are lost
+        """
+        if self._mmap is None:
+            raise ValueError('PresetBinary {} is closed, read the arrays before closing it'.format(self.path))
+        values = array.array('d')
+        data = self._mmap[offset:offset + count * values.itemsize]
+        getattr(values, 'frombytes', getattr(values, 'fromstring', None))(data)
+        return PresetStream._unflatten(values, shape, kind)
+
+    def preset(self, attrs=None):
+        """
+        Args:
+            attrs (list, optional): only keep these attributes (and nodeType), the other arrays are never read
+
+        Returns:
+            dict: same layout as MayaNode.attrPreset, arrays are LazyAttrs values read on access
+        """
+        def keep(dic):
+            if attrs is None:
+                return dic
+            return dict((k, v) for k, v in dic.items() if k in attrs or k == 'nodeType')
+
+        out = {}
+        for key, data in self.header.items():
+            out[key + '_nodeType'] = data['nodeType']
+            out[key] = dict((sub, LazyAttrs(keep(d['attrs']), keep(d['arrays']), self))
+                            for sub, d in data['subs'].items())
+        return out
+
+    @classmethod
+    def write(cls, path, nodes):
+        """
+        Save the nodes, arrays are written one by one while the header is kept in memory
+
+        Args:
+            path (str): /path/gneh/myfile.dwpb
+            nodes (list): MayaNode to save
+
+        Returns:
+            str: path
+        """
+        header = {}
+        with open(path, 'wb') as f:
+            f.write(cls._prefix.pack(cls.magic, cls.version, 0))
+            offset = cls._prefix.size
+            for mn in nodes:
+                key = mn.tr.split(':')[-1]
+                subs = {}
+                header[key] = {'nodeType': mn.nodeType, 'subs': subs}
+                for part in mn._presetParts():
+                    for sub, attrs in part.items():
+                        scalars = {}
+                        arrays = {}
+                        for attr, value in attrs.items():
+                            flat = PresetStream._flatArray(value)
+                            if not flat:
+                                scalars[attr] = value
+                                continue
+                            pad = -offset % cls.alignment
+                            f.write(b'\0' * pad)
+                            offset += pad
+                            flat[0].tofile(f)
+                            arrays[attr] = [offset, len(flat[0]), flat[1], flat[2]]
+                            offset += len(flat[0]) * flat[0].itemsize
+                        subs[sub] = {'attrs': scalars, 'arrays': arrays}
+                    del part
+            f.write(json.dumps(header).encode('utf-8'))
+            f.seek(0)
+            f.write(cls._prefix.pack(cls.magic, cls.version, offset))
+        return path
+
+
+class PresetIndex(object):
+    """Namespace agnostic index of a preset, built once and reused for any namespace
+
+    Every node key is indexed with and without its namespace, so finding the entry or the nodeType
+    of a node is a dictionnary lookup instead of trying several concatenated keys.
+    The reverse map (node in a namespace -> preset key) is built once per namespace,
+    so the same preset can be loaded into many namespaces (crowd instancing) without being rebuilt.
+
+    ``index = PresetIndex(preset)``
+    ``for ns in ['crowd01', 'crowd02']: MayaNode.load_many(index, ns)``
+
+    Args:
+        preset (dict): attrPreset like dictionnary
+
+    Attributes:
+        cache_size (int): number of dictionnaries whose index is kept by PresetIndex.get
+    """
+    cache_size = 4
+    _cache = []  #: list: (preset, PresetIndex) of the last dictionnaries given to get, the most recent last
+
+    def __init__(self, preset):
+        self.preset = preset
+        self._keys = {}  #: dict: {name or namespace agnostic name: preset key}
+        self._types = {}  #: dict: {preset key: nodeType}
+        self._targets = {}  #: dict: {namespace: {node: preset key}}
+        self._blenders = {}  #: dict: {((preset key, node), ...): PresetBlender}
+        for k in preset:
+            if k.endswith('_nodeType'):
+                continue
+            self._keys.setdefault(k.rsplit(':', 1)[-1], k)
+            self._keys[k] = k
+        for k in self._keys.values():
+            self._types[k] = preset.get(k + '_nodeType') or preset.get(k.rsplit(':', 1)[-1] + '_nodeType')
+        for k in preset:
+            # presets created from a nodeType string only have the nodeType key
+            if k.endswith('_nodeType'):
+                name = k[:-len('_nodeType')]
+                if name not in self._keys:
+                    self._keys.setdefault(name.rsplit(':', 1)[-1], name)
+                    self._keys[name] = name
+                    self._types[name] = preset[k]
+
+    @classmethod
+    def get(cls, preset):
+        """
+        The index of the last dictionnaries is kept, so scrubbing ``loadNode(preset, blend)`` with the same
+        dictionnary reuses its index and blenders instead of indexing and capturing the scene at each call.
+        The dictionnary is matched by identity : call forget after changing it in place
+
+        Args:
+            preset (Any): dictionnary or PresetIndex
+
+        Returns:
+            PresetIndex: the index itself or the index of the dictionnary
+        """
+        if isinstance(preset, cls):
+            return preset
+        for dic, index in cls._cache:
+            if dic is preset:
+                return index
+        index = cls(preset)
+        cls._cache.append((preset, index))
+        del cls._cache[:-cls.cache_size]
+        return index
+
+    @classmethod
+    def forget(cls, preset=None):
+        """
+        Drop the index kept by get for a dictionnary
+
+        Args:
+            preset (dict, optional): dictionnary given to get, every dictionnary by default
+        """
+        cls._cache[:] = [(dic, index) for dic, index in cls._cache if preset is not None and dic is not preset]
+
+    def keys(self):
+        """
+        Returns:
+            list: node keys of the preset
+        """
+        return sorted(set(self._keys.values()))
+
+    def key(self, node):
+        """
+        Args:
+            node (str): node name with or without namespace
+
+        Returns:
+            str: key of the node in the preset, None if the node is not in the preset
+        """
+        if node in self._keys:
+            return self._keys[node]
+        return self._keys.get(node.rsplit(':', 1)[-1])
+
+    def nodeType(self, node):
+        """
+        Args:
+            node (str): node name with or without namespace
+
+        Returns:
+            str: nodeType stored in the preset
+        """
+        return self._types.get(self.key(node))
+
+    def data(self, node):
+        """
+        Args:
+            node (str): node name with or without namespace
+
+        Returns:
+            dict: preset entry of the node
+        """
+        return self.preset.get(self.key(node))
+
+    def target(self, key, targ_ns=':'):
+        """
+        Args:
+            key (str): key of the node in the preset
+            targ_ns (str): namespace of the node
+
+        Returns:
+            str: name of the node in the namespace
+        """
+        if targ_ns in [':', '']:
+            return key
+        return targ_ns + ':' + key.rsplit(':', 1)[-1]
+
+    def targets(self, targ_ns=':'):
+        """
+        Args:
+            targ_ns (str): namespace of the nodes
+
+        Returns:
+            dict: {node name in the namespace: preset key}, computed once per namespace
+        """
+        if targ_ns not in self._targets:
+            self._targets[targ_ns] = dict((self.target(k, targ_ns), k) for k in self.keys())
+        return self._targets[targ_ns]
+
+    def blender(self, nodes):
+        """
+        The blender of some nodes is kept in the index, so every scrub of a slider reuses the values
+        captured by the first one instead of reading maya again
+
+        Args:
+            nodes (list): (preset key, maya node) pairs
+
+        Returns:
+            PresetBlender: blender of the nodes, built on the first call
+        """
+        nodes = tuple(nodes)
+        if nodes not in self._blenders:
+            blender = PresetBlender()
+            for k, node in nodes:
+                blender.addNode(k, node, self.preset[k], self.nodeType(k))
+            self._blenders[nodes] = blender
+        return self._blenders[nodes]
+
+    def release(self, nodes=None):
+        """
+        Forget the blender of the nodes, the next blend captures the scene again
+
+        Args:
+            nodes (list, optional): (preset key, maya node) pairs, every blender by default
+        """
+        if nodes is None:
+            self._blenders.clear()
+        else:
+            self._blenders.pop(tuple(nodes), None)
+
+
+def _flatNumbers(value, limit=16):
+    """
+    Flatten a numeric attribute value : scalar, compound like [(x, y, z)] or matrix
+
+    Args:
+        value (Any): attribute value from a preset
+        limit (int): bigger values are not considered (multi attributes, arrays)
+
+    Returns:
+        list: numbers of the value, None if the value is not numeric
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return [value]
+    if not isinstance(value, (list, tuple)) or not value or len(value) > limit:
+        return None
+    if len(value) == 1 and isinstance(value[0], (list, tuple)):
+        value = value[0]
+    if len(value) > limit or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value):
+        return None
+    return list(value)
+
+
+# attribute types written by PresetBlender, {getAttr type: setAttr type}, the others go to blendAttrDic
+BLEND_TYPES = {'matrix': 'matrix', 'fltMatrix': 'fltMatrix'}
+BLEND_TYPES.update(dict.fromkeys(['double', 'float', 'doubleLinear', 'doubleAngle', 'floatLinear', 'floatAngle', 'time',
+                                  'long', 'short', 'byte', 'char', 'enum', 'bool', 'double2', 'double3', 'double4',
+                                  'float2', 'float3', 'long2', 'long3', 'short2', 'short3']))
+
+
+class PresetBlender(object):
+    """Blend the numeric attributes of many nodes toward a preset in one vectorized pass
+
+    Numeric attributes (scalars, compounds, matrices) are gathered into a target array,
+    the current values are read once with ``capture`` and each ``blend`` is a single numpy interpolation
+    followed by the setAttr of the whole batch.
+    Everything else, and the small arrays or multi attributes found by ``capture``,
+    is given to ``dw_presets_io.blendAttrDic``.
+
+    ``pb = PresetBlender.fromPreset(preset, 'char01')``
+    ``pb.capture()``
+    ``pb.blend(0.25)`` and ``pb.blend(0.5)`` while scrubbing, without reading maya again
+    """
+
+    def __init__(self):
+        self._plugs = []  #: list: (plug, start, size, is_int, setAttr type)
+        self._target = []  #: list: flat target values
+        self._sources = {}  #: dict: {plug: (src, node, attr, value)} to give a plug back to blendAttrDic
+        self._others = []  #: list: (src, target node, {src: attributes}) given to dwpreset.blendAttrDic
+        self._current = None
+        self._goal = None
+
+    @classmethod
+    def fromPreset(cls, preset, targ_ns=':'):
+        """
+        Args:
+            preset (dict): attrPreset like dictionnary, it can contain many nodes
+            targ_ns (str): namespace of the nodes
+
+        Returns:
+            PresetBlender: with every existing node of the preset added
+        """
+        blender = cls()
+        for k in preset:
+            if k.endswith('_nodeType'):
+                continue
+            nodename = targ_ns + ':' + k if targ_ns not in [':', ''] else k
+            if not cmds.objExists(nodename):
+                continue
+            blender.addNode(k, nodename, preset[k], preset[k + '_nodeType'])
+        return blender
+
+    def addNode(self, key, node, data, ntype):
+        """
+        Add a node entry of a preset, like loadNode : the main node and the shape matching the nodeType
+
+        Args:
+            key (str): key of the node in the preset
+            node (str): maya node receiving the main attributes
+            data (dict): preset[key]
+            ntype (str): preset[key + '_nodeType']
+        """
+        self.add(key, node, data[key])
+        if data[key].get('nodeType') != ntype:
+            for sh, attrs in data.items():
+                if sh != key and attrs.get('nodeType') == ntype:
+                    self.add(sh, MayaNode(node).sh, attrs)
+                    break
+
+    def add(self, src, node, attrs):
+        """
+        Args:
+            src (str): name of the node in the preset
+            node (str): maya node receiving the attributes
+            attrs (dict): {attr: value}
+        """
+        others = {}
+        for attr, value in attrs.items():
+            flat = _flatNumbers(value) if attr != 'nodeType' else None
+            if flat is None:
+                others[attr] = value
+                continue
+            is_int = all(isinstance(v, int) for v in flat)
+            plug = '{}.{}'.format(node, attr)
+            self._plugs.append((plug, len(self._target), len(flat), is_int, None))
+            self._sources[plug] = (src, node, attr, value)
+            self._target.extend(flat)
+        if any(attr != 'nodeType' for attr in others):
+            self._others.append((src, node, {src: others}))
+        self._current = None
+
+    def capture(self):
+        """
+        read the current values of the numeric attributes, locked or connected attributes are dropped
+        and the attributes that can't be set from a list of numbers (doubleArray, multi...) go to blendAttrDic
+        """
+        import numpy as np
+        plugs = []
+        current = []
+        target = []
+        others = {}
+        for plug, start, size, is_int, kind in self._plugs:
+            if not cmds.getAttr(plug, settable=True):
+                continue
+            attr_type = cmds.getAttr(plug, type=True)
+            flat = _flatNumbers(cmds.getAttr(plug)) if attr_type in BLEND_TYPES else None
+            if flat is None or len(flat) != size:
+                src, node, attr, value = self._sources[plug]
+                others.setdefault((src, node), {})[attr] = value
+                continue
+            plugs.append((plug, len(current), size, is_int, BLEND_TYPES[attr_type]))
+            current.extend(flat)
+            target.extend(self._target[start:start + size])
+        for (src, node), attrs in sorted(others.items()):
+            self._others.append((src, node, {src: attrs}))
+        self._plugs = plugs
+        self._target = target
+        self._current = np.asarray(current, dtype=np.float64)
+        self._goal = np.asarray(target, dtype=np.float64)
+
+    def blend(self, value):
+        """
+        Args:
+            value (float): 0 is the captured values, 1 is the preset
+        """
+        import dw_presets_io as dwpreset
+        if self._current is None:
+            self.capture()
+        values = (self._current + (self._goal - self._current) * value).tolist()
+        cmds.undoInfo(openChunk=True)
+        try:
+            for plug, start, size, is_int, kind in self._plugs:
+                vals = values[start:start + size]
+                if is_int:
+                    vals = [int(round(v)) for v in vals]
+                try:
+                    if kind:
+                        cmds.setAttr(plug, vals, type=kind)
+                    else:
+                        cmds.setAttr(plug, *vals)
+                except RuntimeError:
+                    # one plug failing doesn't stop the rest of the batch
+                    cmds.warning('{} can\'t be blended'.format(plug))
+            for src, node, dic in self._others:
+                dwpreset.blendAttrDic(src, node, dic, value)
+        finally:
+            cmds.undoInfo(closeChunk=True)
+
+
+class NodeBatch(object):
+    """Create many nodes with their final names in a single doIt of an MDGModifier and an MDagModifier
+
+    Shapes get a transform with the names of ``MayaNode.rename`` : ``toto`` and ``totoShape``,
+    so there is no cmds.createNode followed by two or three cmds.rename per node.
+    The transform/shape pair of every new node is given to dag_cache, so MayaNode never query it.
+
+    ``batch = NodeBatch()``
+    ``batch.add('toto', 'mesh')``
+    ``batch.add('toto_blend', 'blendColors')``
+    ``batch.doIt()`` give ``[('toto', 'totoShape', 'mesh'), ('toto_blend', 'toto_blend', 'blendColors')]``
+
+    Note:
+        If a name is already taken maya makes it unique, doIt returns the names maya gave.
+        The modifiers are not in the maya undo queue, use ``undoIt``
+    """
+
+    _kinds = {}  #: dict: {nodeType: 'shape', 'dag' or 'dg'}
+
+    def __init__(self):
+        self._queue = []  #: list: (name, nodeType)
+        self._modifiers = []  #: list: modifiers of the last doIt, for undoIt
+        self.uuids = []  #: list: uuid of each node of the last doIt
+
+    def __len__(self):
+        return len(self._queue)
+
+    @classmethod
+    def kind(cls, node_type):
+        """
+        Args:
+            node_type (str): maya nodeType
+
+        Returns:
+            str: 'shape' (created with a transform), 'dag' or 'dg'
+        """
+        try:
+            return cls._kinds[node_type]
+        except KeyError:
+            pass
+        inherited = cmds.nodeType(node_type, isTypeName=True, inherited=True) or []
+        if 'shape' in inherited:
+            kind = 'shape'
+        elif 'dagNode' in inherited:
+            kind = 'dag'
+        else:
+            kind = 'dg'
+        cls._kinds[node_type] = kind
+        return kind
+
+    def add(self, name, node_type):
+        """
+        Args:
+            name (str): name of the node, the transform name for a shape
+            node_type (str): maya nodeType
+
+        Returns:
+            int: position of the node in the result of doIt
+        """
+        self._queue.append((name, node_type))
+        return len(self._queue) - 1
+
+    def doIt(self):
+        """
+        Create every queued node
+
+        Returns:
+            list: (transform, shape, nodeType) of each node, like MayaNode.tr, MayaNode.sh and MayaNode.nodeType
+        """
+        om2 = PlugBackend.om()
+        dg_mod = om2.MDGModifier()
+        dag_mod = om2.MDagModifier()
+        created = []
+        for name, node_type in self._queue:
+            kind = self.kind(node_type)
+            if kind == 'shape':
+                tr_name, sh_name = MayaNode._dagNames(name)
+                tr = dag_mod.createNode('transform')
+                sh = dag_mod.createNode(node_type, tr)
+                dag_mod.renameNode(tr, tr_name)
+                dag_mod.renameNode(sh, sh_name)
+            else:
+                mod = dag_mod if kind == 'dag' else dg_mod
+                tr = mod.createNode(node_type)
+                mod.renameNode(tr, name)
+                sh = None
+            created.append((tr, sh, node_type))
+        dg_mod.doIt()
+        dag_mod.doIt()
+        self._modifiers = [dg_mod, dag_mod]
+        self._queue = []
+
+        result = []
+        self.uuids = []
+        for tr, sh, node_type in created:
+            fn = om2.MFnDependencyNode(tr)
+            tr_name = fn.name()
+            if sh is not None:
+                names = (tr_name, om2.MFnDependencyNode(sh).name(), node_type)
+            elif node_type == 'transform':
+                names = (tr_name, None, node_type)
+            else:
+                names = (tr_name, tr_name, node_type)
+            uuid = fn.uuid().asString()
+            dag_cache.store(uuid, names, [tr, sh])
+            self.uuids.append(uuid)
+            result.append(names)
+        return result
+
+    def undoIt(self):
+        """ delete the nodes of the last doIt """
+        for mod in reversed(self._modifiers):
+            mod.undoIt()
+        self._modifiers = []
+
+
 class MayaNode(object):
     """Represent a maya node as a class like pymel
 
@@ -218,6 +1712,7 @@ class MayaNode(object):
 
         # this dict method is used to avoid calling __getattr__
         self.__dict__['node'] = name  #: str: current priority node evaluated
+        self.__dict__['uuid'] = None  #: str: uuid of the node, resolved on first access
         self.__dict__['item'] = 1  #: int: can be either 0 or 1 and should be exented with Mesh or Cluster
         if preset:
             targ_ns = name.rsplit(':', 1)[0]
@@ -288,6 +1783,24 @@ class MayaNode(object):
         """
         return self.__dict__['node']
 
+    def _setName(self, name):
+        """
+        Point the class to another node name, the uuid will be resolved again on next access
+        Args:
+            name (str): name of the maya node
+        """
+        self.__dict__['node'] = name
+        self.__dict__['uuid'] = None
+
+    @property
+    def _dag(self):
+        """tuple: (transform, shape, nodeType) resolved once per uuid and name by dag_cache"""
+        uuid = self.__dict__['uuid']
+        if uuid is None:
+            uuid = dag_cache.uuid(self.__node)
+            self.__dict__['uuid'] = uuid
+        return dag_cache.resolve(self.__node, uuid)
+
     def setNode(self, index):
         """
         set the current node by __dict__, it is used with __getitem__
@@ -312,33 +1825,17 @@ class MayaNode(object):
     @property
     def nodeType(self):
         """str: return the current node type, by default it always return the shape"""
-        if not self.sh:
-            return cmds.nodeType(self.__node)
-        else:
-            return cmds.nodeType(self.sh)
+        return self._dag[2]
 
     @property
     def sh(self):
         """str: return the main node (everything but not transform)"""
-        if cmds.nodeType(self.__node) != 'transform':
-            return self.__node
-        else:
-            _sh = cmds.listRelatives(self.__node, type='shape', ni=True)
-            if _sh:
-                return _sh[0]
-            return
+        return self._dag[1]
+
     @property
     def tr(self):
         """str: return the transform if there is one, otherwise return the shape too"""
-        if cmds.nodeType(self.__node) == 'transform':
-            return self.__node
-        else:
-            _tr = cmds.listRelatives(self.__node, p=True)
-            if _tr:
-                _sh = cmds.listRelatives(_tr, type='shape', ni=True)
-                if _sh:
-                    return _tr[0]
-        return self.sh
+        return self._dag[0]
 
     def listAttr(self, attr=None):
 
@@ -348,7 +1845,7 @@ class MayaNode(object):
             attr (str, optional): name of an attribute
 
         Returns:
-            list: it gives the list of attributes existing
+            frozenset: it gives the attributes existing, names come from attr_cache
 
         """
 
@@ -356,15 +1853,8 @@ class MayaNode(object):
         tr = self.tr
         sh = self.sh
 
-        attr_list_tr = []
-        if tr:
-            attr_list_tr += cmds.listAttr(tr)
-            attr_list_tr += cmds.listAttr(tr, shortNames = True)
-
-        attr_list_sh = []
-        if sh:
-            attr_list_sh += cmds.listAttr(sh)
-            attr_list_sh += cmds.listAttr(sh, shortNames = True)
+        attr_list_tr = attr_cache.names(tr) if tr else frozenset()
+        attr_list_sh = attr_cache.names(sh) if sh else frozenset()
 
         if current == tr:
             if attr:
@@ -391,6 +1881,108 @@ class MayaNode(object):
                         return attr_list_tr
             return attr_list_sh
 
+    def addAttr(self, *args, **kwargs):
+        """
+        This is the cmds.addAttr on the current node, the attribute cache of the node is refreshed
+        Args:
+            *args (Any): maya arguments for the commands
+            **kwargs (Any): all the flag you would try to parse
+        """
+        node = self.node
+        cmds.addAttr(node, *args, **kwargs)
+        attr_cache.invalidate(node)
+
+    def deleteAttr(self, attr):
+        """
+        This is the cmds.deleteAttr on the current node, the attribute cache of the node is refreshed
+        Args:
+            attr (str): name of the attribute to delete
+        """
+        node = self.node
+        cmds.deleteAttr('{}.{}'.format(node, attr))
+        attr_cache.invalidate(node)
+
+    def _plugs(self, attrs):
+        """
+        Resolve a batch of attributes to their plugs with one attribute index of the transform and the shape
+        the priority is the same as listAttr : the current node first, then the other one
+
+        Args:
+            attrs (list): attribute names
+
+        Returns:
+            list: 'node.attr' for each attribute
+        """
+        current = self.node
+        tr = self.tr
+        sh = self.sh
+        attr_list_tr = attr_cache.names(tr) if tr else frozenset()
+        attr_list_sh = attr_cache.names(sh) if sh else frozenset()
+        if current == tr:
+            order = [(tr, attr_list_tr), (sh, attr_list_sh)]
+        else:
+            order = [(sh, attr_list_sh), (tr, attr_list_tr)]
+
+        plugs = []
+        invalid = []
+        both = []
+        for attr in attrs:
+            # compound or indexed attributes are checked on their root name
+            root = attr.split('.', 1)[0].split('[', 1)[0]
+            for node, names in order:
+                if root in names:
+                    plugs.append('{}.{}'.format(node, attr))
+                    break
+            else:
+                invalid.append(attr)
+            if sh != tr and root in attr_list_tr and root in attr_list_sh:
+                both.append(attr)
+
+        if invalid:
+            cmds.error('please provide good attributes :``` {} ```are invalid'.format(', '.join(invalid)))
+        if both:
+            cmds.warning('attributes `{}` exist in shape and transform, result from : {}'.format(', '.join(both),
+                                                                                                current))
+        return plugs
+
+    def get_many(self, attrs):
+        """
+        cmds.getAttr on a batch of attributes, validated against one attribute index
+        ``mn.get_many(['tx', 'ty', 'rz'])``
+
+        Args:
+            attrs (list): attribute names
+
+        Returns:
+            dict: {attr: value}
+        """
+        attrs = list(attrs)
+        return dict((attr, cmds.getAttr(plug)) for attr, plug in zip(attrs, self._plugs(attrs)))
+
+    def set_many(self, values):
+        """
+        cmds.setAttr on a batch of attributes, validated against one attribute index
+        string are supported like MAttr.set, list and tuple are expanded as arguments
+        ``mn.set_many({'tx': 1, 'ty': 2, 't': (0, 1, 0)})``
+
+        Args:
+            values (dict): {attr: value}
+        """
+        attrs = list(values)
+        plugs = self._plugs(attrs)
+        cmds.undoInfo(openChunk=True)
+        try:
+            for attr, plug in zip(attrs, plugs):
+                value = values[attr]
+                if isinstance(value, basestring):
+                    cmds.setAttr(plug, value, type='string')
+                elif isinstance(value, (list, tuple)):
+                    cmds.setAttr(plug, *value)
+                else:
+                    cmds.setAttr(plug, value)
+        finally:
+            cmds.undoInfo(closeChunk=True)
+
     def attrPreset(self, node=None):
         """
         common method to create a preset of the node
@@ -404,6 +1996,8 @@ class MayaNode(object):
 
         """
 
+        import dw_presets_io as dwpreset
+        import dw_maya_utils as dwu
         if node is not None:
             if node == 0:
                 return dwpreset.createAttrPreset(self.tr)
@@ -438,36 +2032,89 @@ class MayaNode(object):
         Returns:
             cls: the class self is returned so you can keep playing with the node
         """
-        sh_p = '[Ss]hape(\d+)?$'
-        p = re.compile(sh_p)
+        attr_cache.invalidate(self.tr)
+        attr_cache.invalidate(self.sh)
+        uuids = [dag_cache.uuid(n) for n in set([self.tr, self.sh])]
+
+        def _rename(node, new_name, **kwargs):
+            # names are changing so the tr/sh pair has to be resolved again
+            result = cmds.rename(node, new_name, **kwargs)
+            for uuid in uuids:
+                dag_cache.invalidate(uuid)
+            return result
 
         if self.tr == self.sh:
-            cmds.rename(self.tr, name)
+            _rename(self.tr, name)
         else:
             if self.sh == name:
                 # if shape, was set on creation
-                _tmp = cmds.rename(self.sh, 'dwTmpRename')
                 # if name has maya Shape pattern, do the replace
-                if p.search(name):
-                    id = p.search(name).group(1) or ''
-                    _sh = cmds.rename(self.sh, name)
-                    self.__dict__['node'] = name
-                    _tr_name = p.sub(id, name)
-                    self.__dict__['node'] = name
-                    _tr = cmds.rename(self.tr, _tr_name, ignoreShape=True)
+                _tr_name, _sh_name = self._dagNames(name, name)
+                _tmp = _rename(self.sh, 'dwTmpRename')
+                if _sh_name == name:
+                    _sh = _rename(self.sh, name)
+                    self._setName(name)
+                    _tr = _rename(self.tr, _tr_name, ignoreShape=True)
                 else:
-                    _sh = cmds.rename(self.sh, name)
-                    self.__dict__['node'] = name
-                    cmds.rename(self.tr, name, ignoreShape=True)
-                    self.__dict__['node'] = name
-                    cmds.rename(self.sh, name + 'Shape')
+                    _sh = _rename(self.sh, name)
+                    self._setName(name)
+                    _rename(self.tr, name, ignoreShape=True)
+                    self._setName(name)
+                    _rename(self.sh, name + 'Shape')
             else:
-                cmds.rename(self.tr, name, ignoreShape=True)
-                self.__dict__['node'] = name
-                cmds.rename(self.sh, name+'Shape')
-        self.__dict__['node'] = name
+                _rename(self.tr, name, ignoreShape=True)
+                self._setName(name)
+                _rename(self.sh, name+'Shape')
+        self._setName(name)
         return self.tr
 
+    @staticmethod
+    def _dagNames(name, sh=None):
+        """
+        Names given by rename to the transform and the shape :
+        a shape already called like a maya shape (totoShape, totoShape1) keeps its name and the transform lose
+        the Shape part, otherwise the transform takes the name and the shape the name + Shape
+
+        Args:
+            name (str): new name
+            sh (str, optional): current name of the shape
+
+        Returns:
+            tuple: (transform name, shape name)
+        """
+        match = re.search(SHAPE_PATTERN, name)
+        if sh == name and match:
+            return re.sub(SHAPE_PATTERN, match.group(1) or '', name), name
+        return name, name + 'Shape'
+
+    def _created(self, result, uuid):
+        """
+        Point the class to a node made by NodeBatch
+
+        Args:
+            result (tuple): (transform, shape, nodeType) from NodeBatch.doIt
+            uuid (str): uuid of the node from NodeBatch.uuids
+
+        Returns:
+            str: new node name
+        """
+        self._setName(result[0])
+        self.__dict__['uuid'] = uuid
+        return result[0]
+
+    def _newName(self, index):
+        """
+        Args:
+            index (PresetIndex): preset of the node
+
+        Returns:
+            str: name to give to the new node, the name flag of the preset or the name of the class
+        """
+        import dw_maya_utils as dwu
+        flags = dwu.Flags(index.preset, self.__dict__['node'], 'name', 'n', dic={})
+        if flags:
+            return flags.get('name')
+
     def createNode(self, preset, targ_ns=':'):
         """
         Like maya cmds.createNode() but work with preset dictionnary or single string
@@ -478,9 +2125,12 @@ class MayaNode(object):
 
         Also if the preset is a dictionnary it must contain a key:nodeType, value:mesh and it will set all the other
         attributes.
+        It goes through cmds so ctrl+z removes the node, MayaNode.load_many makes many nodes in one NodeBatch doIt
+        (faster but outside of the undo queue)
 
         Args:
-            preset (Any):
+            preset (Any): nodeType, preset dictionnary or PresetIndex
+            targ_ns (str): namespace of the node
 
         Returns:
             str: new node name
@@ -494,34 +2144,40 @@ class MayaNode(object):
                 cmds.error('Please provide a valid : string nodeType or a key `nodeType`')
             preset = {self.__dict__['node'] + '_nodeType': _type}
 
-        # we try to determine if we create a node from scratch or if we load it
-        # in case of loading, we need to remap the dictionnary keys with the correct namespace
-        if targ_ns == ':'  or targ_ns == '':
-            # in this case we have created the node with a basestring type so we need to add the namespace
-            _type = self.__dict__['node'] + '_nodeType'
-            if _type not in preset:
-                _type = targ_ns + ':' + self.__dict__['node'] + '_nodeType'
-        else:
-            # In this case we create a node with a namespace but the preset is namespace agnostic
-            _type = self.__dict__['node'] + '_nodeType'
-            if _type not in preset:
-                _type = self.__dict__['node'].rsplit(':', 1)[-1] + '_nodeType'
+        # the index remap the keys whatever the namespace of the node and of the preset is
+        index = PresetIndex.get(preset)
+        _type = index.nodeType(self.__dict__['node'])
 
         # this part is for creating a good node name, at the end of the proc it will rename
-        flags = dwu.Flags(preset, self.__dict__['node'], 'name', 'n', dic={})
+        name = self._newName(index)
 
-        new_node = cmds.createNode(preset[_type])
-        self.__dict__['node'] = new_node
-        if flags:
-            new_name = self.rename(**flags)
+        new_node = cmds.createNode(_type)
+        self._setName(new_node)
+        if name:
+            new_name = self.rename(name)
             return new_name
 
-    def saveNode(self, path=str, file=str):
+    def _presetParts(self):
+        """
+        Same data as attrPreset but generated one node (transform then shape) at a time
+        Returns:
+            generator: dwpreset.createAttrPreset() for each node
+        """
+        import dw_presets_io as dwpreset
+        if self.tr == self.sh:
+            yield dwpreset.createAttrPreset(self.node)
+        else:
+            yield dwpreset.createAttrPreset(self.tr)
+            yield dwpreset.createAttrPreset(self.sh)
+
+    def saveNode(self, path=str, file=str, fmt='json'):
         """
         save the node as json
         Args:
             path (str): /path/gneh/
             file (str): myfile
+            fmt (str): 'json', 'jsonl' for the streaming format (see PresetStream)
+                or 'dwpb' for the memory-mapped binary format (see PresetBinary)
 
         Returns:
             /path/gneh/myfile.json
@@ -530,44 +2186,184 @@ class MayaNode(object):
             if not path.endswith('/'):
                 path += '/'
             if '.' not in file:
-                file += '.json'
+                file += '.' + fmt
             fullpath = path + file
 
-            print('node saved as json to {}'.format(fullpath))
+            print('node saved as {} to {}'.format(fmt, fullpath))
+            if fmt == 'jsonl':
+                return PresetStream.write(fullpath, [self])
+            if fmt == 'dwpb':
+                return PresetBinary.write(fullpath, [self])
+            import dw_json as dwjson
             return dwjson.saveJson(fullpath, self.attrPreset())
 
-    def loadNode(self, preset=dict, blend=1, targ_ns=':'):
+    def loadStream(self, path, blend=1, targ_ns=':'):
+        """
+        Like loadNode but from a PresetStream file, attributes are applied as soon as each sub node is read,
+        only the records of this node are decoded and the file is not read further
+
+        Args:
+            path (str): /path/gneh/myfile.jsonl
+            blend (float): blend value between current and preset values
+            targ_ns (str): namespace of the node
+        """
+        node = self.__dict__['node']
+        key = node.split(':')[-1] if targ_ns not in [':', ''] else node
+        self._streamNodes(path, blend, targ_ns, {key: self})
+
+    @classmethod
+    def _streamNodes(cls, path, blend=1, targ_ns=':', nodes=None):
         """
+        Apply the sub nodes of a PresetStream file as they are read, a missing node is created on its first record
 
         Args:
-            preset ():
+            path (str): /path/gneh/myfile.jsonl
+            blend (float): blend value between current and preset values
+            targ_ns (str): namespace of the nodes
+            nodes (dict, optional): {preset key: MayaNode} to load, every node of the file by default
 
         Returns:
+            list: MayaNode of the loaded nodes, in the order of the file
+        """
+        import dw_presets_io as dwpreset
+        loaded = []
+        current = {}
+        for key, ntype, sub, attrs in PresetStream.read(path, list(nodes) if nodes is not None else None):
+            mn = current.get(key)
+            if mn is None:
+                nodename = targ_ns + ':' + key if targ_ns not in [':', ''] else key
+                mn = nodes[key] if nodes is not None else cls(nodename)
+                if not cmds.objExists(nodename):
+                    mn.createNode({key + '_nodeType': ntype}, targ_ns)
+                current[key] = mn
+                loaded.append(mn)
+            if sub == key:
+                dwpreset.blendAttrDic(key, mn.tr, {sub: attrs}, blend)
+            elif attrs.get('nodeType') == ntype:
+                dwpreset.blendAttrDic(sub, mn.sh, {sub: attrs}, blend)
+        return loaded
+
+    @classmethod
+    def load_many(cls, preset, targ_ns=':', blend=1, fmt=None):
+        """
+        Like MayaNode(name, preset) for every node of the preset, the preset is indexed once,
+        the missing nodes are created in one pass and the attributes are applied to all the nodes together
+
+        Note:
+            The missing nodes are made by one NodeBatch, they are not in the undo queue (see NodeBatch.undoIt)
+
+        Args:
+            preset (Any): attrPreset like dictionnary with many nodes or its PresetIndex,
+                give the same PresetIndex to load the preset into many namespaces
+            targ_ns (str): namespace of the nodes
+            blend (float): blend value between current and preset values
+            fmt (str, optional): 'jsonl' to stream the nodes of a PresetStream file in one pass,
+                'dwpb' to load a PresetBinary file, preset is then the path of the file
 
+        Returns:
+            list: MayaNode of every node of the preset
         """
+        import dw_presets_io as dwpreset
+        if fmt == 'jsonl':
+            return cls._streamNodes(preset, blend, targ_ns)
+        if fmt == 'dwpb':
+            with PresetBinary(preset) as reader:
+                return cls.load_many(reader.preset(), targ_ns, blend)
+        index = PresetIndex.get(preset)
+        preset = index.preset
+        targets = index.targets(targ_ns)
+        names = sorted(targets)
+        keys = [targets[n] for n in names]
+        # ls gives the full path of the dag nodes whose short name is not unique, keep the requested names
+        listed = cmds.ls(names) or []
+        existing = set(listed) | set(n.rsplit('|', 1)[-1] for n in listed)
+
+        nodes = []
+        batch = NodeBatch()
+        pending = []
+        for k, nodename in zip(keys, names):
+            mn = cls(nodename)
+            if nodename not in existing:
+                # every missing node is created in one doIt
+                name = mn._newName(index)
+                if name:
+                    pending.append((mn, batch.add(name, index.nodeType(k))))
+                else:
+                    mn.createNode(index, targ_ns)
+            nodes.append(mn)
+        if pending:
+            created = batch.doIt()
+            for mn, i in pending:
+                mn._created(created[i], batch.uuids[i])
+
+        pairs = [(k, mn.tr) for k, mn in zip(keys, nodes)]
+        if 0 < blend < 1:
+            index.blender(pairs).blend(blend)
+            return nodes
+        index.release(pairs)
+
+        for k, mn in zip(keys, nodes):
+            ntype = preset[k + '_nodeType']
+            dwpreset.blendAttrDic(k, mn.tr, preset[k], blend)
+            if preset[k][k].get('nodeType') != ntype:
+                for sh, attrs in preset[k].items():
+                    if sh != k and attrs.get('nodeType') == ntype:
+                        dwpreset.blendAttrDic(sh, mn.sh, preset[k], blend)
+                        break
+        return nodes
+
+    def loadNode(self, preset=dict, blend=1, targ_ns=':', fmt=None, attrs=None):
+        """
+
+        Args:
+            preset (): preset dictionnary, PresetIndex, a nodeType or a file path if fmt is given
+            fmt (str, optional): 'jsonl' to read the preset from a PresetStream file
+                or 'dwpb' from a PresetBinary file
+            attrs (list, optional): with fmt='dwpb', only load these attributes, the other arrays are not read
+
+        Returns:
+            PresetBlender: when 0 < blend < 1, the blender kept by the PresetIndex, call its blend while scrubbing
+
+        Note:
+            The speedup of scrubbing comes from the PresetIndex : its blender reads the scene on the first blend
+            only. Pass the same PresetIndex, or the same dictionnary whose index is kept by PresetIndex.get,
+            a new dictionnary at each call is indexed and captured again
+        """
+        if fmt == 'jsonl':
+            return self.loadStream(preset, blend, targ_ns)
+        if fmt == 'dwpb':
+            with PresetBinary(preset) as reader:
+                return self.loadNode(reader.preset(attrs), blend, targ_ns)
+
         if isinstance(preset, basestring):
             self.createNode(preset)
 
         if not isinstance(preset, basestring):
-            for k in preset:
-                if not k.endswith('_nodeType'):
-                    if targ_ns not in [':', '']:
-                        nodename = targ_ns + ':' + k
-                    else:
-                        nodename = k
-                    ntype = preset[k + '_nodeType']
-                    if nodename == self.__dict__['node']:
-                        if not cmds.objExists(nodename):
-                            new_name = self.createNode(preset, targ_ns)
-                        else:
-                            new_name = k
-
-                        dwpreset.blendAttrDic(k, new_name, preset[k], blend)
-                        mainType = preset[k][k]['nodeType']
-                        if mainType != ntype:
-                            for sh in preset[k]:
-                                if 'nodeType' in preset[k][sh]:
-                                    if preset[k][sh]['nodeType'] == ntype:
-                                        dwpreset.blendAttrDic(sh, self.sh, preset[k], blend)
-                                        break
-                        break
+            import dw_presets_io as dwpreset
+            index = PresetIndex.get(preset)
+            preset = index.preset
+            k = index.targets(targ_ns).get(self.__dict__['node'])
+            if k is None:
+                return
+            nodename = self.__dict__['node']
+            ntype = index.nodeType(k)
+            if not cmds.objExists(nodename):
+                new_name = self.createNode(index, targ_ns)
+            else:
+                new_name = k
+
+            if 0 < blend < 1:
+                # pass the same PresetIndex while scrubbing to reuse the captured values
+                blender = index.blender([(k, new_name)])
+                blender.blend(blend)
+                return blender
+            index.release([(k, new_name)])
+
+            dwpreset.blendAttrDic(k, new_name, preset[k], blend)
+            mainType = preset[k][k]['nodeType']
+            if mainType != ntype:
+                for sh in preset[k]:
+                    if 'nodeType' in preset[k][sh]:
+                        if preset[k][sh]['nodeType'] == ntype:
+                            dwpreset.blendAttrDic(sh, self.sh, preset[k], blend)
+                            break
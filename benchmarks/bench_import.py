@@ -0,0 +1,120 @@
+"""Import time of the tools, they are loaded in every artist session and every farm task
+
+``python benchmarks/bench_import.py`` against the fake maya of fakemaya.py,
+``mayapy benchmarks/bench_import.py --maya`` against maya.standalone.
+
+Every import is made in a new process so nothing is already cached, it reports the best and median time,
+the heavy modules imported on the way (pymel, dw_* helpers...) and the maya commands run on import,
+a tool that builds its window on import shows up there.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+MODULES = {'mayanode': os.path.join(ROOT, '59185039.py'),
+           'superbool': os.path.join(ROOT, '56137400', 'src.py'),
+           'colorSlider': os.path.join(ROOT, '57258435', 'colorSlider.py')}
+
+HEAVY = ('pymel', 'maya.OpenMaya', 'maya.mel', 'numpy', 'dw_maya_utils', 'dw_presets_io', 'dw_decorators',
+         'dw_json')
+
+
+def child(name, maya=False):
+    """
+    Import one tool, run in its own process
+
+    Returns:
+        dict: seconds, heavy modules imported, number of maya commands and the error if the import failed
+    """
+    try:
+        import builtins
+    except ImportError:
+        import __builtin__ as builtins
+    import fakemaya
+    if maya:
+        import maya.standalone
+        maya.standalone.initialize(name='python')
+        recorder = None
+    else:
+        recorder = fakemaya.install()
+
+    imported = []
+    original = builtins.__import__
+
+    def tracked(module, *args, **kwargs):
+        root = module.split('.')[0]
+        for heavy in HEAVY:
+            if (module == heavy or root == heavy) and heavy not in imported:
+                imported.append(heavy)
+        return original(module, *args, **kwargs)
+
+    builtins.__import__ = tracked
+    error = None
+    start = time.time()
+    try:
+        fakemaya.load_source('bench_' + name, MODULES[name])
+    except Exception as e:
+        # ie: a window built on import fails outside of a maya session
+        error = '{}: {}'.format(type(e).__name__, e)
+    finally:
+        seconds = time.time() - start
+        builtins.__import__ = original
+    return {'module': name, 'seconds': seconds, 'heavy': imported,
+            'commands': recorder.total() if recorder else None, 'error': error}
+
+
+def run(names=None, repeat=5, maya=False):
+    """
+    Args:
+        names (list, optional): keys of MODULES, all by default
+        repeat (int): number of processes per module
+        maya (bool): import with maya.standalone instead of the fake maya
+
+    Returns:
+        list: best and median seconds, heavy modules, commands and error of each module
+    """
+    results = []
+    for name in names or sorted(MODULES):
+        runs = []
+        for i in range(repeat):
+            cmd = [sys.executable, os.path.abspath(__file__), '--child', name] + (['--maya'] if maya else [])
+            runs.append(json.loads(subprocess.check_output(cmd).decode().strip().splitlines()[-1]))
+        times = sorted(r['seconds'] for r in runs)
+        results.append({'module': name, 'best': times[0], 'median': times[len(times) // 2],
+                        'heavy': runs[0]['heavy'], 'commands': runs[0]['commands'], 'error': runs[0]['error']})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('modules', nargs='*', help='modules to import, all by default')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--maya', action='store_true', help='import with maya.standalone, run it with mayapy')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--json', help='write the results as json')
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(child(args.child, args.maya)))
+        return 0
+
+    results = run(args.modules or None, args.repeat, args.maya)
+    print('{:<14}{:>10}{:>12}{:>10}  {}'.format('module', 'best (s)', 'median (s)', 'commands', 'heavy imports'))
+    for r in results:
+        print('{:<14}{:>10.4f}{:>12.4f}{:>10}  {}'.format(r['module'], r['best'], r['median'], r['commands'],
+                                                          r['error'] or ', '.join(r['heavy']) or '-'))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Compare the preset formats of MayaNode.saveNode : json, jsonl (PresetStream) and dwpb (PresetBinary)
+
+No maya needed, the module is loaded on the fake maya of fakemaya.py :
+``python benchmarks/bench_preset_formats.py --nodes 50 --points 100000``
+
+The presets are synthetic so no scene is needed, it reports the size on disk and the load time,
+for dwpb the load time is given when reading one array and when reading everything.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+import fakemaya  # noqa: E402
+
+fakemaya.install()
+mayanode = fakemaya.load_source('mayanode', os.path.join(ROOT, '59185039.py'))
+
+
+class FakeNode(object):
+    """Stand-in for MayaNode with a deformer like preset"""
+
+    def __init__(self, name, points):
+        self.tr = name
+        self.nodeType = 'mesh'
+        self.points = points
+
+    def _presetParts(self):
+        yield {self.tr: {'translateX': 1.0, 'visibility': True, 'nodeType': 'transform'}}
+        sh = self.tr + 'Shape'
+        yield {sh: {'nodeType': 'mesh',
+                    'weights': [i / float(self.points) for i in range(self.points)],
+                    'pnts': [(0.1, 0.2, 0.3)] * self.points}}
+
+    def attrPreset(self):
+        out = {self.tr + '_nodeType': self.nodeType, self.tr: {}}
+        for part in self._presetParts():
+            out[self.tr].update(part)
+        return out
+
+
+def _timeit(func):
+    start = time.time()
+    result = func()
+    return time.time() - start, result
+
+
+def run(nodes, points):
+    tmp = tempfile.mkdtemp()
+    try:
+        fake = [FakeNode('node{}'.format(i), points) for i in range(nodes)]
+        results = []
+
+        path = os.path.join(tmp, 'preset.json')
+        preset = {}
+        for n in fake:
+            preset.update(n.attrPreset())
+        save, _ = _timeit(lambda: json.dump(preset, open(path, 'w')))
+        del preset
+        load, _ = _timeit(lambda: json.load(open(path)))
+        results.append(('json', os.path.getsize(path), save, load, load))
+
+        path = os.path.join(tmp, 'preset.jsonl')
+        save, _ = _timeit(lambda: mayanode.PresetStream.write(path, fake))
+        size = os.path.getsize(path) + os.path.getsize(mayanode.PresetStream.sidecar(path))
+        load, _ = _timeit(lambda: list(mayanode.PresetStream.read(path)))
+        results.append(('jsonl', size, save, load, load))
+
+        path = os.path.join(tmp, 'preset.dwpb')
+        save, _ = _timeit(lambda: mayanode.PresetBinary.write(path, fake))
+
+        def load_one():
+            with mayanode.PresetBinary(path) as reader:
+                return reader.preset()['node0']['node0Shape']['weights']
+
+        def load_all():
+            with mayanode.PresetBinary(path) as reader:
+                preset = reader.preset()
+                return [attrs.copy() for k, v in preset.items() if not k.endswith('_nodeType')
+                        for attrs in v.values()]
+
+        one, _ = _timeit(load_one)
+        full, _ = _timeit(load_all)
+        results.append(('dwpb', os.path.getsize(path), save, one, full))
+    finally:
+        shutil.rmtree(tmp)
+
+    print('{:<8}{:>14}{:>10}{:>14}{:>14}'.format('format', 'size (MB)', 'save (s)', 'load one (s)', 'load all (s)'))
+    for fmt, size, save, one, full in results:
+        print('{:<8}{:>14.2f}{:>10.3f}{:>14.3f}{:>14.3f}'.format(fmt, size / 1048576.0, save, one, full))
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--nodes', type=int, default=20)
+    parser.add_argument('--points', type=int, default=50000)
+    args = parser.parse_args()
+    run(args.nodes, args.points)
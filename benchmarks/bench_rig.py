@@ -0,0 +1,98 @@
+"""Time per limb of the rig build engine of 57258435/colorSlider.py (RigBuilder) for crowds
+
+No maya needed : ``python benchmarks/bench_rig.py --target 0.005``
+
+Every character has two arms and two legs of three joints, rigged IK/FK with stretch, all the limbs of all the
+characters are given to one RigBuilder.build. The time per limb has to stay flat when the crowd grows,
+the command counts per limb show what each limb costs and the modelled time is checked against the target.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+import fakemaya  # noqa: E402
+
+recorder = fakemaya.install()
+colorSlider = fakemaya.load_source('colorSlider', os.path.join(ROOT, '57258435', 'colorSlider.py'))
+
+SIZES = [1, 10, 50, 200]
+LIMBS = [('L_', 'Arm'), ('R_', 'Arm'), ('L_', 'Leg'), ('R_', 'Leg')]
+
+
+def crowd(characters, joints=3):
+    """
+    Args:
+        characters (int): number of characters, each one in its namespace
+        joints (int): joints per limb
+
+    Returns:
+        list: limb specs of every character
+    """
+    fakemaya.SCENE.clear()
+    specs = []
+    for c in range(characters):
+        ns = 'char{:03d}'.format(c)
+        root = fakemaya.SCENE.create('transform', ns + ':root').name
+        for side, part in LIMBS:
+            names = ['{}:{}{}_{:02d}'.format(ns, side, part.lower(), i + 1) for i in range(joints)]
+            fakemaya.SCENE.joint_chain(names, root)
+            specs.append(colorSlider.limbSpec(names[0], side, part, colorSlider.RIG_IKFK, stretch=True))
+    return specs
+
+
+def run(sizes=None, joints=3):
+    """
+    Args:
+        sizes (list, optional): number of characters of each run
+        joints (int): joints per limb
+
+    Returns:
+        list: limbs, commands, wall and modelled time of each run, in total and per limb
+    """
+    results = []
+    for characters in sizes or SIZES:
+        specs = crowd(characters, joints)
+        recorder.reset()
+        start = time.time()
+        colorSlider.RigBuilder().build(specs)
+        wall = time.time() - start
+        limbs = len(specs)
+        results.append({'characters': characters, 'limbs': limbs, 'nodes': len(fakemaya.SCENE.nodes),
+                        'commands': recorder.total(), 'counts': dict(recorder.counts), 'wall': wall,
+                        'modelled': recorder.modelled, 'wall_per_limb': wall / limbs,
+                        'modelled_per_limb': recorder.modelled / limbs,
+                        'commands_per_limb': recorder.total() / float(limbs)})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='number of characters of each run')
+    parser.add_argument('--joints', type=int, default=3, help='joints per limb')
+    parser.add_argument('--target', type=float, default=0.005, help='seconds per limb, wall + modelled')
+    parser.add_argument('--json', help='write the results as json')
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.joints)
+    print('{:>10}{:>7}{:>10}{:>12}{:>16}{:>20}'.format('characters', 'limbs', 'commands', 'per limb',
+                                                       'wall/limb (ms)', 'modelled/limb (ms)'))
+    for r in results:
+        print('{:>10}{:>7}{:>10}{:>12.1f}{:>16.3f}{:>20.3f}'.format(
+            r['characters'], r['limbs'], r['commands'], r['commands_per_limb'],
+            r['wall_per_limb'] * 1000, r['modelled_per_limb'] * 1000))
+    worst = max(r['wall_per_limb'] + r['modelled_per_limb'] for r in results)
+    print('worst time per limb {:.3f} ms, target {:.3f} ms'.format(worst * 1000, args.target * 1000))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    return 0 if worst <= args.target else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Scaling benchmarks of MayaNode and SuperBool against the fake maya of fakemaya.py
+
+No maya needed : ``python benchmarks/bench_suite.py --json /tmp/bench.json``
+
+Every scenario runs the real code of 59185039.py and 56137400/src.py on a scene of growing size and reports
+the number of maya commands, the wall time of the python side and the modelled time of the commands.
+A command count that grows faster than the scene is a regression of the scaling,
+the cost of each command can be changed with ``--cost listAttr=0.0005``.
+
+Scenarios:
+    attrs : MayaNode attribute access on a node with 100 to 10k attributes
+    controller : createController on meshes with 12 to 10k edges
+    preset : attrPreset, MayaNode.load_many and loadNode on presets with 1 to 5k nodes
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+import fakemaya  # noqa: E402
+
+recorder = fakemaya.install()
+mayanode = fakemaya.load_source('mayanode', os.path.join(ROOT, '59185039.py'))
+superbool = fakemaya.load_source('superbool_src', os.path.join(ROOT, '56137400', 'src.py'))
+
+SIZES = {'attrs': [100, 1000, 10000],
+         'controller': [12, 112, 1012, 9940],
+         'preset': [1, 100, 1000, 5000]}
+
+
+def _reset():
+    fakemaya.SCENE.clear()
+    mayanode.attr_cache.invalidate()
+    mayanode.dag_cache.invalidate()
+
+
+def _measure(scenario, size, func):
+    """
+    Args:
+        scenario (str): name of the scenario
+        size (int): size of the scene
+        func (function): workload, the scene is already built
+
+    Returns:
+        dict: scenario, size, commands, counts, wall and modelled time
+    """
+    recorder.reset()
+    start = time.time()
+    func()
+    wall = time.time() - start
+    return {'scenario': scenario, 'size': size, 'commands': recorder.total(), 'counts': dict(recorder.counts),
+            'wall': wall, 'modelled': recorder.modelled}
+
+
+def bench_attrs(size, samples=200):
+    """ read, write and batch read attributes spread over a shape with size attributes """
+    _reset()
+    fakemaya.SCENE.create('transform', 'node')
+    fakemaya.SCENE.create('mesh', 'nodeShape', 'node')
+    fakemaya.SCENE.add_attrs('nodeShape', size)
+    attrs = ['attr{}'.format(i) for i in range(0, size, max(1, size // samples))]
+
+    def run():
+        mn = mayanode.MayaNode('node')
+        for attr in attrs:
+            getattr(mn, attr).get()
+        for attr in attrs:
+            setattr(mn, attr, 1.0)
+        mn.get_many(attrs)
+
+    return [_measure('attrs', size, run)]
+
+
+def _mesh(edges):
+    """ a cube for 12 edges, otherwise a square grid with about this number of edges """
+    if edges == 12:
+        return fakemaya.SCENE.cube_mesh('mesh')
+    width = 1
+    while 2 * (width + 1) * (width + 2) <= edges:
+        width += 1
+    return fakemaya.SCENE.grid_mesh('mesh', width, width)
+
+
+def bench_controller(size):
+    """ createController on a mesh with size edges """
+    _reset()
+    mesh = _mesh(size)
+    return [_measure('controller', size, lambda: superbool.createController(mesh))]
+
+
+def bench_preset(size, attrs=10):
+    """ save size mesh nodes to a preset then load it into a namespace, with load_many and node by node """
+    _reset()
+    nodes = []
+    for i in range(size):
+        tr = fakemaya.SCENE.create('transform', 'node{}'.format(i))
+        sh = fakemaya.SCENE.create('mesh', tr.name + 'Shape', tr.name)
+        fakemaya.SCENE.add_attrs(sh.name, attrs)
+        nodes.append(tr.name)
+
+    preset = {}
+
+    def save():
+        for n in nodes:
+            preset.update(mayanode.MayaNode(n).attrPreset())
+
+    def load_many():
+        mayanode.MayaNode.load_many(preset, 'many')
+
+    def load_node():
+        index = mayanode.PresetIndex(preset)
+        for n in nodes:
+            mayanode.MayaNode('single:' + n).loadNode(index, targ_ns='single')
+
+    return [_measure('preset.attrPreset', size, save),
+            _measure('preset.load_many', size, load_many),
+            _measure('preset.loadNode', size, load_node)]
+
+
+BENCHES = {'attrs': bench_attrs, 'controller': bench_controller, 'preset': bench_preset}
+
+
+def run(scenarios=None, sizes=None):
+    """
+    Args:
+        scenarios (list, optional): names of SIZES, all by default
+        sizes (dict, optional): {scenario: [size]} to replace SIZES
+
+    Returns:
+        list: result of every scenario and size
+    """
+    results = []
+    for scenario in scenarios or sorted(SIZES):
+        for size in (sizes or SIZES)[scenario]:
+            results.extend(BENCHES[scenario](size))
+    return results
+
+
+def table(results, top=3):
+    """
+    Returns:
+        str: one line per result with its most called commands
+    """
+    lines = ['{:<20}{:>7}{:>10}{:>10}{:>14}  {}'.format('scenario', 'size', 'commands', 'wall (s)',
+                                                         'modelled (s)', 'most called')]
+    for r in results:
+        counts = sorted(r['counts'].items(), key=lambda c: -c[1])[:top]
+        lines.append('{:<20}{:>7}{:>10}{:>10.3f}{:>14.3f}  {}'.format(
+            r['scenario'], r['size'], r['commands'], r['wall'], r['modelled'],
+            ', '.join('{} {}'.format(cmd, n) for cmd, n in counts)))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('scenarios', nargs='*', choices=sorted(SIZES) + [[]], default=[],
+                        help='scenarios to run, all by default')
+    parser.add_argument('--quick', action='store_true', help='only the two smallest sizes')
+    parser.add_argument('--cost', action='append', default=[], metavar='COMMAND=SECONDS',
+                        help='cost of a command in the model, can be repeated')
+    parser.add_argument('--default-cost', type=float, default=None, help='cost of the other commands')
+    parser.add_argument('--json', help='write the results as json')
+    args = parser.parse_args(argv)
+
+    for item in args.cost:
+        command, seconds = item.split('=')
+        recorder.model.costs[command] = float(seconds)
+    if args.default_cost is not None:
+        recorder.model.default = args.default_cost
+    sizes = dict((k, v[:2]) for k, v in SIZES.items()) if args.quick else None
+
+    results = run(args.scenarios or None, sizes)
+    print(table(results))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,897 @@
+"""In-memory stand-in of maya.cmds / maya.api.OpenMaya to benchmark the tools without a maya licence
+
+``install()`` registers the fake modules (maya, maya.cmds, maya.api.OpenMaya, maya.utils, pymel.all and the
+dw_* helpers used by 59185039.py) in sys.modules, so the real tool code can be imported and run.
+Every command is recorded and charged to a ``CostModel``, the modelled time is an estimation of what the same
+calls would cost in maya and the command counts are what catch a change of scaling.
+
+Note:
+    The scene only knows what the benchmarks need : nodes, parenting, flat attributes, meshes and curves
+"""
+import itertools
+import sys
+import types
+
+
+class CostModel(object):
+    """Cost in seconds of each maya command
+
+    Args:
+        default (float): cost of a command missing from costs
+        costs (dict, optional): {command: seconds}
+    """
+
+    def __init__(self, default=20e-6, costs=None):
+        self.default = default
+        self.costs = {'listAttr': 150e-6, 'getAttr': 15e-6, 'setAttr': 25e-6, 'createNode': 200e-6,
+                      'rename': 80e-6, 'curve': 250e-6, 'parent': 150e-6, 'delete': 100e-6,
+                      'MFnMesh.getPoints': 5e-6, 'MFnMesh.getVertices': 5e-6,
+                      'MDGModifier.createNode': 10e-6, 'MDagModifier.createNode': 10e-6,
+                      'MDGModifier.renameNode': 5e-6, 'MDagModifier.renameNode': 5e-6,
+                      'MDGModifier.doIt': 50e-6, 'MDagModifier.doIt': 50e-6,
+                      'MDGModifier.newPlugValue': 2e-6, 'MDGModifier.connect': 5e-6,
+                      'MDGModifier.addAttribute': 10e-6, 'ikHandle': 500e-6}
+        self.costs.update(costs or {})
+
+    def cost(self, command):
+        return self.costs.get(command, self.default)
+
+
+class Recorder(object):
+    """Count the commands and sum their modelled cost
+
+    Args:
+        model (CostModel): cost of each command
+    """
+
+    def __init__(self, model=None):
+        self.model = model or CostModel()
+        self.reset()
+
+    def reset(self):
+        self.counts = {}
+        self.modelled = 0.0
+
+    def record(self, command):
+        self.counts[command] = self.counts.get(command, 0) + 1
+        self.modelled += self.model.cost(command)
+
+    def total(self):
+        return sum(self.counts.values())
+
+
+class Node(object):
+
+    def __init__(self, name, node_type, uuid):
+        self.name = name
+        self.type = node_type
+        self.uuid = uuid
+        self.parent = None
+        self.children = []
+        self.attrs = {}  #: {long name: value}
+        self.short = {}  #: {short name: long name}
+        self.long = {}  #: {long name: short name}
+        self.mesh = None  #: (points, counts, vertices)
+
+    def add(self, long_name, value, short=None):
+        self.attrs[long_name] = value
+        if short:
+            self.short[short] = long_name
+            self.long[long_name] = short
+
+
+class Scene(object):
+    """Nodes of the fake scene"""
+
+    shape_types = ('mesh', 'nurbsCurve', 'nurbsSurface', 'locator')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.nodes = {}
+        self.selection = []
+        self._uuid = itertools.count(1)
+
+    def unique(self, name):
+        if name not in self.nodes:
+            return name
+        base = name.rstrip('0123456789')
+        for i in itertools.count(1):
+            candidate = '{}{}'.format(base, i)
+            if candidate not in self.nodes:
+                return candidate
+
+    def create(self, node_type, name=None, parent=None):
+        name = self.unique(name or node_type + '1')
+        node = Node(name, node_type, 'UUID-{:08d}'.format(next(self._uuid)))
+        node.add('visibility', True, 'v')
+        if node_type in ('transform', 'joint'):
+            for axis in 'XYZ':
+                for long_name, short in [('translate', 't'), ('rotate', 'r'), ('scale', 's')]:
+                    node.add(long_name + axis, 1.0 if long_name == 'scale' else 0.0, short + axis.lower())
+            node.add('rotateOrder', 0, 'ro')
+        if node_type == 'joint':
+            for axis in 'XYZ':
+                node.add('jointOrient' + axis, 0.0, 'jo' + axis.lower())
+            node.add('radius', 1.0, 'radi')
+        self.nodes[name] = node
+        if parent:
+            self.reparent(name, parent)
+        return node
+
+    def reparent(self, name, parent):
+        node = self.nodes[name]
+        if node.parent:
+            self.nodes[node.parent].children.remove(name)
+        node.parent = parent
+        if parent:
+            self.nodes[parent].children.append(name)
+
+    def delete(self, name):
+        node = self.nodes.pop(name, None)
+        if node is None:
+            return
+        for child in list(node.children):
+            self.delete(child)
+        if node.parent and node.parent in self.nodes:
+            self.nodes[node.parent].children.remove(name)
+
+    def rename(self, old, new):
+        node = self.nodes.pop(old)
+        new = self.unique(new)
+        node.name = new
+        self.nodes[new] = node
+        if node.parent:
+            siblings = self.nodes[node.parent].children
+            siblings[siblings.index(old)] = new
+        for child in node.children:
+            self.nodes[child].parent = new
+        return new
+
+    def add_attrs(self, name, count, prefix='attr'):
+        node = self.nodes[name]
+        for i in range(count):
+            node.add('{}{}'.format(prefix, i), float(i), '{}{}'.format(prefix[0], i))
+
+    def cube_mesh(self, name):
+        """ a cube of 8 vertices, 6 faces and 12 edges """
+        tr = self.create('transform', name)
+        sh = self.create('mesh', name + 'Shape', tr.name)
+        points = [(x, y, z) for z in (-0.5, 0.5) for y in (-0.5, 0.5) for x in (-0.5, 0.5)]
+        vertices = [0, 1, 3, 2, 4, 6, 7, 5, 0, 4, 5, 1, 2, 3, 7, 6, 0, 2, 6, 4, 1, 5, 7, 3]
+        sh.mesh = (points, [4] * 6, vertices)
+        return tr.name
+
+    def joint_chain(self, names, parent=None, length=1.0):
+        """ joints aiming down X, each one parented to the previous one """
+        for i, name in enumerate(names):
+            joint = self.create('joint', name, parent)
+            if i:
+                joint.attrs['translateX'] = length
+            parent = joint.name
+        return names[0]
+
+    def grid_mesh(self, name, width, height):
+        """ a plane of width x height quads : width * (height + 1) + height * (width + 1) edges """
+        tr = self.create('transform', name)
+        sh = self.create('mesh', name + 'Shape', tr.name)
+        points = [(float(x), 0.0, float(z)) for z in range(height + 1) for x in range(width + 1)]
+        counts = []
+        vertices = []
+        for z in range(height):
+            for x in range(width):
+                a = z * (width + 1) + x
+                vertices += [a, a + 1, a + width + 2, a + width + 1]
+                counts.append(4)
+        sh.mesh = (points, counts, vertices)
+        return tr.name
+
+
+SCENE = Scene()
+RECORDER = Recorder()
+
+INHERITED = {'transform': ['containerBase', 'entity', 'dagNode', 'transform'],
+             'joint': ['containerBase', 'entity', 'dagNode', 'transform', 'joint'],
+             'mesh': ['containerBase', 'entity', 'dagNode', 'shape', 'surfaceShape', 'controlPoint',
+                      'deformableShape', 'mesh'],
+             'nurbsCurve': ['containerBase', 'entity', 'dagNode', 'shape', 'geometryShape', 'deformableShape',
+                            'controlPoint', 'curveShape', 'nurbsCurve'],
+             'locator': ['containerBase', 'entity', 'dagNode', 'shape', 'geometryShape', 'locator']}
+
+
+def _node_attr(plug):
+    name, attr = plug.split('.', 1)
+    node = SCENE.nodes[name.split('|')[-1]]
+    attr = attr.split('[', 1)[0]
+    return node, node.short.get(attr, attr)
+
+
+def _names(args):
+    out = []
+    for a in args:
+        if isinstance(a, (list, tuple)):
+            out.extend(a)
+        elif a is not None:
+            out.append(a)
+    return [n.split('|')[-1] for n in out]
+
+
+def _attr_type(value):
+    """ getAttr type of a value : string, bool, long, double, double3, matrix or doubleArray """
+    if isinstance(value, str):
+        return 'string'
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'long'
+    if isinstance(value, (list, tuple)):
+        if len(value) == 1 and isinstance(value[0], (list, tuple)):
+            return 'double{}'.format(len(value[0]))
+        return 'matrix' if len(value) == 16 else 'doubleArray'
+    return 'double'
+
+
+class _Cmds(object):
+    """maya.cmds commands of the fake scene"""
+
+    @staticmethod
+    def ls(*args, **kwargs):
+        if kwargs.get('nt') or kwargs.get('nodeTypes'):
+            return ['transform', 'mesh', 'nurbsCurve', 'locator', 'joint', 'cluster']
+        if kwargs.get('sl') or kwargs.get('selection'):
+            return list(SCENE.selection)
+        names = _names(args) if args else list(SCENE.nodes)
+        names = [n for n in names if n in SCENE.nodes]
+        node_type = kwargs.get('type')
+        if node_type:
+            names = [n for n in names if SCENE.nodes[n].type == node_type]
+        if kwargs.get('uuid'):
+            return [SCENE.nodes[n].uuid for n in names]
+        return names
+
+    @staticmethod
+    def objExists(name):
+        return name.split('.')[0].split('|')[-1] in SCENE.nodes
+
+    @staticmethod
+    def nodeType(name, isTypeName=False, inherited=False, **kwargs):
+        if isTypeName:
+            return INHERITED.get(name, ['containerBase', 'entity', name])
+        return SCENE.nodes[name.split('|')[-1]].type
+
+    @staticmethod
+    def listRelatives(*args, **kwargs):
+        out = []
+        for name in _names(args):
+            node = SCENE.nodes[name]
+            if kwargs.get('p') or kwargs.get('parent'):
+                if node.parent:
+                    out.append(node.parent)
+                continue
+            children = node.children
+            if kwargs.get('type') == 'shape' or kwargs.get('s') or kwargs.get('shapes'):
+                children = [c for c in children if SCENE.nodes[c].type in Scene.shape_types]
+            out.extend(children)
+        return out or None
+
+    @staticmethod
+    def listAttr(plug, shortNames=False, **kwargs):
+        if '.' in plug:
+            node, attr = _node_attr(plug)
+            if attr not in node.attrs:
+                raise ValueError('No object matches name: {}'.format(plug))
+            return [node.long.get(attr, attr)] if shortNames else [attr]
+        node = SCENE.nodes[plug.split('|')[-1]]
+        if shortNames:
+            return [node.long.get(a, a) for a in node.attrs]
+        return list(node.attrs)
+
+    @staticmethod
+    def getAttr(plug, **kwargs):
+        node, attr = _node_attr(plug)
+        if kwargs.get('type'):
+            return _attr_type(node.attrs[attr])
+        if kwargs.get('settable'):
+            return True
+        if kwargs.get('multiIndices') or kwargs.get('mi'):
+            return None
+        return node.attrs[attr]
+
+    @staticmethod
+    def setAttr(plug, *values, **kwargs):
+        node, attr = _node_attr(plug)
+        kind = kwargs.get('type')
+        if kind in ('matrix', 'fltMatrix', 'doubleArray'):
+            node.attrs[attr] = list(values[0])
+            return
+        current = _attr_type(node.attrs.get(attr, 0.0))
+        if kind is None and current in ('matrix', 'doubleArray', 'string'):
+            raise RuntimeError('Error while parsing arguments.')
+        node.attrs[attr] = values[0] if len(values) == 1 else [tuple(values)]
+
+    @staticmethod
+    def addAttr(name, longName=None, ln=None, shortName=None, sn=None, **kwargs):
+        SCENE.nodes[name].add(longName or ln, 0.0, shortName or sn)
+
+    @staticmethod
+    def deleteAttr(plug):
+        node, attr = _node_attr(plug)
+        node.attrs.pop(attr, None)
+
+    @staticmethod
+    def createNode(node_type, name=None, parent=None, **kwargs):
+        if node_type in Scene.shape_types and not parent:
+            tr = SCENE.create('transform', 'polySurface1' if node_type == 'mesh' else node_type + '1')
+            return SCENE.create(node_type, name or tr.name.rstrip('0123456789') + 'Shape1', tr.name).name
+        return SCENE.create(node_type, name, parent).name
+
+    @staticmethod
+    def rename(old, new, ignoreShape=False, **kwargs):
+        old = old.split('|')[-1]
+        node = SCENE.nodes[old]
+        new = SCENE.rename(old, new)
+        if node.type == 'transform' and not ignoreShape:
+            for child in list(node.children):
+                if SCENE.nodes[child].type in Scene.shape_types:
+                    SCENE.rename(child, new + 'Shape')
+        return new
+
+    @staticmethod
+    def delete(*args, **kwargs):
+        for name in _names(args):
+            SCENE.delete(name)
+
+    @staticmethod
+    def xform(*args, **kwargs):
+        if kwargs.get('query') or kwargs.get('q'):
+            return [0.0, 0.0, 0.0]
+
+    @staticmethod
+    def curve(n='curve1', d=1, p=(), ws=False, **kwargs):
+        tr = SCENE.create('transform', n)
+        sh = SCENE.create('nurbsCurve', tr.name + 'Shape', tr.name)
+        sh.attrs['cvs'] = list(p)
+        return tr.name
+
+    @staticmethod
+    def parent(*args, **kwargs):
+        names = _names(args)
+        if kwargs.get('w') or kwargs.get('world'):
+            target = None
+        else:
+            target = names.pop()
+        for name in names:
+            SCENE.reparent(name, target)
+        return names
+
+    @staticmethod
+    def select(*args, **kwargs):
+        SCENE.selection = [] if kwargs.get('clear') else _names(args)
+
+    @staticmethod
+    def ikHandle(sj=None, ee=None, sol=None, n='ikHandle1', **kwargs):
+        handle = SCENE.create('ikHandle', n)
+        effector = SCENE.create('ikEffector', handle.name + '_effector', SCENE.nodes[ee].parent)
+        return [handle.name, effector.name]
+
+    @staticmethod
+    def about(**kwargs):
+        return True
+
+    @staticmethod
+    def undoInfo(**kwargs):
+        return True if kwargs.get('q') or kwargs.get('query') else None
+
+    @staticmethod
+    def warning(*args):
+        return None
+
+    @staticmethod
+    def error(message):
+        raise RuntimeError(message)
+
+
+def _recorded(name, func):
+    def call(*args, **kwargs):
+        RECORDER.record(name)
+        return func(*args, **kwargs)
+    call.__name__ = name
+    return call
+
+
+class MPoint(object):
+    __slots__ = ('x', 'y', 'z', 'w')
+
+    def __init__(self, x=0.0, y=0.0, z=0.0, w=1.0):
+        self.x, self.y, self.z, self.w = x, y, z, w
+
+
+class MDagPath(object):
+
+    def __init__(self, name):
+        self.name = name
+
+    def extendToShape(self):
+        children = SCENE.nodes[self.name].children
+        shapes = [c for c in children if SCENE.nodes[c].type in Scene.shape_types]
+        if shapes:
+            self.name = shapes[0]
+
+
+class MSelectionList(object):
+
+    def __init__(self):
+        self.items = []
+
+    def add(self, name):
+        RECORDER.record('MSelectionList.add')
+        name = name.split('|')[-1]
+        if name.split('.')[0] not in SCENE.nodes:
+            raise RuntimeError('(kInvalidParameter): Object does not exist')
+        self.items.append(name)
+
+    def getDagPath(self, i):
+        return MDagPath(self.items[i])
+
+    def length(self):
+        return len(self.items)
+
+    def getDependNode(self, i):
+        return MObject(node=SCENE.nodes[self.items[i].split('.')[0]])
+
+    def getPlug(self, i):
+        node, attr = self.items[i].split('.', 1)
+        node = SCENE.nodes[node]
+        attr = node.short.get(attr, attr)
+        if attr not in node.attrs:
+            raise TypeError('(kInvalidParameter): Not a plug')
+        return MPlug(MObject(node=node), attr)
+
+
+class MObject(object):
+    """Node of the scene, for a node of a modifier the scene node exists after doIt"""
+
+    def __init__(self, node_type=None, parent=None, node=None):
+        self.type = node.type if node is not None else node_type
+        self.parent = parent
+        self.name = None
+        self.node = node
+
+    def hasFn(self, fn):
+        return self.type == fn or fn in INHERITED.get(self.type, ())
+
+    def isNull(self):
+        return self.node is None and self.type is None
+
+
+MObject.kNullObj = MObject()
+MFn = types.ModuleType('MFn')
+MFn.kJoint = 'joint'
+MFn.kWorld = 'world'
+MFn.kTransform = 'transform'
+MFn.kDagNode = 'dagNode'
+MFn.kNumericAttribute = 'numericAttribute'
+MFn.kUnitAttribute = 'unitAttribute'
+MFn.kEnumAttribute = 'enumAttribute'
+MFn.kMatrixAttribute = 'matrixAttribute'
+MFn.kTypedAttribute = 'typedAttribute'
+MFn.kCompoundAttribute = 'compoundAttribute'
+
+
+class MObjectHandle(object):
+
+    def __init__(self, obj):
+        self._obj = obj
+
+    def isValid(self):
+        node = self._obj.node
+        return node is not None and SCENE.nodes.get(node.name) is node
+
+    isAlive = isValid
+
+    def object(self):
+        return self._obj
+
+
+class MFnDagNode(object):
+
+    def __init__(self, obj=None):
+        self.obj = obj
+
+    def childCount(self):
+        return len(self.obj.node.children)
+
+    def child(self, i):
+        return MObject(node=SCENE.nodes[self.obj.node.children[i]])
+
+    def parent(self, i):
+        parent = self.obj.node.parent
+        return MObject(node=SCENE.nodes[parent]) if parent else MObject('world')
+
+
+class _Attribute(object):
+    """Attribute MObject of a plug, its kind is guessed from the value like getAttr -type"""
+
+    def __init__(self, fn, data=None):
+        self.fn = fn
+        self.data = data  #: numeric type, unit type or typed data type
+
+    def hasFn(self, fn):
+        return self.fn == fn
+
+    @classmethod
+    def of(cls, attr, value):
+        if isinstance(value, bool):
+            return cls(MFn.kNumericAttribute, MFnNumericData.kBoolean)
+        if isinstance(value, int):
+            return cls(MFn.kNumericAttribute, MFnNumericData.kLong)
+        if isinstance(value, float):
+            for prefix, unit in [('translate', MFnUnitAttribute.kDistance), ('rotate', MFnUnitAttribute.kAngle),
+                                 ('time', MFnUnitAttribute.kTime)]:
+                if attr.startswith(prefix):
+                    return cls(MFn.kUnitAttribute, unit)
+            return cls(MFn.kNumericAttribute, MFnNumericData.kDouble)
+        if isinstance(value, str):
+            return cls(MFn.kTypedAttribute, MFnData.kString)
+        if isinstance(value, (list, tuple)):
+            if len(value) == 1 and isinstance(value[0], (list, tuple)):
+                return cls(MFn.kCompoundAttribute)
+            return cls(MFn.kTypedAttribute, MFnData.kMatrix if len(value) == 16 else MFnData.kDoubleArray)
+        return cls(None)
+
+
+class _Data(object):
+    """MObject of a typed value (matrix, arrays), read back by the MFn*Data stand-ins"""
+
+    def __init__(self, value):
+        self.value = value
+
+
+class MPlug(object):
+    """Plug of a scene attribute, a child of a compound plug is its index in the tuple value"""
+
+    def __init__(self, obj, attr, index=None):
+        self.obj = obj
+        self.attr = attr
+        self.index = index
+        self.isArray = False
+
+    def name(self):
+        return '{}.{}'.format(self.obj.node.name, self.attr)
+
+    def elementByLogicalIndex(self, i):
+        return MPlug(self.obj, '{}[{}]'.format(self.attr, i))
+
+    def _value(self):
+        node = self.obj.node
+        value = node.attrs.get(node.short.get(self.attr, self.attr), 0.0)
+        return value[0][self.index] if self.index is not None else value
+
+    def attribute(self):
+        return _Attribute.of(self.attr, self._value())
+
+    @property
+    def isCompound(self):
+        return self.attribute().hasFn(MFn.kCompoundAttribute)
+
+    def numChildren(self):
+        return len(self._value()[0])
+
+    def child(self, i):
+        return MPlug(self.obj, self.attr, i)
+
+    def asDouble(self):
+        return float(self._value())
+
+    def asInt(self):
+        return int(self._value())
+
+    def asBool(self):
+        return bool(self._value())
+
+    def asString(self):
+        return self._value()
+
+    def asMDistance(self):
+        return MDistance(self._value())
+
+    def asMAngle(self):
+        return MAngle(self._value())
+
+    def asMTime(self):
+        return MTime(self._value())
+
+    def asMObject(self):
+        return _Data(self._value())
+
+
+class _Unit(object):
+    """MDistance, MAngle and MTime, the values are always in ui units"""
+
+    def __init__(self, value=0.0, unit=None):
+        self.value = value
+
+    def asUnits(self, unit):
+        return self.value
+
+    @staticmethod
+    def uiUnit():
+        return None
+
+
+class MDistance(_Unit):
+    pass
+
+
+class MAngle(_Unit):
+    pass
+
+
+class MTime(_Unit):
+    pass
+
+
+class MFnData(object):
+    kString = 'string'
+    kMatrix = 'matrix'
+    kDoubleArray = 'doubleArray'
+    kIntArray = 'Int32Array'
+    kPointArray = 'pointArray'
+    kVectorArray = 'vectorArray'
+
+
+class MFnUnitAttribute(object):
+    kDistance = 'distance'
+    kAngle = 'angle'
+    kTime = 'time'
+
+    def __init__(self, attr=None):
+        self.attr = attr
+
+    def unitType(self):
+        return self.attr.data
+
+
+class MFnTypedAttribute(object):
+
+    def __init__(self, attr=None):
+        self.attr = attr
+
+    def attrType(self):
+        return self.attr.data
+
+
+class MFnMatrixData(object):
+
+    def __init__(self, data=None):
+        self.data = data
+
+    def matrix(self):
+        return list(self.data.value)
+
+
+class MFnDoubleArrayData(object):
+
+    def __init__(self, data=None):
+        self.data = data
+
+    def array(self):
+        return list(self.data.value)
+
+
+class MFnNumericData(object):
+    kDouble = 'double'
+    kFloat = 'float'
+    kInt = 'long'
+    kLong = 'long'
+    kShort = 'short'
+    kByte = 'byte'
+    kChar = 'char'
+    kBoolean = 'bool'
+
+
+class MFnNumericAttribute(object):
+
+    def __init__(self, attr=None):
+        self.attr = attr
+        self.keyable = False
+
+    def numericType(self):
+        return self.attr.data
+
+    def create(self, long_name, short_name, data_type, default=0.0):
+        self.long_name = long_name
+        self.short_name = short_name
+        self.default = default
+        return self
+
+    def setMin(self, value):
+        self.min = value
+
+    def setMax(self, value):
+        self.max = value
+
+
+class MDGModifier(object):
+
+    def __init__(self):
+        self._created = []
+        self._values = []  #: (plug, value) set on doIt
+        self._attributes = []  #: (MObject, MFnNumericAttribute) added on doIt
+
+    def createNode(self, node_type, parent=None):
+        RECORDER.record(type(self).__name__ + '.createNode')
+        obj = MObject(node_type, parent)
+        self._created.append(obj)
+        return obj
+
+    def renameNode(self, obj, name):
+        RECORDER.record(type(self).__name__ + '.renameNode')
+        obj.name = name
+
+    def newPlugValue(self, plug, value):
+        RECORDER.record(type(self).__name__ + '.newPlugValue')
+        self._values.append((plug, value))
+
+    newPlugValueDouble = newPlugValueInt = newPlugValueBool = newPlugValue
+
+    def addAttribute(self, obj, attr):
+        RECORDER.record(type(self).__name__ + '.addAttribute')
+        self._attributes.append((obj, attr))
+
+    def connect(self, src, dst):
+        RECORDER.record(type(self).__name__ + '.connect')
+        self._values.append((dst, src))
+
+    def doIt(self):
+        RECORDER.record(type(self).__name__ + '.doIt')
+        for obj in self._created:
+            parent = obj.parent.node if obj.parent is not None else None
+            obj.node = SCENE.create(obj.type, obj.name, parent.name if parent is not None else None)
+        for obj, attr in self._attributes:
+            obj.node.add(attr.long_name, attr.default, attr.short_name)
+        for plug, value in self._values:
+            # connections are stored as the source plug
+            node = plug.obj.node
+            node.attrs[node.short.get(plug.attr, plug.attr)] = value
+
+    def undoIt(self):
+        for obj in reversed(self._created):
+            SCENE.delete(obj.node.name)
+        for obj, attr in self._attributes:
+            obj.node.attrs.pop(attr.long_name, None)
+
+
+class MDagModifier(MDGModifier):
+    pass
+
+
+class MUuid(object):
+
+    def __init__(self, uuid):
+        self._uuid = uuid
+
+    def asString(self):
+        return self._uuid
+
+
+class MFnDependencyNode(object):
+
+    def __init__(self, obj=None):
+        self.obj = obj
+
+    def name(self):
+        return self.obj.node.name if self.obj.node is not None else self.obj.type
+
+    def uuid(self):
+        return MUuid(self.obj.node.uuid)
+
+    def attributeCount(self):
+        return len(self.obj.node.attrs)
+
+    def findPlug(self, attr, want_networked=False):
+        return MPlug(self.obj, attr)
+
+
+class MFnMesh(object):
+
+    def __init__(self, dag=None):
+        self.node = SCENE.nodes[dag.name] if dag is not None else None
+
+    def getPoints(self, space=None):
+        RECORDER.record('MFnMesh.getPoints')
+        return [MPoint(*p) for p in self.node.mesh[0]]
+
+    def getVertices(self):
+        RECORDER.record('MFnMesh.getVertices')
+        return list(self.node.mesh[1]), list(self.node.mesh[2])
+
+    @property
+    def numPolygons(self):
+        return len(self.node.mesh[1])
+
+
+def _module(name, **attrs):
+    module = types.ModuleType(name)
+    for key, value in attrs.items():
+        setattr(module, key, value)
+    sys.modules[name] = module
+    return module
+
+
+def _createAttrPreset(node):
+    n = SCENE.nodes[node]
+    data = dict((a, v) for a, v in n.attrs.items())
+    data['nodeType'] = n.type
+    return {node: data}
+
+
+def _blendAttrDic(src, target, dic, blend):
+    for attr, value in dic[src].items():
+        if attr != 'nodeType' and _Cmds.objExists(target):
+            cmds.setAttr('{}.{}'.format(target, attr), value)
+
+
+def _acceptString(*names):
+    def deco(func):
+        return func
+    return deco
+
+
+cmds = None
+
+
+def install(model=None):
+    """
+    Register the fake modules in sys.modules
+
+    Args:
+        model (CostModel, optional): cost of each command
+
+    Returns:
+        Recorder: counts and modelled time of the commands
+    """
+    global cmds
+    try:
+        basestring
+    except NameError:
+        # the tools are written for the python 2 of maya
+        import builtins
+        builtins.basestring = str
+    if model is not None:
+        RECORDER.model = model
+    commands = dict((name, _recorded(name, getattr(_Cmds, name)))
+                    for name in dir(_Cmds) if not name.startswith('_'))
+    cmds = _module('maya.cmds', **commands)
+    om2 = _module('maya.api.OpenMaya', MSelectionList=MSelectionList, MFnMesh=MFnMesh, MPoint=MPoint,
+                  MDGModifier=MDGModifier, MDagModifier=MDagModifier, MFnDependencyNode=MFnDependencyNode,
+                  MObject=MObject, MObjectHandle=MObjectHandle, MFn=MFn, MFnDagNode=MFnDagNode, MPlug=MPlug, MFnNumericData=MFnNumericData,
+                  MFnNumericAttribute=MFnNumericAttribute, MFnUnitAttribute=MFnUnitAttribute,
+                  MFnTypedAttribute=MFnTypedAttribute, MFnData=MFnData, MFnMatrixData=MFnMatrixData,
+                  MFnDoubleArrayData=MFnDoubleArrayData, MDistance=MDistance, MAngle=MAngle, MTime=MTime,
+                  MSpace=types.SimpleNamespace(kWorld=4, kObject=2) if hasattr(types, 'SimpleNamespace') else None)
+    api = _module('maya.api', OpenMaya=om2)
+    utils = _module('maya.utils', executeDeferred=lambda func, *args: func(*args))
+    _module('maya', cmds=cmds, api=api, utils=utils)
+    pymel_all = _module('pymel.all')
+    _module('pymel', all=pymel_all)
+    _module('dw_maya_utils', merge_two_dicts=lambda a, b: dict(a, **b),
+            Flags=lambda preset, default, long_name, short_name, **kwargs: {long_name: default})
+    _module('dw_presets_io', createAttrPreset=_createAttrPreset, blendAttrDic=_blendAttrDic)
+    _module('dw_decorators', acceptString=_acceptString)
+    _module('dw_json', saveJson=lambda path, data: path)
+    return RECORDER
+
+
+def load_source(name, path):
+    """ import a module from its path, the tools are named after their question id so they can't be imported """
+    try:
+        import importlib.util
+    except ImportError:
+        import imp
+        return imp.load_source(name, path)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,206 @@
+"""Opt-in instrumentation of maya.cmds for the tools of this repo
+
+The ``cmds``/``mc`` global of the instrumented modules is replaced by a proxy that count and time every command,
+each call is attributed to the function of the tool calling it (``MayaNode.listAttr``, ``creator``...)
+and to the whole stack of tool functions so it can be read as a flame graph.
+
+``mayanode = load_source('mayanode', '59185039.py')``
+``with CmdsProfiler(mayanode, superbool_src) as prof:``
+``    mayanode.MayaNode('pCube1').translateX.get()``
+``prof.save_json('/tmp/cmds.json')``
+``prof.save_folded('/tmp/cmds.folded')``  then ``flamegraph.pl /tmp/cmds.folded > cmds.svg``
+"""
+import json
+import sys
+import time
+
+
+class CmdsProxy(object):
+    """Stand in for the maya.cmds module, every attribute is the timed version of the command
+
+    Args:
+        cmds (module): maya.cmds or any module with the same functions
+        profiler (CmdsProfiler): where the calls are recorded
+    """
+
+    def __init__(self, cmds, profiler):
+        self._cmds = cmds
+        self._profiler = profiler
+        self._wrapped = {}
+
+    def __getattr__(self, name):
+        try:
+            return self._wrapped[name]
+        except KeyError:
+            pass
+        func = getattr(self._cmds, name)
+        if not callable(func):
+            return func
+        profiler = self._profiler
+
+        def timed(*args, **kwargs):
+            stack = profiler._stack(sys._getframe(1))
+            start = time.time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler._record(stack, name, time.time() - start)
+
+        timed.__name__ = name
+        self._wrapped[name] = timed
+        return timed
+
+
+class CmdsProfiler(object):
+    """Count and time the maya commands of the tools, by entry point
+
+    Args:
+        *modules (module): tool modules to instrument, their maya.cmds global is swapped while installed
+
+    Attributes:
+        calls (dict): {entry point: {command: [count, seconds]}}
+        stacks (dict): {(tool function, ..., command): [count, seconds]}
+    """
+
+    def __init__(self, *modules):
+        self.modules = list(modules)
+        self.calls = {}
+        self.stacks = {}
+        self._files = set()
+        self._swapped = []
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, *args):
+        self.uninstall()
+
+    def install(self):
+        """ replace maya.cmds in every module by a CmdsProxy """
+        if self._swapped:
+            return
+        cmds = sys.modules.get('maya.cmds')
+        for module in self.modules:
+            self._files.add(self._source(module.__file__))
+            for attr, value in list(vars(module).items()):
+                if value is cmds or getattr(value, '__name__', None) == 'maya.cmds':
+                    setattr(module, attr, CmdsProxy(value, self))
+                    self._swapped.append((module, attr, value))
+
+    def uninstall(self):
+        """ put maya.cmds back """
+        for module, attr, value in self._swapped:
+            setattr(module, attr, value)
+        self._swapped = []
+
+    def reset(self):
+        """ forget the recorded calls """
+        self.calls = {}
+        self.stacks = {}
+
+    @staticmethod
+    def _source(path):
+        # compiled files are reported with their .py
+        return path[:-1] if path.endswith(('.pyc', '.pyo')) else path
+
+    def _stack(self, frame):
+        """
+        Args:
+            frame (frame): caller of the command
+
+        Returns:
+            tuple: name of every tool function in the stack, outermost first
+        """
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            if self._source(code.co_filename) in self._files:
+                names.append(self._name(frame))
+            frame = frame.f_back
+        return tuple(reversed(names))
+
+    @staticmethod
+    def _name(frame):
+        """
+        Returns:
+            str: Class.method or function
+        """
+        code = frame.f_code
+        qualname = getattr(code, 'co_qualname', None)
+        if qualname:
+            return qualname.replace('.<locals>', '')
+        owner = frame.f_locals.get('self', frame.f_locals.get('cls'))
+        if owner is not None:
+            cls = owner if isinstance(owner, type) else type(owner)
+            return '{}.{}'.format(cls.__name__, code.co_name)
+        return code.co_name
+
+    def _record(self, stack, command, seconds):
+        entry = stack[-1] if stack else '<outside>'
+        stat = self.calls.setdefault(entry, {}).setdefault(command, [0, 0.0])
+        stat[0] += 1
+        stat[1] += seconds
+        stat = self.stacks.setdefault(stack + (command,), [0, 0.0])
+        stat[0] += 1
+        stat[1] += seconds
+
+    def report(self):
+        """
+        Returns:
+            dict: {entry point: {'calls', 'seconds', 'commands': {command: {'calls', 'seconds'}}}}
+        """
+        out = {}
+        for entry, commands in self.calls.items():
+            out[entry] = {'calls': sum(c[0] for c in commands.values()),
+                          'seconds': sum(c[1] for c in commands.values()),
+                          'commands': dict((cmd, {'calls': c[0], 'seconds': c[1]}) for cmd, c in commands.items())}
+        return out
+
+    def save_json(self, path):
+        """
+        Args:
+            path (str): /path/gneh/cmds.json
+
+        Returns:
+            str: path
+        """
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2, sort_keys=True)
+        return path
+
+    def folded(self):
+        """
+        Returns:
+            list: lines ``creator;createController;curve 1200`` in microseconds, the folded stack format
+            of flamegraph.pl and speedscope
+        """
+        return ['{} {}'.format(';'.join(stack), int(round(stat[1] * 1e6)))
+                for stack, stat in sorted(self.stacks.items())]
+
+    def save_folded(self, path):
+        """
+        Args:
+            path (str): /path/gneh/cmds.folded
+
+        Returns:
+            str: path
+        """
+        with open(path, 'w') as f:
+            f.write('\n'.join(self.folded()) + '\n')
+        return path
+
+    def summary(self, limit=20):
+        """
+        Args:
+            limit (int): number of lines
+
+        Returns:
+            str: most expensive entry point/command pairs
+        """
+        rows = [(c[1], c[0], entry, cmd) for entry, commands in self.calls.items() for cmd, c in commands.items()]
+        rows.sort(reverse=True)
+        lines = ['{:>10} {:>8}  {}'.format('seconds', 'calls', 'entry point -> command')]
+        for seconds, count, entry, cmd in rows[:limit]:
+            lines.append('{:>10.4f} {:>8}  {} -> {}'.format(seconds, count, entry, cmd))
+        return '\n'.join(lines)
@@ -0,0 +1,57 @@
+"""AttrCache against the fake maya of benchmarks/fakemaya.py
+
+``python -m pytest -q tests``
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import fakemaya  # noqa: E402
+
+recorder = fakemaya.install()
+mayanode = fakemaya.load_source('mayanode', os.path.join(ROOT, '59185039.py'))
+
+
+@pytest.fixture(autouse=True)
+def scene():
+    fakemaya.SCENE.clear()
+    mayanode.attr_cache.invalidate()
+    mayanode.dag_cache.invalidate()
+    fakemaya.SCENE.create('transform', 'a').add('foo', 1.0, 'foo')
+
+
+def test_node_made_again():
+    assert 'foo' in mayanode.MayaNode('a').listAttr('foo')
+    fakemaya.cmds.delete('a')
+    fakemaya.SCENE.create('transform', 'a')
+    assert 'foo' not in mayanode.MayaNode('a').listAttr('foo')
+
+
+def test_cmds_addAttr():
+    assert 'bar' not in mayanode.MayaNode('a').listAttr('bar')
+    fakemaya.cmds.addAttr('a', longName='bar', shortName='br')
+    assert mayanode.MayaNode('a').bar.get() == 0.0
+    assert mayanode.MayaNode('a').br.get() == 0.0
+
+
+def test_one_listing_per_node():
+    mn = mayanode.MayaNode('a')
+    recorder.reset()
+    for attr in ['translateX', 'translateY', 'rotateX', 'rotateY', 'rotateZ', 'scaleX', 'foo', 'rotateOrder']:
+        getattr(mn, attr).get()
+    # long and short names of the transform, once
+    assert recorder.counts.get('listAttr', 0) <= 2
+
+
+def test_plugs_share_the_node_names():
+    fakemaya.SCENE.nodes['a'].add('weightList.weights', 0.0, 'w')
+    recorder.reset()
+    for i in range(10):
+        assert mayanode.attr_cache.has('a', 'weightList[{}].weights'.format(i))
+    assert not mayanode.attr_cache.has('a', 'nothing[0]')
+    assert recorder.counts.get('listAttr', 0) <= 2
+    assert len(mayanode.attr_cache._names['a'][2]) == 1
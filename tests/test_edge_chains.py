@@ -0,0 +1,49 @@
+"""edgeChains of 56137400/src.py on the meshes of benchmarks/fakemaya.py
+
+``python -m pytest -q tests``
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import fakemaya  # noqa: E402
+
+fakemaya.install()
+superbool = fakemaya.load_source('superbool_src', os.path.join(ROOT, '56137400', 'src.py'))
+
+
+@pytest.fixture(autouse=True)
+def scene():
+    fakemaya.SCENE.clear()
+
+
+def _chainEdges(chains):
+    edges = []
+    for chain in chains:
+        for a, b in zip(chain, chain[1:]):
+            edges.append((a, b) if a < b else (b, a))
+    return edges
+
+
+@pytest.mark.parametrize('make, count', [
+    (lambda: fakemaya.SCENE.cube_mesh('cube'), 12),
+    (lambda: fakemaya.SCENE.grid_mesh('grid', 1, 1), 4),
+    (lambda: fakemaya.SCENE.grid_mesh('grid', 5, 3), 5 * 4 + 3 * 6),
+])
+def test_every_edge_once(make, count):
+    points, edges = superbool.meshEdges(make())
+    assert len(edges) == count
+    chains = superbool.edgeChains(edges)
+    drawn = _chainEdges(chains)
+    # every edge of the mesh exactly once and nothing else
+    assert sorted(drawn) == sorted(edges)
+    assert all(len(chain) > 1 for chain in chains)
+    assert len(chains) < len(edges)
+
+
+def test_no_edges():
+    assert superbool.edgeChains([]) == []
@@ -0,0 +1,66 @@
+"""Volumes of the numpy booleans of 56137400/npbool.py, no maya needed
+
+``python -m pytest -q tests``
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from fakemaya import load_source  # noqa: E402
+
+npbool = load_source('npbool', os.path.join(ROOT, '56137400', 'npbool.py'))
+
+
+def box(lo, hi):
+    """
+    Returns:
+        tuple: (vertices, faces) of a box made of 12 triangles facing out
+    """
+    lo, hi = np.asarray(lo, dtype=np.float64), np.asarray(hi, dtype=np.float64)
+    corners = np.array([[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype=np.float64)
+    quads = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+    faces = [tri for a, b, c, d in quads for tri in ((a, b, c), (a, c, d))]
+    return lo + corners * (hi - lo), np.array(faces)
+
+
+def volume(mesh):
+    tris = mesh[0][mesh[1]]
+    return np.einsum('ij,ij->i', tris[:, 0], np.cross(tris[:, 1], tris[:, 2])).sum() / 6.0
+
+
+CUBE = box([-1, -1, -1], [1, 1, 1])
+
+# cutter: (union, difference, intersection)
+CASES = [(box([0, -1, -1], [2, 1, 1]), (12.0, 4.0, 4.0)),  # four coplanar faces, same normals
+         (box([1, -1, -1], [3, 1, 1]), (16.0, 8.0, 0.0)),  # touching faces, opposite normals
+         (box([-1, -1, -1], [1, 1, 1]), (8.0, 0.0, 8.0)),  # same box
+         (box([0, 0, -1], [2, 2, 1]), (14.0, 6.0, 2.0)),  # two coplanar faces
+         (box([0.5, 0.5, 0.5], [1.5, 1.5, 1.5]), (8.875, 7.875, 0.125))]  # nothing coplanar
+
+
+@pytest.mark.parametrize('cutter, volumes', CASES)
+def test_volumes(cutter, volumes):
+    for op, expected in zip([npbool.UNION, npbool.DIFFERENCE, npbool.INTERSECTION], volumes):
+        assert volume(npbool.boolean(CUBE, cutter, op)) == pytest.approx(expected, abs=1e-6)
+
+
+def test_disjoint():
+    cutter = box([3, 3, 3], [4, 4, 4])
+    assert volume(npbool.boolean(CUBE, cutter, npbool.UNION)) == pytest.approx(9.0)
+    assert volume(npbool.boolean(CUBE, cutter, npbool.DIFFERENCE)) == pytest.approx(8.0)
+    assert len(npbool.boolean(CUBE, cutter, npbool.INTERSECTION)[1]) == 0
+
+
+def test_coplanar_sides():
+    cutter = box([0, -1, -1], [2, 1, 1])
+    pairs = npbool.candidate_pairs(CUBE[0], CUBE[1], cutter[0], cutter[1])
+    pieces, sides = npbool.split_triangles(CUBE[0], CUBE[1], cutter[0][cutter[1]], pairs)
+    assert len(pieces) == len(sides)
+    # the four faces shared with the cutter, 2x1 each
+    assert npbool._area(pieces[sides == 1]).sum() == pytest.approx(8.0)
+    assert not (sides == -1).any()
@@ -0,0 +1,87 @@
+"""PlugBackend reads against the fake maya.api.OpenMaya of benchmarks/fakemaya.py
+
+``python -m pytest -q tests``
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import fakemaya  # noqa: E402
+
+recorder = fakemaya.install()
+mayanode = fakemaya.load_source('mayanode', os.path.join(ROOT, '59185039.py'))
+
+VALUES = {'translateX': 1.5,  # distance
+          'rotateY': 45.0,  # angle
+          'scale': 2.0,  # double
+          'count': 3,  # int
+          'flag': True,  # bool
+          'label': 'hello',  # string
+          'color': [(0.1, 0.2, 0.3)],  # compound
+          'offset': [float(i) for i in range(16)],  # matrix
+          'weights': [0.25, 0.5, 0.75]}  # doubleArray
+
+KINDS = {'translateX': 'distance', 'rotateY': 'angle', 'scale': 'double', 'count': 'int', 'flag': 'bool',
+         'label': 'string', 'offset': 'matrix', 'weights': 'doubleArray'}
+
+
+@pytest.fixture
+def node():
+    fakemaya.SCENE.clear()
+    mayanode.attr_cache.invalidate()
+    mayanode.dag_cache.invalidate()
+    mayanode.PlugBackend.api = None
+    tr = fakemaya.SCENE.create('transform', 'node')
+    for attr, value in VALUES.items():
+        tr.add(attr, value, attr)
+    mayanode.MAttr.use_api = True
+    yield 'node'
+    mayanode.MAttr.use_api = False
+
+
+@pytest.mark.parametrize('attr', sorted(KINDS))
+def test_kind(node, attr):
+    plug = mayanode.PlugBackend.plug('node.' + attr)
+    assert mayanode.PlugBackend._kind(plug) == KINDS[attr]
+
+
+@pytest.mark.parametrize('attr', sorted(VALUES))
+def test_get_matches_getAttr(node, attr):
+    plug = mayanode.PlugBackend.plug('node.' + attr)
+    value = mayanode.PlugBackend.get(plug)
+    assert value == fakemaya.cmds.getAttr('node.' + attr)
+    assert type(value) is type(VALUES[attr])
+
+
+def test_compound_children(node):
+    plug = mayanode.PlugBackend.plug('node.color')
+    assert plug.isCompound
+    assert [mayanode.PlugBackend._kind(plug.child(i)) for i in range(plug.numChildren())] == ['double'] * 3
+
+
+def test_missing_plug(node):
+    assert mayanode.PlugBackend.plug('node.nothing') is None
+
+
+def test_attr_reads_through_api(node):
+    recorder.reset()
+    assert mayanode.MAttr(node, 'weights').get() == VALUES['weights']
+    assert 'getAttr' not in recorder.counts
+
+
+@pytest.mark.parametrize('attr, value', [('scale', 4.0), ('count', 7), ('color', (1.0, 2.0, 3.0)),
+                                         ('label', 'world')])
+def test_set_stays_on_cmds(node, attr, value):
+    # writes are not done with MPlug.set* so they stay in the undo queue
+    recorder.reset()
+    attribute = mayanode.MAttr(node, attr)
+    if isinstance(value, tuple):
+        attribute.set(*value)
+    else:
+        attribute.set(value)
+    assert recorder.counts['setAttr'] == 1
+    assert attribute.get() == fakemaya.cmds.getAttr('node.' + attr)
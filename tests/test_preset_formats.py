@@ -0,0 +1,113 @@
+"""Round trip of the PresetBinary and PresetStream preset files
+
+``python -m pytest -q tests``
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import fakemaya  # noqa: E402
+
+fakemaya.install()
+mayanode = fakemaya.load_source('mayanode', os.path.join(ROOT, '59185039.py'))
+
+SIZE = 2000  # above PresetStream.array_threshold
+
+
+class Node(object):
+    """Stand-in for MayaNode, only what the writers use"""
+
+    def __init__(self, name):
+        self.tr = name
+        self.nodeType = 'mesh'
+
+    def _presetParts(self):
+        yield {self.tr: {'nodeType': 'transform', 'translateX': 1.5, 'visibility': True, 'label': 'foo',
+                         'small': [1, 2, 3]}}
+        yield {self.tr + 'Shape': {'nodeType': 'mesh',
+                                   'weights': [i / float(SIZE) for i in range(SIZE)],
+                                   'ids': list(range(SIZE)),
+                                   'pnts': [(i, 0.5, -1.25) for i in range(SIZE)],
+                                   'flags': [i % 3 == 0 for i in range(SIZE)]}}
+
+    def expected(self):
+        out = {}
+        for part in self._presetParts():
+            out.update(part)
+        return out
+
+
+def _assertSame(values, expected):
+    assert values == expected
+    assert [type(v) for v in values] == [type(v) for v in expected]
+
+
+@pytest.fixture
+def nodes():
+    return [Node('node0'), Node('node1')]
+
+
+def test_binary(tmp_path, nodes):
+    path = mayanode.PresetBinary.write(str(tmp_path / 'preset.dwpb'), nodes)
+    with mayanode.PresetBinary(path) as reader:
+        preset = reader.preset()
+        for n in nodes:
+            assert preset[n.tr + '_nodeType'] == 'mesh'
+            for sub, attrs in n.expected().items():
+                lazy = preset[n.tr][sub]
+                assert sorted(lazy) == sorted(attrs)
+                for attr, value in attrs.items():
+                    if isinstance(value, list):
+                        _assertSame(lazy[attr], value)
+                    else:
+                        assert lazy[attr] == value
+
+
+def test_binary_attrs_filter(tmp_path, nodes):
+    path = mayanode.PresetBinary.write(str(tmp_path / 'preset.dwpb'), nodes)
+    with mayanode.PresetBinary(path) as reader:
+        shape = reader.preset(attrs=['flags'])['node0']['node0Shape']
+        assert sorted(shape) == ['flags', 'nodeType']
+        _assertSame(shape['flags'], nodes[0].expected()['node0Shape']['flags'])
+
+
+def test_binary_read_after_close(tmp_path, nodes):
+    path = mayanode.PresetBinary.write(str(tmp_path / 'preset.dwpb'), nodes)
+    with mayanode.PresetBinary(path) as reader:
+        shape = reader.preset()['node0']['node0Shape']
+        weights = shape['weights']
+    # what was read stays, the other arrays can't be read anymore
+    assert shape['weights'] is weights
+    assert shape['nodeType'] == 'mesh'
+    with pytest.raises(ValueError):
+        shape['pnts']
+    reader.close()
+
+
+def test_stream(tmp_path, nodes):
+    path = mayanode.PresetStream.write(str(tmp_path / 'preset.jsonl'), nodes)
+    assert os.path.exists(mayanode.PresetStream.sidecar(path))
+    read = list(mayanode.PresetStream.read(path))
+    assert [(key, sub) for key, _, sub, _ in read] == [('node0', 'node0'), ('node0', 'node0Shape'),
+                                                      ('node1', 'node1'), ('node1', 'node1Shape')]
+    for key, ntype, sub, attrs in read:
+        assert ntype == 'mesh'
+        expected = dict((n.tr, n) for n in nodes)[key].expected()[sub]
+        assert sorted(attrs) == sorted(expected)
+        for attr, value in expected.items():
+            if isinstance(value, list):
+                _assertSame(attrs[attr], value)
+            else:
+                assert attrs[attr] == value
+
+
+def test_stream_nodes_filter(tmp_path, nodes):
+    path = mayanode.PresetStream.write(str(tmp_path / 'preset.jsonl'), nodes + [Node('node2')])
+    every = list(mayanode.PresetStream.read(path))
+    assert list(mayanode.PresetStream.read(path, ['node1'])) == [r for r in every if r[0] == 'node1']
+    assert list(mayanode.PresetStream.read(path, ['node0', 'node2'])) == [r for r in every if r[0] != 'node1']
+    assert list(mayanode.PresetStream.read(path, [])) == []